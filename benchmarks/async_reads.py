@@ -0,0 +1,112 @@
+#!/usr/bin/python3
+"""
+Measure concurrent class details reads, sync against async.
+
+The same class is read by `--concurrency` clients at once, first each on
+a thread of its own through the storage, then each as a task of a single
+event loop through the async storage. A class with `--attendances`
+attendance records is created first, in the configured database.
+
+Usage:
+    STORAGE_ENGINE=sqlite STORAGE_DATABASE=/tmp/sms_bench.db \
+    python3 -m benchmarks.async_reads --concurrency 50 --requests 500
+"""
+import argparse
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from models import Attendance, Class, Student, StudentClassAssociation, create_async_storage, storage
+from modules.class_management.class_management import ClassManagement
+from modules.test_utils import create_staff_member
+
+
+def create_class(attendances):
+    """
+    Create a class with one student and its attendance records.
+
+    Args:
+        attendances (int): the number of attendance records.
+
+    Returns:
+        str: the id of the class.
+    """
+    teacher, parent = create_staff_member()
+    class_ = Class(class_name="Benchmark", head_class_teacher=teacher.id, academic_year="2023/24")
+    student = Student(first_name="Bench", last_name="Mark", parent_id=parent.id, gender="Female",
+                      admission_date=datetime(2023, 9, 1), expected_graduation=datetime(2026, 7, 1))
+    class_.students.append(StudentClassAssociation(student=student))
+    class_.save()
+    class_id, student_id = class_.id, student.id
+    start = datetime(2023, 9, 1)
+    storage.bulk_save([Attendance(class_id=class_id, student_id=student_id, academic_year="2023/24",
+                                  term="Term 1", status=1, date=start + timedelta(days=day))
+                       for day in range(attendances)])
+    storage.close()
+    return class_id
+
+
+def measure_threads(class_id, concurrency, requests):
+    """
+    Read the class details from `concurrency` threads.
+
+    Returns:
+        tuple: the reads per second and the peak number of threads.
+    """
+    def read(_):
+        try:
+            return ClassManagement().get_class_details(class_id)
+        finally:
+            storage.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(read, range(requests)))
+        peak = threading.active_count()
+    return requests / (time.perf_counter() - start), peak
+
+
+async def measure_tasks(class_id, concurrency, requests):
+    """
+    Read the class details from `concurrency` tasks of one event loop.
+
+    Returns:
+        tuple: the reads per second and the number of threads.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with create_async_storage() as async_storage:
+        async def read():
+            async with semaphore:
+                return await ClassManagement().get_class_details_async(async_storage, class_id)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(read() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+        peak = threading.active_count()
+    return requests / elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=50,
+                        help="the number of concurrent clients (default 50)")
+    parser.add_argument("--requests", type=int, default=500,
+                        help="the number of reads (default 500)")
+    parser.add_argument("--attendances", type=int, default=200,
+                        help="the attendance records of the class (default 200)")
+    args = parser.parse_args()
+
+    class_id = create_class(args.attendances)
+    print(f"{args.requests} reads, {args.concurrency} concurrent, {args.attendances} attendance records")
+    print(f"{'storage':>8} {'reads/s':>10} {'threads':>8}")
+    rate, threads = measure_threads(class_id, args.concurrency, args.requests)
+    print(f"{'sync':>8} {rate:>10.1f} {threads:>8}")
+    rate, threads = asyncio.run(measure_tasks(class_id, args.concurrency, args.requests))
+    print(f"{'async':>8} {rate:>10.1f} {threads:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+"""
+Measure the per-request cost of access token verification.
+
+The same request is verified over and over, the way a logged-in client
+hits the services, once with a full signature check every time
+(verify_jwt_in_request) and once through the claims cache and the
+revocation set (verify_request). The revocation list is filled with
+`--revoked` tokens first so the set has a realistic size.
+
+Usage:
+    STORAGE_ENGINE=sqlite python3 -m benchmarks.auth_overhead --requests 5000
+"""
+import argparse
+import statistics
+import time
+import uuid
+
+from flask import Flask
+from flask_jwt_extended import create_access_token, verify_jwt_in_request
+
+from modules.service.v1 import token_verification
+from modules.service.v1.token_issuer import configure_jwt
+
+
+def measure(app, verify, headers, requests):
+    """
+    Verify `requests` requests.
+
+    Args:
+        app (Flask): the app configured for the tokens.
+        verify (callable): the verification function.
+        headers (dict): the headers of the requests.
+        requests (int): the number of requests.
+
+    Returns:
+        tuple: the p50 and p95 verification times, in µs.
+    """
+    timings = []
+    for _ in range(requests):
+        with app.test_request_context("/", headers=headers):
+            start = time.perf_counter()
+            verify()
+            timings.append((time.perf_counter() - start) * 1e6)
+    timings.sort()
+    return statistics.median(timings), timings[max(0, int(len(timings) * 0.95) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000,
+                        help="the number of verified requests (default 5000)")
+    parser.add_argument("--revoked", type=int, default=1000,
+                        help="the number of revoked tokens (default 1000)")
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    token_verification.configure_revocation(configure_jwt(app))
+
+    expires = int(time.time()) + 3600
+    for _ in range(args.revoked):
+        token_verification.revocations.revoke(str(uuid.uuid4()), expires)
+
+    with app.app_context():
+        token = create_access_token(identity="benchmark")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    print(f"{args.requests} requests, {args.revoked} revoked tokens")
+    print(f"{'verification':>14} {'p50 µs':>10} {'p95 µs':>10}")
+    for name, verify in (("signature", verify_jwt_in_request),
+                         ("cached", token_verification.verify_request)):
+        p50, p95 = measure(app, verify, headers, args.requests)
+        print(f"{name:>14} {p50:>10.1f} {p95:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+"""
+Pick the bcrypt cost factor for a target login latency.
+
+For each cost factor, a storm of concurrent logins is verified on a worker
+pool of the size the services use (SMS_PASSWORD_WORKERS), the way the
+start-of-term rush hits the login endpoint, and the latency percentiles of
+the logins are reported. The highest cost whose p95 latency stays under the
+target is recommended for SMS_BCRYPT_ROUNDS.
+
+Usage:
+    python3 -m benchmarks.password_cost --target-ms 1000 --concurrency 50
+"""
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from models.passwords import WORKERS, hash_password, verify_password
+
+
+def storm(rounds, concurrency, workers):
+    """
+    Verify `concurrency` logins submitted at once.
+
+    Args:
+        rounds (int): the bcrypt cost factor.
+        concurrency (int): the number of simultaneous logins.
+        workers (int): the size of the verification pool.
+
+    Returns:
+        tuple: the single verification time, and the p50 and p95 login latencies, in ms.
+    """
+    hashed = hash_password("Benchmark#2024", rounds=rounds)
+
+    start = time.perf_counter()
+    verify_password("Benchmark#2024", hashed)
+    single = (time.perf_counter() - start) * 1000
+
+    def login(submitted):
+        verify_password("Benchmark#2024", hashed)
+        return (time.perf_counter() - submitted) * 1000
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(login, time.perf_counter()) for _ in range(concurrency)]
+        latencies = sorted(future.result() for future in futures)
+
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+    return single, statistics.median(latencies), p95
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--target-ms", type=float, default=1000,
+                        help="the p95 login latency to stay under (default 1000)")
+    parser.add_argument("--concurrency", type=int, default=50,
+                        help="the number of simultaneous logins (default 50)")
+    parser.add_argument("--workers", type=int, default=WORKERS,
+                        help=f"the verification pool size (default {WORKERS})")
+    parser.add_argument("--min-rounds", type=int, default=8)
+    parser.add_argument("--max-rounds", type=int, default=14)
+    args = parser.parse_args()
+
+    print(f"{args.concurrency} concurrent logins on {args.workers} workers, "
+          f"target p95 {args.target_ms:.0f} ms")
+    print(f"{'rounds':>6} {'single ms':>10} {'p50 ms':>10} {'p95 ms':>10}")
+
+    chosen = None
+    for rounds in range(args.min_rounds, args.max_rounds + 1):
+        single, p50, p95 = storm(rounds, args.concurrency, args.workers)
+        print(f"{rounds:>6} {single:>10.1f} {p50:>10.1f} {p95:>10.1f}")
+        if p95 > args.target_ms:
+            break
+        chosen = rounds
+
+    if chosen is None:
+        print("No cost factor meets the target, add workers or lower --min-rounds")
+    else:
+        print(f"Recommended: SMS_BCRYPT_ROUNDS={chosen}")
+
+
+if __name__ == "__main__":
+    main()
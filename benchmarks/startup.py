@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""
+Measure the startup time of the services.
+
+Each step runs in a fresh interpreter, the way a worker, a script or a
+test run starts: importing the models, importing the app module, and
+creating the app. Nothing may connect to the database before the first
+request, so no database is needed.
+
+Usage:
+    python3 -m benchmarks.startup --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+STEPS = {
+    "import models": "import models",
+    "import app": "import modules.service.v1.app",
+    "create_app()": "from modules.service.v1.app import create_app; create_app()",
+}
+
+PROBE = """
+import time
+start = time.perf_counter()
+{code}
+print(time.perf_counter() - start)
+"""
+
+
+def measure(code, runs):
+    """
+    Time a startup step in fresh interpreters.
+
+    Args:
+        code (str): the statements of the step.
+        runs (int): the number of interpreters.
+
+    Returns:
+        tuple: the median and the slowest time, in ms.
+    """
+    # no storage credentials: a step connecting to the database fails
+    env = {key: value for key, value in os.environ.items() if not key.startswith("STORAGE_")}
+    timings = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", PROBE.format(code=code)], env=env,
+                             capture_output=True, text=True, check=True).stdout
+        timings.append(float(out.split()[-1]) * 1000)
+    return statistics.median(timings), max(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5,
+                        help="the number of fresh interpreters per step (default 5)")
+    args = parser.parse_args()
+
+    print(f"{'step':>14} {'median ms':>10} {'max ms':>10}")
+    for name, code in STEPS.items():
+        median, slowest = measure(code, args.runs)
+        print(f"{name:>14} {median:>10.1f} {slowest:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Gunicorn settings of the service v1 app.
+
+Usage:
+    gunicorn modules.service.v1.wsgi:app
+
+The app is created once in the master and forked into the workers; the
+master starts no thread, so a fork never copies a lock held by one. The
+background jobs run in a process of their own by default (see
+modules/service/v1/scheduler.py), or with SMS_SCHEDULER=worker in the one
+worker holding the scheduler lock.
+"""
+import fcntl
+import multiprocessing
+import sys
+import tempfile
+from os import environ, path
+
+bind = f"{environ.get('HOST', '0.0.0.0')}:{environ.get('PORT', 8080)}"
+workers = int(environ.get('SMS_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+if workers > 1 and not environ.get('SMS_CACHE_URL'):
+    # an in-process response cache never sees the writes of the other workers
+    environ['SMS_RESPONSE_CACHE'] = '0'
+# requests mostly wait on the database, so each worker serves several
+threads = int(environ.get('SMS_THREADS', 4))
+worker_class = 'gthread'
+preload_app = True
+timeout = int(environ.get('SMS_WORKER_TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = 5
+# recycle the workers now and then, staggered so they never restart together
+max_requests = int(environ.get('SMS_MAX_REQUESTS', 1000))
+max_requests_jitter = max_requests // 10
+accesslog = '-'
+errorlog = '-'
+
+scheduler_lock = environ.get('SMS_SCHEDULER_LOCK', path.join(tempfile.gettempdir(), 'sms-scheduler.lock'))
+
+
+def post_fork(server, worker):
+    """
+    Drop the database connections inherited from the master.
+    """
+    if 'models' in sys.modules:
+        sys.modules['models'].storage.after_fork()
+
+
+def post_worker_init(worker):
+    """
+    With SMS_SCHEDULER=worker, start the background jobs in the worker that
+    takes the scheduler lock. It holds the lock until it exits, then the
+    worker forked in its place takes it over.
+    """
+    if environ.get('SMS_SCHEDULER', 'external') != 'worker':
+        return
+    lock = open(scheduler_lock, 'a')
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        return
+    from modules.service.v1.scheduler import create_scheduler
+
+    worker.scheduler_lock = lock
+    worker.scheduler = create_scheduler()
+    worker.scheduler.start()
+    worker.log.info("Background jobs running in worker %s", worker.pid)
+
+
+def worker_exit(server, worker):
+    scheduler = getattr(worker, 'scheduler', None)
+    if scheduler is not None:
+        scheduler.shutdown(wait=False)
@@ -7,20 +7,52 @@ from models.class_course_assoc import ClassCourseAssociation
 from models.class_student_association import StudentClassAssociation
 from models.classe import Class
 from models.course import Course
+from models.engine.async_dbstorage import AsyncDBStorage
 from models.engine.dbstorage import DBStorage
 from models.engine.filestorage import FileStorage
+from models.engine.lazy_storage import LazyStorage
 from models.grade import Grade
 from models.parent import Parent
 from models.permission import Permission
+from models.revoked_token import RevokedToken
+from models.signing_key import SigningKey
 from models.staff import Staff
 from models.student import Student
 from models.user import User
 
 STORAGE_ENGINE = environ.get('STORAGE_ENGINE', 'db')
+MEMORY_DATABASE = "file:/sms?vfs=memdb&uri=true"
 
-if STORAGE_ENGINE == 'db':
-    storage = DBStorage()
-else:
-    storage = FileStorage()
 
-storage.reload()
+def _database_url():
+    if STORAGE_ENGINE == 'sqlite':
+        # a file path, or by default one in-memory database shared by the
+        # connections of the process
+        return f"sqlite:///{environ.get('STORAGE_DATABASE', MEMORY_DATABASE)}"
+    # the storages build the MySQL URL
+    return None
+
+
+def _create_storage():
+    if STORAGE_ENGINE in ('db', 'sqlite'):
+        return DBStorage(url=_database_url())
+    return FileStorage()
+
+
+def create_async_storage():
+    """
+    Create a read-only storage of the configured database for an asyncio
+    application. Its connections belong to the event loop using it: the
+    application creates one when its loop starts, and disposes of it
+    before the loop closes (async with), see models.engine.async_dbstorage.
+
+    Returns:
+        AsyncDBStorage: the async storage.
+    """
+    if STORAGE_ENGINE not in ('db', 'sqlite'):
+        raise ValueError("The async storage needs a database (STORAGE_ENGINE=db or sqlite)")
+    return AsyncDBStorage(url=_database_url())
+
+
+# created on first use, the database schema is created by models.engine.migrate
+storage = LazyStorage(_create_storage)
@@ -48,4 +48,4 @@ class Announcement(BaseModel, Base):
         self.content = content[:124]  # Limit content length to 124 characters
         self.staff_id = staff_id.strip()  # Remove leading/trailing whitespaces
         self.target = target.strip()  # Remove leading/trailing whitespaces
-        self.date = datetime.now()
+        self.date = kwargs.get("date") or datetime.now()
@@ -5,7 +5,7 @@ This module contains the Attendance model
 """
 import datetime
 
-from sqlalchemy import Column, String, ForeignKey, Integer, DateTime
+from sqlalchemy import Column, String, ForeignKey, Integer, DateTime, Index
 from sqlalchemy.orm import relationship
 
 from models.basemodel import BaseModel, Base
@@ -31,6 +31,10 @@ class Attendance(BaseModel, Base):
     """
 
     __tablename__ = 'attendance'
+    __table_args__ = (
+        Index("ix_attendance_class_year_term_date", "class_id", "academic_year", "term", "date"),
+        Index("ix_attendance_student_year_term", "student_id", "academic_year", "term"),
+    )
     class_id = Column(String(50), ForeignKey('classes.id'), nullable=False)
     student_id = Column(String(50), ForeignKey('students.id'), nullable=False)
     date = Column(DateTime(timezone=True), nullable=False, default=datetime.datetime.utcnow)
@@ -11,6 +11,8 @@ from sqlalchemy import Column, DateTime, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
 
+from models.serializer import parse_columns, serializer
+
 Base = declarative_base()
 
 
@@ -25,8 +27,8 @@ class BaseModel:
     """
 
     id = Column(String(50), primary_key=True, default=str(uuid4))
-    created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
-    updated_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, index=True)
+    updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.now, index=True)
 
     def __init__(self, *args, **kwargs):
         """
@@ -69,25 +71,19 @@ class BaseModel:
             setattr(self, key, value)
         self.updated_at = datetime.now()
 
-    def serialize(self):
+    def serialize(self, fields=None):
         """
         Serialize the model.
 
+        Args:
+            fields (iterable, optional): The only attributes to serialize.
+
         Returns:
             dict: Serialized representation of the model.
         """
-        obj_s = self.__dict__.copy()
-        if "_sa_instance_state" in obj_s: del obj_s["_sa_instance_state"]
-        if type(obj_s["created_at"]) == datetime:
-            obj_s["created_at"] = self.created_at.strftime("%Y-%m-%d %H:%M:%S")
-        if type(obj_s["updated_at"]) == datetime:
-            obj_s["updated_at"] = self.updated_at.strftime("%Y-%m-%d %H:%M:%S")
-        for k, v in obj_s.items():
-            if isinstance(v, BaseModel):
-                obj_s[k] = v.serialize()
-
-        obj_s["__class__"] = self.__class__.__name__
-        return obj_s
+        if fields is not None:
+            fields = tuple(sorted(fields))
+        return serializer(self.__class__, fields)(self)
 
     @classmethod
     def deserialize(cls, obj):
@@ -100,9 +96,7 @@ class BaseModel:
         Returns:
             BaseModel: Deserialized model instance.
         """
-        obj["created_at"] = datetime.strptime(obj["created_at"], "%Y-%m-%d %H:%M:%S")
-        obj["updated_at"] = datetime.strptime(obj["updated_at"], "%Y-%m-%d %H:%M:%S")
-        instance = cls(**obj)
+        instance = cls(**parse_columns(cls, obj))
         return instance
 
     def save(self):
@@ -0,0 +1,174 @@
+#!/usr/bin/python3
+"""
+The script defines the asynchronous database storage class.
+
+It serves the read paths of an asyncio application: a request waiting on
+the database yields its event loop to the others instead of holding a
+thread, so one process serves many concurrent readers. It reads the
+database of DBStorage through an async driver (aiomysql for MySQL,
+aiosqlite for SQLite); the writes stay with DBStorage.
+
+Each call runs in a session of its own, closed before it returns, so
+concurrent tasks never share one; the objects it returns are detached and
+carry the columns and the relationships of their loader profile. The
+connections of the engine belong to the event loop that opened them:
+create the storage in the loop serving the application and dispose() of
+it before the loop closes, e.g. in the lifespan of an ASGI app:
+
+    async with models.create_async_storage() as async_storage:
+        ...
+"""
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from models.basemodel import Base
+from models.engine.dbstorage import (MAX_OVERFLOW, POOL_PRE_PING, POOL_RECYCLE, POOL_SIZE,
+                                     POOL_TIMEOUT, in_memory, memory_url, mysql_url,
+                                     sqlite_pragmas)
+from models.engine.loader_profiles import get_profile
+
+# the async driver of each database backend
+ASYNC_DRIVERS = {"mysql": "aiomysql", "sqlite": "aiosqlite"}
+
+
+def async_url(url):
+    """
+    Get the URL of a database for its async driver.
+
+    Args:
+        url (str): the database URL, with any driver.
+
+    Returns:
+        URL: the URL with the async driver of its backend.
+    """
+    url = make_url(url)
+    backend = url.get_backend_name()
+    try:
+        return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+    except KeyError:
+        raise ValueError(f"No async driver for the {backend} database")
+
+
+class AsyncDBStorage:
+    """
+    The asynchronous database storage class, read-only.
+    """
+
+    def __init__(self, url=None, pool_options=None):
+        """
+        Initialise the asynchronous database storage class.
+
+        Args:
+            url (str, optional): the URL of the database, built from the
+                STORAGE_* variables by default. Its driver is replaced
+                with the async driver of the database.
+            pool_options (dict, optional): create_async_engine() pool
+                arguments overriding the environment, as for DBStorage.
+        """
+        url = async_url(url or mysql_url())
+        options = {"pool_size": POOL_SIZE, "max_overflow": MAX_OVERFLOW,
+                   "pool_timeout": POOL_TIMEOUT, "pool_recycle": POOL_RECYCLE,
+                   "pool_pre_ping": POOL_PRE_PING}
+        options.update(pool_options or {})
+        if in_memory(url):
+            # the database lives as long as a connection to it: keep the pooled ones
+            url, options["pool_recycle"] = memory_url(url), -1
+        self.__engine = create_async_engine(url, poolclass=AsyncAdaptedQueuePool, **options)
+        if url.get_backend_name() == "sqlite":
+            event.listen(self.__engine.sync_engine, "connect", sqlite_pragmas)
+        self.__Session = async_sessionmaker(self.__engine, expire_on_commit=False)
+
+    async def get_by_id(self, cls, id, profile=None):
+        """
+        Get an object from the database.
+        Args:
+            cls (class): the class to query.
+            id (str): the id of the object to get.
+            profile (str, optional): the loader profile to apply.
+
+        Returns:
+            object: an object from the database, None if it does not exist.
+        """
+        objs = await self.select(cls, filters=[cls.id == id], profile=profile, limit=1)
+        return objs[0] if objs else None
+
+    async def select(self, cls, filters=(), order_by=(), profile=None, limit=None):
+        """
+        Get the objects matching the filters.
+        Args:
+            cls (class): the class to query.
+            filters (iterable): the filter conditions.
+            order_by (iterable): the ordering clauses.
+            profile (str, optional): the loader profile to apply, see
+                models.engine.loader_profiles.
+            limit (int, optional): the maximum number of objects.
+
+        Returns:
+            list: the objects.
+        """
+        stmt = select(cls).where(*filters).order_by(*order_by).limit(limit)
+        if profile is not None:
+            stmt = stmt.options(*get_profile(profile))
+        async with self.__Session() as session:
+            return list((await session.scalars(stmt)).unique())
+
+    async def rows(self, cls, columns=None, filters=(), order_by=()):
+        """
+        Read records as plain rows, without building ORM instances.
+        Args:
+            cls (class): the class to read.
+            columns (iterable, optional): the names of the columns to select,
+                every mapped column by default.
+            filters (iterable): the filter conditions.
+            order_by (iterable): the ordering clauses.
+
+        Returns:
+            list: named tuples of the selected columns.
+        """
+        if columns is None:
+            columns = [attr.key for attr in inspect(cls).column_attrs]
+        stmt = (select(*(getattr(cls, column) for column in columns))
+                .where(*filters).order_by(*order_by))
+        async with self.__Session() as session:
+            return (await session.execute(stmt)).all()
+
+    async def version(self, cls, *filters):
+        """
+        Get the version of a collection of records, see DBStorage.version().
+        Args:
+            cls (class): the class of the records.
+            *filters: the conditions selecting the records.
+
+        Returns:
+            tuple: the latest updated_at and the number of records.
+        """
+        latest = func.max(cls.updated_at) if hasattr(cls, "updated_at") else None
+        stmt = select(latest, func.count()).select_from(cls).where(*filters)
+        async with self.__Session() as session:
+            return tuple((await session.execute(stmt)).one())
+
+    async def create_schema(self, drop=False):
+        """
+        Create the missing tables, for test databases.
+
+        Args:
+            drop (bool): drop every table first.
+        """
+        async with self.__engine.begin() as conn:
+            if drop:
+                await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+
+    async def dispose(self):
+        """
+        Close the connections of the pool, before their event loop closes.
+        """
+        await self.__engine.dispose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.dispose()
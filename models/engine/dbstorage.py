@@ -1,11 +1,34 @@
 #!/usr/bin/python3
 """
 The script defines the database storage class.
+
+Every thread gets its own session from a scoped_session registry, so
+concurrent requests never share, or close, each other's session; the
+session of a thread is removed, and its connection returned to the pool,
+by close() at the end of each request. Set SMS_SESSION_SCOPE=greenlet
+when serving with greenlet based workers, which share threads.
+
+The pool holds SMS_DB_POOL_SIZE connections plus up to SMS_DB_MAX_OVERFLOW
+more under load, so a worker running N threads wants N of them; a thread
+waits up to SMS_DB_POOL_TIMEOUT seconds for one, and connections are
+replaced after SMS_DB_POOL_RECYCLE seconds. The pools are instrumented,
+see pool_status() and pool_statuses().
+
+SMS_DB_REPLICAS lists the URLs of read replicas, comma separated. The
+reads of a session then go to one of them, and its writes, and the reads
+following them, to the primary (see routing.py).
+
+A sqlite:// URL runs the storage on an embedded SQLite database, for
+local and test runs without a database server. A file database runs in
+WAL mode, so readers do not block the writer; an in-memory database is
+shared by every thread of the process and gets its schema on creation.
 """
+from contextlib import contextmanager
 from os import environ
+from uuid import uuid4
 
-from sqlalchemy import create_engine
-from sqlalchemy.pool import QueuePool
+from sqlalchemy import create_engine, event, func, inspect, select
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, scoped_session
 
 from models.announcement import Announcement
@@ -15,19 +38,40 @@ from models.basemodel import BaseModel
 from models.classe import Class
 from models.course import Course
 from models.feedback import Feedback
+from models.engine.loader_profiles import get_profile
+from models.engine.pool_metrics import InstrumentedQueuePool, PoolMetrics
+from models.engine.routing import ReplicaSet, RoutingSession
 from models.grade import Grade
 from models.parent import Parent
 from models.permission import Permission
+from models.revoked_token import RevokedToken
+from models.signing_key import SigningKey
 from models.staff import Staff
 from models.student import Student
 from models.user import User
 
+POOL_SIZE = int(environ.get("SMS_DB_POOL_SIZE", 5))
+MAX_OVERFLOW = int(environ.get("SMS_DB_MAX_OVERFLOW", 10))
+POOL_TIMEOUT = float(environ.get("SMS_DB_POOL_TIMEOUT", 30))
+POOL_RECYCLE = int(environ.get("SMS_DB_POOL_RECYCLE", 3600))
+POOL_PRE_PING = environ.get("SMS_DB_POOL_PRE_PING", "1") != "0"
+SESSION_SCOPE = environ.get("SMS_SESSION_SCOPE", "thread")
+SQLITE_PRAGMAS = {
+    "foreign_keys": "ON",
+    "synchronous": "NORMAL",  # durable in WAL mode, bar the last commits on power loss
+    "busy_timeout": int(POOL_TIMEOUT * 1000),
+    "cache_size": -16000,  # KiB
+    "temp_store": "MEMORY",
+}
+REPLICA_URLS = [url.strip() for url in environ.get("SMS_DB_REPLICAS", "").split(",") if url.strip()]
+
 # Dictionary to map class names to actual class objects
 classes = {"BaseModel": BaseModel, "User": User,
            "Course": Course, "Announcement": Announcement,
            "Feedbacks": Feedback, "Student": Student, "Parent": Parent,
            "Staff": Staff, "Gradebook": Grade, "Permission": Permission,
-           "Attendance": Attendance, "Class": Class}
+           "Attendance": Attendance, "Class": Class,
+           "RevokedToken": RevokedToken, "SigningKey": SigningKey}
 
 
 class DBStorage:
@@ -35,42 +79,59 @@ class DBStorage:
     The database storage class.
     """
 
-    def __init__(self):
+    def __init__(self, pool_options=None, url=None, replica_urls=None):
         """
         Initialise the database storage class.
+
+        Args:
+            pool_options (dict, optional): create_engine() pool arguments
+                (pool_size, max_overflow, pool_timeout, pool_recycle,
+                pool_pre_ping) overriding the environment.
+            url (str, optional): the URL of the primary database, built
+                from the STORAGE_* variables by default.
+            replica_urls (list, optional): the URLs of the read replicas,
+                SMS_DB_REPLICAS by default.
         """
-        try:
-            if environ.get("STORAGE_ENGINE") == "db":
-                self.__user = environ["STORAGE_USER"]
-                self.__password = environ["STORAGE_PASSWORD"]
-                self.__database = environ["STORAGE_DATABASE"]
-                self.__host = environ["STORAGE_HOST"]
-
-                # Create the engine with connection pool
-                self.__engine = create_engine(
-                    f'mysql+mysqldb://{self.__user}:{self.__password}@{self.__host}/{self.__database}',
-                    poolclass=QueuePool,
-                    pool_size=5,
-                    pool_pre_ping=True,  # Optional
-                )
-
-                # Create session factory
-                session_factory = sessionmaker(bind=self.__engine)
-                self.__Session = scoped_session(session_factory)
-
-                # Create a new session
-                self.__session = self.__Session()
-
-                # Drop all tables if running in test environment
-                if environ.get("SMS_ENV") == "test":
-                    Base.metadata.drop_all(self.__engine)
-
-                # Create all tables
-                Base.metadata.create_all(self.__engine)
-        except KeyError as e:
-            raise ValueError(f"Missing environment variable: {e}")
-        except Exception as e:
-            raise e
+        options = {"pool_size": POOL_SIZE, "max_overflow": MAX_OVERFLOW,
+                   "pool_timeout": POOL_TIMEOUT, "pool_recycle": POOL_RECYCLE,
+                   "pool_pre_ping": POOL_PRE_PING}
+        options.update(pool_options or {})
+        # Create the engines with their connection pools
+        self.__engine = self.__create_engine(url or mysql_url(), options)
+        if in_memory(self.__engine.url):
+            self.create_schema()
+        urls = REPLICA_URLS if replica_urls is None else replica_urls
+        self.__replicas = ReplicaSet(self.__create_engine(replica, options) for replica in urls)
+
+        # Create the registry of the per-thread (or per-greenlet) sessions
+        session_factory = sessionmaker(bind=self.__engine, class_=RoutingSession,
+                                       replicas=self.__replicas)
+        self.__Session = scoped_session(session_factory, scopefunc=_scopefunc())
+
+    @staticmethod
+    def __create_engine(url, options):
+        """
+        Create an engine with an instrumented connection pool.
+        """
+        url = make_url(url)
+        if url.get_backend_name() != "sqlite":
+            engine = create_engine(url, poolclass=InstrumentedQueuePool, **options)
+        else:
+            if in_memory(url):
+                # the database lives as long as a connection to it: keep the pooled ones
+                url, options = memory_url(url), dict(options, pool_recycle=-1)
+            engine = create_engine(url, poolclass=InstrumentedQueuePool,
+                                   connect_args={"check_same_thread": False}, **options)
+            event.listen(engine, "connect", sqlite_pragmas)
+        engine.pool.metrics.listen(engine.pool)
+        return engine
+
+    @property
+    def __session(self):
+        """
+        The session of the current thread, created on first use.
+        """
+        return self.__Session()
 
     def all(self, cls=None):
         """
@@ -105,6 +166,69 @@ class DBStorage:
         if self.__session.dirty is not None:
             self.save()
 
+    def __commit(self):
+        """
+        Commit the session, or only flush it inside a transaction() block.
+        A failed commit is rolled back, so the session stays usable.
+        """
+        if self.__session.info.get("transaction_depth"):
+            self.__session.flush()
+            return
+        try:
+            self.__session.commit()
+        except Exception:
+            self.__session.rollback()
+            raise
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group several storage operations into a single unit of work.
+
+        Inside the block save(), new(), delete() and the bulk methods only
+        flush; the outermost block commits once on exit, and any error
+        rolls the whole unit of work back before being re-raised. Blocks
+        may be nested.
+
+        Yields:
+            DBStorage: this storage.
+        """
+        session = self.__session
+        session.info["transaction_depth"] = session.info.get("transaction_depth", 0) + 1
+        try:
+            yield self
+        except Exception:
+            session.info["transaction_depth"] -= 1
+            session.rollback()
+            raise
+        session.info["transaction_depth"] -= 1
+        if not session.info["transaction_depth"]:
+            try:
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+
+    def bulk_save(self, objs):
+        """
+        Insert a batch of new records in a single transaction.
+
+        Rows of the same table are flushed together, so the batch is sent
+        as one executemany/multi-row INSERT rather than one commit per row.
+        Args:
+            objs (iterable): the records to insert.
+        """
+        objs = list(objs)
+        if not objs:
+            return
+
+        try:
+            self.__session.add_all(objs)
+            self.__commit()
+        except Exception:
+            self.__session.rollback()
+            raise
+
     def save(self, obj=None):
         """
         Save all records in the database.
@@ -112,7 +236,7 @@ class DBStorage:
         if obj is not None:
             self.new(obj)
 
-        self.__session.commit()
+        self.__commit()
 
     def delete(self, obj):
         """
@@ -122,7 +246,7 @@ class DBStorage:
         """
 
         self.__session.delete(obj)
-        self.__session.commit()
+        self.__commit()
 
     def delete_by_id(self, cls, id_):
         """
@@ -133,37 +257,99 @@ class DBStorage:
         """
         (self.__session.query(cls)
          .filter(cls.id == id_).delete())
-        self.__session.commit()
+        self.__commit()
+
+    def delete_by_filter(self, cls, filter_):
+        """
+        Delete every record matching a filter with a single DELETE statement,
+        without loading the records.
+        Args:
+            cls (class): the class to delete.
+            filter_ (condition): the filter selecting the records to delete.
+
+        Returns:
+            int: the number of deleted records.
+        """
+        deleted = (self.__session.query(cls)
+                   .filter(filter_).delete(synchronize_session=False))
+        self.__commit()
+        return deleted
 
     def reload(self):
         """
         Reload all records in the database.
         """
-        self.__session.close()
-        self.__session = self.__Session()
+        self.__Session.remove()
 
-    def get_by_id(self, cls, id):
+    def get_by_id(self, cls, id, profile=None):
         """
         Get an object from the database.
         Args:
             cls (class): the class to query.
             id (str): the id of the object to get.
+            profile (str, optional): the loader profile to apply.
 
         Returns:
             object: an object from the database.
         """
-        query = self.__session.query(cls).filter(cls.id == id)
+        query = self.query(cls, profile=profile).filter(cls.id == id)
         if query is None:
             return None
         return query.first()
 
-    def query(self, cls):
+    def query(self, cls, *entities, profile=None):
         """
         Query all records in the database.
         Args:
-            cls (class): the class to query.
+            cls (class): the class or column expression to query.
+            *entities: additional columns or aggregate expressions to select.
+            profile (str, optional): the loader profile to apply, see
+                models.engine.loader_profiles.
+        """
+        query = self.__session.query(cls, *entities)
+        if profile is not None:
+            query = query.options(*get_profile(profile))
+        return query
+
+    def rows(self, cls, columns=None, filters=(), order_by=(), batch_size=None):
+        """
+        Read records as plain rows, without building ORM instances.
+        Args:
+            cls (class): the class to read.
+            columns (iterable, optional): the names of the columns to select,
+                every mapped column by default.
+            filters (iterable): the filter conditions.
+            order_by (iterable): the ordering clauses.
+            batch_size (int, optional): stream the rows with a server-side
+                cursor, fetching this many at a time.
+
+        Returns:
+            list: named tuples of the selected columns, or a lazy iterable of
+            them when batch_size is given.
+        """
+        mapper = inspect(cls)
+        if columns is None:
+            columns = [attr.key for attr in mapper.column_attrs]
+        stmt = (select(*(getattr(cls, column) for column in columns))
+                .where(*filters).order_by(*order_by))
+        if batch_size:
+            return self.__session.execute(stmt.execution_options(yield_per=batch_size))
+        return self.__session.execute(stmt).all()
+
+    def version(self, cls, *filters):
         """
-        return self.__session.query(cls)
+        Get the version of a collection of records.
+        Args:
+            cls (class): the class of the records.
+            *filters: the conditions selecting the records.
+
+        Returns:
+            tuple: the latest updated_at (None without records or without
+            an updated_at column) and the number of records.
+        """
+        latest = func.max(cls.updated_at) if hasattr(cls, "updated_at") else None
+        stmt = select(latest, func.count()).select_from(cls).where(*filters)
+        return tuple(self.__session.execute(stmt).one())
 
     def get_by_filter(self, cls, filter_):
         """
@@ -180,14 +366,162 @@ class DBStorage:
 
         return query
 
+    def create_schema(self, drop=False):
+        """
+        Create the missing tables.
+
+        Args:
+            drop (bool): drop every table first, for test databases.
+        """
+        if drop:
+            Base.metadata.drop_all(self.__engine)
+        Base.metadata.create_all(self.__engine)
+
+    def ensure_indexes(self):
+        """
+        Create the indexes declared on the models that are missing from
+        existing tables. create_all() only creates indexes together with
+        their table, so this is the migration path for older databases.
+
+        Returns:
+            list: the names of the created indexes.
+        """
+        inspector = inspect(self.__engine)
+        created = []
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(bind=self.__engine)
+                    created.append(index.name)
+        return created
+
     def close(self):
         """
-        Close the database session.
+        Close the session of the current thread and return its connection
+        to the pool; the thread gets a new session on its next use.
+        """
+        self.__Session.remove()
+
+    def use_primary(self):
+        """
+        Read from the primary for the rest of the current session, e.g.
+        before reading data another request has just written.
+        """
+        self.__session.use_primary()
+
+    def pool_status(self):
+        """
+        Get the state and the metrics of the connection pool.
+
+        Returns:
+            dict: see PoolMetrics.snapshot().
+        """
+        pool = self.__engine.pool
+        return pool.metrics.snapshot(pool)
+
+    def pool_statuses(self):
+        """
+        Get the state and the metrics of the connection pool of every bind.
+
+        Returns:
+            dict: the pool_status() of the primary under "primary", and the
+            same for each read replica under "replica0", "replica1", ...
+        """
+        statuses = {"primary": self.pool_status()}
+        for i, engine in enumerate(self.__replicas.engines):
+            statuses[f"replica{i}"] = engine.pool.metrics.snapshot(engine.pool)
+        return statuses
+
+    def after_fork(self):
+        """
+        Drop the session and the connections inherited from the parent
+        process, without closing them under the parent.
         """
-        self.__session.close()
+        self.__Session.registry.clear()
+        for engine in (self.__engine, *self.__replicas.engines):
+            engine.dispose(close=False)
+            if hasattr(engine.pool, "metrics"):
+                engine.pool.metrics = PoolMetrics()
 
 
-# Instantiate the storage engine
-if environ.get("STORAGE_ENGINE") == "db":
-    dbstorage = DBStorage()
-    dbstorage.reload()
+def _scopefunc():
+    """
+    Get the function identifying the scope of a session, None for the
+    current thread.
+    """
+    if SESSION_SCOPE == "greenlet":
+        from greenlet import getcurrent
+
+        return getcurrent
+    return None
+
+
+def mysql_url(driver="mysqldb"):
+    """
+    Build the URL of the MySQL database from the STORAGE_* variables.
+
+    Args:
+        driver (str): the DBAPI driver.
+
+    Returns:
+        str: the database URL.
+    """
+    try:
+        user = environ["STORAGE_USER"]
+        password = environ["STORAGE_PASSWORD"]
+        database = environ["STORAGE_DATABASE"]
+        host = environ["STORAGE_HOST"]
+    except KeyError as e:
+        raise ValueError(f"Missing environment variable: {e}")
+    return f'mysql+{driver}://{user}:{password}@{host}/{database}'
+
+
+def in_memory(url):
+    """
+    Check whether a URL names an in-memory SQLite database.
+    """
+    return url.get_backend_name() == "sqlite" and (url.database in (None, "", ":memory:")
+                                                   or url.query.get("mode") == "memory"
+                                                   or url.query.get("vfs") == "memdb")
+
+
+def memory_url(url):
+    """
+    Get the URL of an in-memory SQLite database that its connections
+    share, each in transactions of its own.
+
+    The memdb VFS locks the database as a file would, unlike a shared
+    cache: a connection reads the committed rows only, and a writer waits
+    out another (busy_timeout) rather than failing.
+
+    Args:
+        url (URL): the URL of an in-memory SQLite database.
+
+    Returns:
+        URL: the URL of the database on the memdb VFS, a new one for an
+            unnamed database.
+    """
+    if url.query.get("vfs") == "memdb":
+        return url
+    if url.query.get("mode") == "memory":
+        name = url.database.removeprefix("file:").lstrip("/")
+    else:
+        name = f"sms-{uuid4().hex}"
+    return url.set(database=f"file:/{name}", query={"vfs": "memdb", "uri": "true"})
+
+
+def sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Tune a new SQLite connection: WAL journal for a file database, and
+    the SQLITE_PRAGMAS.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA database_list")
+    if cursor.fetchone()[2]:
+        cursor.execute("PRAGMA journal_mode=WAL")
+    for pragma, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {pragma}={value}")
+    cursor.close()
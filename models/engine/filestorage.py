@@ -1,39 +1,293 @@
 import json
+import operator
 import os
+from collections import namedtuple
+from contextlib import contextmanager
+from functools import lru_cache
+
+from sqlalchemy import inspect
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import (BinaryExpression, BindParameter, BooleanClauseList,
+                                     Grouping, Null, UnaryExpression)
 
 from models.announcement import Announcement
 from models.attendance import Attendance
 from models.basemodel import BaseModel
+from models.class_course_assoc import ClassCourseAssociation
+from models.class_student_association import StudentClassAssociation
 from models.classe import Class
 from models.course import Course
 from models.feedback import Feedback
 from models.grade import Grade
 from models.parent import Parent
 from models.permission import Permission
+from models.qualification import Qualification
+from models.revoked_token import RevokedToken
+from models.signing_key import SigningKey
 from models.staff import Staff
 from models.student import Student
+from models.serializer import column_keys, parse_columns, serializer
 from models.user import User
 
 classes = {"BaseModel": BaseModel, "User": User,
            "Course": Course, "Announcement": Announcement,
-           "Feedbacks": Feedback, "Student": Student, "Parent": Parent,
-           "Staff": Staff, "Gradebook": Grade, "Permission": Permission,
-           "Attendance": Attendance, "Class": Class}
+           "Feedbacks": Feedback, "Feedback": Feedback,
+           "Student": Student, "Parent": Parent,
+           "Staff": Staff, "Gradebook": Grade, "Grade": Grade,
+           "Permission": Permission,
+           "Attendance": Attendance, "Class": Class,
+           "RevokedToken": RevokedToken, "SigningKey": SigningKey,
+           "Qualification": Qualification,
+           "StudentClassAssociation": StudentClassAssociation,
+           "ClassCourseAssociation": ClassCourseAssociation}
+
+# Secondary hash indexes kept on hot foreign keys, by class name
+indexes = {"Attendance": ("student_id", "class_id"),
+           "Grade": ("student_id", "class_id", "course_id")}
+
+_comparisons = {operators.eq: operator.eq, operators.ne: operator.ne,
+                operators.lt: operator.lt, operators.le: operator.le,
+                operators.gt: operator.gt, operators.ge: operator.ge,
+                operators.in_op: lambda a, b: a in b,
+                operators.not_in_op: lambda a, b: a not in b,
+                operators.is_: lambda a, b: a is b,
+                operators.is_not: lambda a, b: a is not b}
+
+
+def _class_name(cls):
+    """
+    Return the storage name of a class or class name.
+    """
+    return cls if isinstance(cls, str) else cls.__name__
+
+
+def _compile(criterion):
+    """
+    Compile a SQLAlchemy filter expression into a Python predicate.
+
+    Supports comparisons between a mapped column and a literal (==, !=,
+    <, <=, >, >=, in_, not_in, is_, is_not) combined with and_/or_.
+
+    Args:
+        criterion (ClauseElement): the filter expression.
+
+    Returns:
+        callable: predicate taking an object and returning a bool.
+    """
+    if isinstance(criterion, Grouping):
+        return _compile(criterion.element)
+
+    if isinstance(criterion, BooleanClauseList):
+        predicates = [_compile(clause) for clause in criterion.clauses]
+        if criterion.operator is operators.or_:
+            return lambda obj: any(predicate(obj) for predicate in predicates)
+        return lambda obj: all(predicate(obj) for predicate in predicates)
+
+    if isinstance(criterion, BinaryExpression) and criterion.operator in _comparisons:
+        compare = _comparisons[criterion.operator]
+        attr = criterion.left.key
+        value = _literal(criterion.right)
+        ordering = criterion.operator in (operators.lt, operators.le,
+                                          operators.gt, operators.ge)
+
+        def predicate(obj):
+            current = getattr(obj, attr, None)
+            if ordering and (current is None or value is None):
+                return False
+            return compare(current, value)
+
+        return predicate
+
+    raise NotImplementedError(f"Unsupported filter for file storage: {criterion}")
+
+
+def _literal(element):
+    """
+    Return the Python value of the right-hand side of a comparison.
+    """
+    if isinstance(element, Grouping):
+        return _literal(element.element)
+    if isinstance(element, BindParameter):
+        value = element.effective_value
+        return tuple(value) if isinstance(value, (list, tuple)) else value
+    if isinstance(element, Null):
+        return None
+    raise NotImplementedError(f"Unsupported value for file storage: {element}")
+
+
+def _equalities(criteria):
+    """
+    Yield (attribute, value) pairs of top-level equality filters.
+    """
+    for criterion in criteria:
+        if isinstance(criterion, Grouping):
+            criterion = criterion.element
+        if isinstance(criterion, BooleanClauseList) and criterion.operator is operators.and_:
+            yield from _equalities(criterion.clauses)
+        elif isinstance(criterion, BinaryExpression) and criterion.operator is operators.eq:
+            try:
+                yield criterion.left.key, _literal(criterion.right)
+            except (AttributeError, NotImplementedError):
+                continue
+
+
+def _key(obj):
+    """
+    Return the storage key of an object: its class name and its id, or
+    its primary key for the association classes without an id.
+    """
+    ident = getattr(obj, "id", None)
+    if ident is None:
+        ident = ".".join(str(getattr(obj, column.key)) for column in inspect(obj.__class__).primary_key)
+    return f"{obj.__class__.__name__}.{ident}"
+
+
+@lru_cache(maxsize=None)
+def _journal_fields(cls):
+    """
+    Get the fields an object is stored with: its columns and its class,
+    or None for every attribute of an unmapped class.
+    """
+    if inspect(cls, raiseerr=False) is None:
+        return None
+    return tuple(sorted(column_keys(cls) + ("__class__",)))
+
+
+def _dump(obj):
+    """
+    Serialize an object for the store, without its related objects.
+    """
+    return serializer(obj.__class__, _journal_fields(obj.__class__))(obj)
+
+
+@lru_cache(maxsize=None)
+def _row_type(columns):
+    """
+    Get the named tuple type of a column selection.
+    """
+    return namedtuple("Row", columns)
+
+
+class FileQuery:
+    """
+    Minimal Query lookalike over FileStorage objects, so the management
+    modules can use the same filter/order_by/all API as with DBStorage.
+
+    Equality filters on indexed attributes are answered from the
+    storage's secondary indexes instead of scanning the class.
+    """
+
+    def __init__(self, storage, cls, criteria=(), order=(), offset=None, limit=None):
+        self._storage = storage
+        self._cls = cls
+        self._criteria = tuple(criteria)
+        self._order = tuple(order)
+        self._offset = offset
+        self._limit = limit
+
+    def _copy(self, **kwargs):
+        state = {"criteria": self._criteria, "order": self._order,
+                 "offset": self._offset, "limit": self._limit}
+        state.update(kwargs)
+        return FileQuery(self._storage, self._cls, **state)
+
+    def filter(self, *criteria):
+        return self._copy(criteria=self._criteria + criteria)
+
+    def filter_by(self, **kwargs):
+        return self.filter(*(getattr(self._cls, key) == value for key, value in kwargs.items()))
+
+    def order_by(self, *clauses):
+        if len(clauses) == 1 and clauses[0] is None:
+            return self._copy(order=())
+        return self._copy(order=self._order + clauses)
+
+    def offset(self, offset):
+        return self._copy(offset=offset)
+
+    def limit(self, limit):
+        return self._copy(limit=limit)
+
+    def options(self, *options):
+        return self
+
+    def yield_per(self, count):
+        return self
+
+    def get(self, id_):
+        return self._storage.get_by_id(self._cls, id_)
+
+    def _candidates(self):
+        name = _class_name(self._cls)
+        for attr, value in _equalities(self._criteria):
+            candidates = self._storage.lookup(name, attr, value)
+            if candidates is not None:
+                return candidates
+        return self._storage.all(name).values()
+
+    def __iter__(self):
+        predicates = [_compile(criterion) for criterion in self._criteria]
+        rows = [obj for obj in self._candidates()
+                if all(predicate(obj) for predicate in predicates)]
+
+        for clause in reversed(self._order):
+            reverse = False
+            if isinstance(clause, UnaryExpression):
+                reverse = clause.modifier is operators.desc_op
+                clause = clause.element
+            attr = clause.key
+            rows.sort(key=lambda obj: (getattr(obj, attr, None) is not None,
+                                       getattr(obj, attr, None)),
+                      reverse=reverse)
+
+        start = self._offset or 0
+        end = start + self._limit if self._limit is not None else None
+        return iter(rows[start:end])
+
+    def all(self):
+        return list(self)
+
+    def first(self):
+        return next(iter(self.limit(1)), None)
+
+    def count(self):
+        return len(self.all())
 
 
 class FileStorage:
     """
     FileStorage class to handle file storage
+
+    Mutations made through new() and delete() are appended to a journal
+    (write-ahead log) instead of rewriting the whole store. The journal is
+    compacted into the snapshot file on save() and whenever it grows past
+    __compact_threshold entries, and replayed on top of the snapshot by
+    reload().
+
+    Objects are also kept in a per-class map and in secondary hash indexes
+    on the attributes listed in `indexes`, so all(cls), get_by_id() and
+    equality filters on indexed foreign keys do not scan the whole store.
+
     Args:
         __file_storage_path (str): path to file storage
-        __storage (str): file storage file
+        __storage (str): file storage snapshot file
+        __journal (str): file storage journal file
+        __compact_threshold (int): journal entries before compaction
     """
 
     __file_storage_path = "./.store/"
     __storage = os.path.join(__file_storage_path, "file.json")
+    __journal = os.path.join(__file_storage_path, "file.journal")
+    __compact_threshold = int(os.environ.get("FILE_STORAGE_COMPACT_THRESHOLD", 10000))
     __objs = {}
+    __classes = {}
+    __indexes = {}
+    __indexed = {}
 
     def __init__(self):
+        self.__journal_entries = 0
+        self.__transaction_depth = 0
+        self.__pending = []
         if not os.path.isfile(self.__storage):
             try:
                 os.makedirs(self.__file_storage_path)
@@ -41,37 +295,218 @@ class FileStorage:
                 pass
 
     def all(self, cls=None):
-        filtered_objs = {}
         if cls is not None:
-            for key, cls in self.__objs.items():
-                if cls[__class__] == cls:
-                    filtered_objs[key] = cls
-            return filtered_objs
+            return dict(self.__classes.get(_class_name(cls), {}))
         return self.__objs
 
-    def new(self, obj):
+    def __add(self, key, obj):
         """
-        Add a new obj to storage
+        Put an object in the store, the per-class map and its indexes.
         """
-        key = f"{obj.__class__.__name__}.{obj.id}"
+        self.__remove(key)
+        name = obj.__class__.__name__
         self.__objs[key] = obj
-        self.save()
+        self.__classes.setdefault(name, {})[key] = obj
+        for attr in indexes.get(name, ()):
+            value = getattr(obj, attr, None)
+            self.__indexes.setdefault((name, attr), {}).setdefault(value, {})[key] = obj
+            self.__indexed.setdefault(key, []).append((attr, value))
+
+    def __remove(self, key):
+        """
+        Drop an object from the store, the per-class map and its indexes.
+        """
+        obj = self.__objs.pop(key, None)
+        if obj is None:
+            return
+        name = obj.__class__.__name__
+        self.__classes.get(name, {}).pop(key, None)
+        for attr, value in self.__indexed.pop(key, ()):
+            bucket = self.__indexes[(name, attr)][value]
+            bucket.pop(key, None)
+            if not bucket:
+                del self.__indexes[(name, attr)][value]
+
+    def __reindex(self):
+        """
+        Move the objects whose indexed attributes were updated in place
+        to the index entries of their current values.
+        """
+        for key, indexed in list(self.__indexed.items()):
+            obj = self.__objs[key]
+            if any(getattr(obj, attr, None) != value for attr, value in indexed):
+                self.__add(key, obj)
+
+    def lookup(self, cls, attr, value):
+        """
+        Look up objects through a secondary index.
+
+        Args:
+            cls (class|str): the class to look up.
+            attr (str): the indexed attribute.
+            value: the attribute value.
+
+        Returns:
+            list: matching objects, or None if attr is not indexed.
+        """
+        name = _class_name(cls)
+        if attr not in indexes.get(name, ()):
+            return None
+        return list(self.__indexes.get((name, attr), {}).get(value, {}).values())
+
+    def new(self, obj):
+        """
+        Add a new obj to storage and record it in the journal
+        """
+        key = _key(obj)
+        self.__add(key, obj)
+        self.__append({"op": "new", "key": key, "obj": _dump(obj)})
+
+    def bulk_save(self, objs):
+        """
+        Add a batch of objs to storage with a single journal write
+        """
+        entries = []
+        for obj in objs:
+            key = _key(obj)
+            self.__add(key, obj)
+            entries.append({"op": "new", "key": key, "obj": _dump(obj)})
+        if entries:
+            self.__append(*entries)
 
     def __serialize(self):
         objs_s = {}
         for key, obj in self.__objs.items():
-            objs_s[key] = obj.serialize()
+            objs_s[key] = _dump(obj)
         return objs_s
 
     def __deserialize(self, data):
         for key, obj_data in data.items():
-            cls = classes[obj_data['__class__']]
-            self.__objs[key] = cls(**obj_data)
+            self.__add(key, self.__load(obj_data))
+
+    @staticmethod
+    def __load(obj_data):
+        cls = classes[obj_data['__class__']]
+        if hasattr(cls, "deserialize"):
+            return cls.deserialize(dict(obj_data))
+        # association classes keep the default constructor of the mapping
+        obj_data = {key: value for key, value in obj_data.items() if key != "__class__"}
+        return cls(**parse_columns(cls, obj_data))
+
+    def __append(self, *entries):
+        """
+        Append mutations to the journal, compacting the journal into
+        the snapshot once it grows past the compaction threshold.
+
+        Args:
+            *entries (dict): the journal entries to append.
+        """
+        if self.__transaction_depth:
+            self.__pending.extend(entries)
+            return
+
+        with open(self.__journal, "a") as file:
+            file.writelines(json.dumps(entry, default=str) + "\n" for entry in entries)
+        self.__journal_entries += len(entries)
+
+        if self.__journal_entries >= self.__compact_threshold:
+            self.compact()
+
+    def __replay(self):
+        """
+        Replay the journal on top of the loaded snapshot.
+
+        Raises:
+            ValueError: If an entry before the last one cannot be read; the
+                journal is left as is, to be repaired by hand.
+        """
+        try:
+            with open(self.__journal, "rb") as file:
+                lines = file.readlines()
+        except FileNotFoundError:
+            return
+
+        replayed = 0
+        end = 0
+        for number, line in enumerate(lines, 1):
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError("incomplete entry")
+                entry = json.loads(line)
+            except ValueError:
+                if number < len(lines):
+                    # only a write cut short by a crash is expected, and only at the end
+                    raise ValueError(f"Corrupt entry on line {number} of the journal {self.__journal}")
+                # A torn write can only happen on the last entry: cut it off,
+                # or the entries appended after it would be lost on reload
+                with open(self.__journal, "r+b") as file:
+                    file.truncate(end)
+                break
+            if entry["op"] == "new":
+                self.__add(entry["key"], self.__load(entry["obj"]))
+            elif entry["op"] == "delete":
+                self.__remove(entry["key"])
+            replayed += 1
+            end += len(line)
+        self.__journal_entries = replayed
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group several storage operations into a single unit of work.
+
+        Journal entries are buffered and written once when the outermost
+        block exits; on error the buffer is dropped and the objects are
+        reloaded from disk before the error is re-raised.
+
+        Yields:
+            FileStorage: this storage.
+        """
+        self.__transaction_depth += 1
+        try:
+            yield self
+        except Exception:
+            self.__transaction_depth -= 1
+            if not self.__transaction_depth:
+                self.__pending.clear()
+                self.close()
+                self.reload()
+            raise
+        self.__transaction_depth -= 1
+        if not self.__transaction_depth and self.__pending:
+            entries, self.__pending = self.__pending, []
+            self.__append(*entries)
 
-    def save(self):
+    def compact(self):
+        """
+        Write every object to the snapshot file and truncate the journal.
+        """
         serialized_obj = self.__serialize()
-        with open(self.__storage, "w") as file:
-            json.dump(serialized_obj, file)
+        tmp_storage = f"{self.__storage}.tmp"
+        with open(tmp_storage, "w") as file:
+            json.dump(serialized_obj, file, default=str)
+        os.replace(tmp_storage, self.__storage)
+
+        open(self.__journal, "w").close()
+        self.__journal_entries = 0
+
+    def save(self, obj=None):
+        """
+        Save objects to storage.
+
+        Args:
+            obj (BaseModel, optional): when given, only this object is
+                journaled; otherwise the objects updated in place are
+                re-indexed and the journal is compacted, unless inside a
+                transaction() block.
+        """
+        if obj is not None:
+            self.new(obj)
+            return
+
+        self.__reindex()
+        if not self.__transaction_depth:
+            self.compact()
 
     def reload(self):
         try:
@@ -80,11 +515,144 @@ class FileStorage:
                 self.__deserialize(data)
         except FileNotFoundError:
             pass
+        self.__replay()
 
     def close(self):
         self.__objs.clear()
+        self.__classes.clear()
+        self.__indexes.clear()
+        self.__indexed.clear()
+
+    def after_fork(self):
+        """
+        Nothing to do, the store holds no connection.
+        """
+
+    def use_primary(self):
+        """
+        Read from the primary, the store has no replica.
+        """
+
+    def pool_status(self):
+        """
+        Get the state of the connection pool.
+
+        Returns:
+            None: the store holds no connection.
+        """
+        return None
+
+    def pool_statuses(self):
+        """
+        Get the state of the connection pool of every bind.
+
+        Returns:
+            dict: empty, the store holds no connection.
+        """
+        return {}
 
     def delete(self, obj):
-        key = f"{obj.__class__.__name__}.{obj.id}"
-        self.__objs.pop(key, None)
-        self.save()
+        key = _key(obj)
+        self.__remove(key)
+        self.__append({"op": "delete", "key": key})
+
+    def delete_by_id(self, cls, id_):
+        """
+        Delete an object from storage.
+        Args:
+            cls (class): the class to delete.
+            id_ (str): the id of the object to delete.
+        """
+        obj = self.get_by_id(cls, id_)
+        if obj is not None:
+            self.delete(obj)
+
+    def delete_by_filter(self, cls, filter_):
+        """
+        Delete every object matching a filter with a single journal write.
+        Args:
+            cls (class): the class to delete.
+            filter_ (condition): the filter selecting the objects to delete.
+
+        Returns:
+            int: the number of deleted objects.
+        """
+        entries = []
+        for obj in self.get_by_filter(cls, filter_).all():
+            key = _key(obj)
+            self.__remove(key)
+            entries.append({"op": "delete", "key": key})
+        if entries:
+            self.__append(*entries)
+        return len(entries)
+
+    def get_by_id(self, cls, id, profile=None):
+        """
+        Get an object from storage.
+        Args:
+            cls (class): the class to query.
+            id (str): the id of the object to get.
+            profile (str, optional): ignored, objects are always loaded.
+
+        Returns:
+            object: the object, or None if it does not exist.
+        """
+        return self.__objs.get(f"{_class_name(cls)}.{id}")
+
+    def query(self, cls, profile=None):
+        """
+        Query all objects of a class.
+        Args:
+            cls (class): the class to query.
+            profile (str, optional): ignored, objects are always loaded.
+
+        Returns:
+            FileQuery: a query over the objects of the class.
+        """
+        return FileQuery(self, cls)
+
+    def rows(self, cls, columns=None, filters=(), order_by=(), batch_size=None):
+        """
+        Read objects as plain rows.
+        Args:
+            cls (class): the class to read.
+            columns (iterable, optional): the names of the columns to select,
+                every mapped column by default.
+            filters (iterable): the filter conditions.
+            order_by (iterable): the ordering clauses.
+            batch_size (int, optional): ignored, objects are already in memory.
+
+        Returns:
+            list: named tuples of the selected columns.
+        """
+        if columns is None:
+            columns = [attr.key for attr in inspect(cls).column_attrs]
+        row_type = _row_type(tuple(columns))
+        query = self.query(cls).filter(*filters).order_by(*order_by)
+        return [row_type(*(getattr(obj, column, None) for column in columns)) for obj in query]
+
+    def version(self, cls, *filters):
+        """
+        Get the version of a collection of objects.
+        Args:
+            cls (class): the class of the objects.
+            *filters: the conditions selecting the objects.
+
+        Returns:
+            tuple: the latest updated_at (None without objects) and the
+            number of objects.
+        """
+        stamps = [getattr(obj, "updated_at", None) for obj in self.query(cls).filter(*filters)]
+        return max(filter(None, stamps), default=None), len(stamps)
+
+    def get_by_filter(self, cls, filter_):
+        """
+        Get objects matching a filter.
+        Args:
+            cls (class): the class to query.
+            filter_ (condition): the filter to query.
+
+        Returns:
+            FileQuery: the filtered query.
+        """
+        return self.query(cls).filter(filter_)
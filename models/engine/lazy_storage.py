@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+"""
+The script defines the lazily created storage.
+
+Importing the models must not connect to the database: the scripts, the
+tests and the server master that only need the classes would all pay for
+an engine, a session and a reload they never use. The storage is created
+and reloaded on its first use instead, once per process.
+"""
+import threading
+
+
+class LazyStorage:
+    """
+    Stands in for the storage engine until it is first used.
+
+    Attributes are forwarded to the engine created by the factory. The
+    methods are looked up once and then kept on the proxy, so a call costs
+    the same as on the engine itself.
+    """
+
+    def __init__(self, factory):
+        """
+        Args:
+            factory (callable): creates the storage engine.
+        """
+        self.__factory = factory
+        self.__storage = None
+        self.__lock = threading.Lock()
+
+    @property
+    def instance(self):
+        """
+        The storage engine, created and reloaded on first access.
+        """
+        storage = self.__storage
+        if storage is None:
+            with self.__lock:
+                if self.__storage is None:
+                    storage = self.__factory()
+                    storage.reload()
+                    self.__storage = storage
+                storage = self.__storage
+        return storage
+
+    @property
+    def initialized(self):
+        """
+        Whether the storage engine was created.
+        """
+        return self.__storage is not None
+
+    def after_fork(self):
+        """
+        Reset the connections inherited from the parent process, if any.
+        """
+        if self.__storage is not None:
+            self.__storage.after_fork()
+
+    def __getattr__(self, name):
+        value = getattr(self.instance, name)
+        if callable(value):
+            setattr(self, name, value)
+        return value
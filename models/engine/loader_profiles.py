@@ -0,0 +1,47 @@
+#!/usr/bin/python3
+"""
+The script defines named eager-loading profiles for storage queries.
+
+A profile bundles the selectinload/joinedload options a read path needs,
+so listing N objects costs a fixed number of queries instead of one lazy
+load per object and relationship.
+"""
+from sqlalchemy.orm import joinedload, selectinload
+
+from models.attendance import Attendance
+from models.class_course_assoc import ClassCourseAssociation
+from models.classe import Class
+from models.course import Course
+
+# Options are built on first use, once every mapper has been configured
+profiles = {
+    # Class listings with grades, enrollments and attendance with the student
+    "class_overview": lambda: (selectinload(Class.gradebooks),
+                               selectinload(Class.students),
+                               selectinload(Class.attendances).joinedload(Attendance.student)),
+    # A single class with grades, enrollments and attendance
+    "class_details": lambda: (selectinload(Class.gradebooks),
+                              selectinload(Class.students),
+                              selectinload(Class.attendances)),
+    # Attendance rows with their student and class
+    "attendance_with_student": lambda: (joinedload(Attendance.student),
+                                        joinedload(Attendance.classe)),
+    # Course listings with their classes, the teacher names are read from the users
+    "course_overview": lambda: (selectinload(Course.classes).joinedload(ClassCourseAssociation.classe),),
+}
+
+
+def get_profile(name):
+    """
+    Get the loader options of a profile.
+
+    Args:
+        name (str): the name of the profile.
+
+    Returns:
+        tuple: the loader options of the profile.
+    """
+    try:
+        return profiles[name]()
+    except KeyError:
+        raise ValueError(f"Unknown loader profile: {name}")
@@ -0,0 +1,41 @@
+#!/usr/bin/python3
+"""
+The script creates the database schema: the missing tables, and the
+schema changes Base.metadata.create_all() does not make, such as indexes
+added to tables that already exist. The services do not create tables
+on startup, run it before starting them.
+
+Usage:
+    STORAGE_ENGINE=db STORAGE_USER=... STORAGE_PASSWORD=... \
+    STORAGE_DATABASE=... STORAGE_HOST=... python3 -m models.engine.migrate [--reset]
+    STORAGE_ENGINE=sqlite STORAGE_DATABASE=sms.db python3 -m models.engine.migrate
+"""
+import argparse
+
+from models import storage
+from models.engine.dbstorage import DBStorage
+
+
+def main():
+    """
+    Create the missing tables and indexes.
+    """
+    parser = argparse.ArgumentParser(description="Create the database schema")
+    parser.add_argument("--reset", action="store_true",
+                        help="drop every table first (test databases only)")
+    args = parser.parse_args()
+
+    if not isinstance(storage.instance, DBStorage):
+        raise SystemExit("Migrations only apply to the database storage (STORAGE_ENGINE=db or sqlite)")
+
+    storage.create_schema(drop=args.reset)
+    created = storage.ensure_indexes()
+    if created:
+        for name in created:
+            print(f"Created index {name}")
+    else:
+        print("Database indexes are up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+"""
+The script defines keyset (cursor) pagination for storage queries.
+
+Pages are ordered by (created_at, id) and each page starts after the last
+row of the previous one, so a deep page costs the same index range scan
+as the first one instead of an ever larger OFFSET.
+"""
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(obj):
+    """
+    Encode the position of an object as an opaque cursor.
+
+    Args:
+        obj (BaseModel): the last object of a page.
+
+    Returns:
+        str: the cursor of the next page.
+    """
+    created_at = obj.created_at.isoformat() if obj.created_at else None
+    token = json.dumps([created_at, obj.id]).encode("utf-8")
+    return base64.urlsafe_b64encode(token).decode("ascii")
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor (str): the cursor.
+
+    Returns:
+        tuple: the created_at and id the next page starts after.
+    """
+    try:
+        created_at, id_ = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(created_at) if created_at else None, id_
+    except (ValueError, TypeError):
+        raise ValueError("Invalid pagination cursor")
+
+
+def paginate(query, cls, cursor=None, page_size=10):
+    """
+    Get one page of a query.
+
+    Args:
+        query (Query): the query to paginate, any ordering is replaced.
+        cls (class): the class queried.
+        cursor (str, optional): the cursor returned with the previous page.
+        page_size (int): the maximum number of objects in the page.
+
+    Returns:
+        tuple: the objects of the page and the cursor of the next page,
+        or None on the last page.
+    """
+    if page_size < 1:
+        raise ValueError("Page size must be at least 1")
+
+    query = query.order_by(None).order_by(cls.created_at, cls.id)
+    if cursor:
+        created_at, id_ = decode_cursor(cursor)
+        query = query.filter(or_(cls.created_at > created_at,
+                                 and_(cls.created_at == created_at, cls.id > id_)))
+
+    rows = query.limit(page_size + 1).all()
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        return rows, encode_cursor(rows[-1])
+    return rows, None
@@ -0,0 +1,125 @@
+#!/usr/bin/python3
+"""
+The script defines the instrumentation of the database connection pool.
+
+The pool events count the connections opened, checked out, returned and
+invalidated. The time a thread waits for a connection has no event, so
+the pool class itself times its checkouts into a histogram; a high wait
+or any checkout timeout means the pool is too small for the load.
+"""
+import bisect
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import QueuePool
+
+# upper bounds of the wait time histogram buckets, in seconds
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class PoolMetrics:
+    """
+    Counters and the checkout wait histogram of a connection pool.
+    """
+
+    def __init__(self, buckets=WAIT_BUCKETS):
+        self.buckets = buckets
+        self.wait_counts = [0] * (len(buckets) + 1)
+        self.wait_sum = 0.0
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.__lock = threading.Lock()
+
+    def observe_wait(self, seconds, timed_out=False):
+        """
+        Record the wait of one checkout.
+
+        Args:
+            seconds (float): the time spent waiting for a connection.
+            timed_out (bool): whether the wait ended with a pool timeout.
+        """
+        with self.__lock:
+            self.wait_counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self.wait_sum += seconds
+            if timed_out:
+                self.timeouts += 1
+
+    def count(self, counter):
+        with self.__lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def listen(self, pool):
+        """
+        Count the events of a pool.
+
+        Args:
+            pool (Pool): the pool of an engine.
+        """
+        event.listen(pool, "connect", lambda *args: self.count("connects"))
+        event.listen(pool, "checkout", lambda *args: self.count("checkouts"))
+        event.listen(pool, "checkin", lambda *args: self.count("checkins"))
+        event.listen(pool, "invalidate", lambda *args: self.count("invalidations"))
+        event.listen(pool, "soft_invalidate", lambda *args: self.count("invalidations"))
+
+    def snapshot(self, pool):
+        """
+        Read the metrics along with the current state of a pool.
+
+        Args:
+            pool (Pool): the pool the metrics are collected from.
+
+        Returns:
+            dict: the pool size, the connections checked out and in, the
+            overflow, the counters, and the cumulative wait histogram as
+            (upper bound, count) pairs ending with (inf, total).
+        """
+        with self.__lock:
+            cumulative, total = [], 0
+            for bound, count in zip((*self.buckets, float("inf")), self.wait_counts):
+                total += count
+                cumulative.append((bound, total))
+            return {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_buckets": cumulative,
+                "wait_sum": self.wait_sum,
+                "wait_count": total,
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool timing how long each checkout waits for a connection.
+    """
+
+    def __init__(self, *args, metrics=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = metrics if metrics is not None else PoolMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeout:
+            self.metrics.observe_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.observe_wait(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        # dispose() replaces the pool, the metrics carry over
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
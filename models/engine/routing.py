@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+"""
+The script defines the session routing reads to read replicas.
+
+A session reads from one replica, picked round-robin when it first
+reads, so the reports of one request see a single consistent replica.
+Writes, flushes and SELECT ... FOR UPDATE go to the primary, and once a
+session has written every later read goes to the primary too, so a
+request always reads its own writes despite the replication lag.
+"""
+import itertools
+import threading
+
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+
+class ReplicaSet:
+    """
+    Round-robin over the engines of the read replicas.
+    """
+
+    def __init__(self, engines):
+        """
+        Args:
+            engines (list): the replica engines.
+        """
+        self.engines = list(engines)
+        self.__cycle = itertools.cycle(self.engines)
+        self.__lock = threading.Lock()
+
+    def __bool__(self):
+        return bool(self.engines)
+
+    def next(self):
+        with self.__lock:
+            return next(self.__cycle)
+
+
+class RoutingSession(Session):
+    """
+    Session sending the reads to a replica and the writes to the primary.
+    """
+
+    def __init__(self, replicas=None, **kwargs):
+        """
+        Args:
+            replicas (ReplicaSet, optional): the read replicas; without
+                them every statement goes to the bound primary.
+            **kwargs: the Session arguments, bind being the primary.
+        """
+        super().__init__(**kwargs)
+        self.replicas = replicas
+
+    def use_primary(self):
+        """
+        Send every later statement of the session to the primary.
+        """
+        self.info["pinned"] = True
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        primary = super().get_bind(mapper=mapper, clause=clause, **kwargs)
+        if not self.replicas or self.info.get("pinned"):
+            return primary
+
+        if self._flushing or isinstance(clause, UpdateBase) \
+                or getattr(clause, "_for_update_arg", None) is not None:
+            self.use_primary()
+            return primary
+
+        replica = self.info.get("replica")
+        if replica is None:
+            replica = self.info["replica"] = self.replicas.next()
+        return replica
@@ -4,7 +4,7 @@
 The script defines the Gradebook class, representing a Gradebook entry.
 """
 
-from sqlalchemy import Column, Integer, ForeignKey, CheckConstraint, String
+from sqlalchemy import Column, Integer, ForeignKey, CheckConstraint, String, Index
 from sqlalchemy.orm import relationship, validates
 
 from models.basemodel import BaseModel, Base
@@ -25,6 +25,10 @@ class Grade(BaseModel, Base):
     """
 
     __tablename__ = 'gradebook'
+    __table_args__ = (
+        Index("ix_gradebook_class_year_term", "class_id", "academic_year", "term"),
+        Index("ix_gradebook_student_year_term", "student_id", "academic_year", "term"),
+    )
 
     grade = Column(Integer, CheckConstraint('grade >= 0 AND grade <= 100'),
                    nullable=False, )
@@ -37,17 +37,21 @@ class Parent(BaseModel, Base):
     partner = Column(String(50))
     students = relationship("Student", secondary=parent_student_association, back_populates="parents")
 
-    def __init__(self, parent_id, marital_status=None, occupation=None, **kwargs):
+    def __init__(self, parent_id=None, marital_status=None, occupation=None, **kwargs):
         """
         Initialize a Parent instance.
 
         Args:
-            parent_id (str): The ID of the parent.
+            parent_id (str): The ID of the parent, the ID of its user. A
+                serialized parent gives it as `id` instead.
             marital_status (str): The marital status of the parent.
             occupation (str): The occupation of the parent.
             **kwargs: Additional keyword arguments.
         """
+        if parent_id is None and "id" not in kwargs:
+            raise TypeError("Parent requires the parent_id of its user")
         super().__init__(**kwargs)
-        self.id = parent_id
+        if parent_id is not None:
+            self.id = parent_id
         self.marital_status = marital_status
         self.occupation = occupation
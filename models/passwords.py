@@ -0,0 +1,138 @@
+#!/usr/bin/python3
+"""
+The script defines the password hashing of the users.
+
+Passwords are hashed with bcrypt. The cost factor is read from
+SMS_BCRYPT_ROUNDS (see benchmarks/password_cost.py to pick it for a target
+login latency). Hashes from before bcrypt are unsalted MD5 hex digests;
+they are still verified, and needs_rehash() reports them so the login can
+replace them with a bcrypt hash.
+
+Every hash and verification runs on a bounded worker pool (run_in_pool).
+The pool is a concurrency limit, not an offload: the request thread still
+waits for the result, but at most SMS_PASSWORD_WORKERS hashes are computed
+at once and at most SMS_PASSWORD_QUEUE more requests wait for a worker.
+A login storm therefore costs a bounded number of cores, and the requests
+beyond the queue fail fast with PasswordPoolBusy (503) after
+SMS_PASSWORD_QUEUE_TIMEOUT seconds instead of piling up.
+"""
+import hmac
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import md5
+from os import environ
+
+import bcrypt
+
+ROUNDS = int(environ.get("SMS_BCRYPT_ROUNDS", 12))
+WORKERS = int(environ.get("SMS_PASSWORD_WORKERS", os.cpu_count() or 1))
+QUEUE = int(environ.get("SMS_PASSWORD_QUEUE", WORKERS * 8))
+QUEUE_TIMEOUT = float(environ.get("SMS_PASSWORD_QUEUE_TIMEOUT", 5))
+
+_legacy = re.compile(r"^[0-9a-f]{32}$")
+
+
+class PasswordPoolBusy(Exception):
+    """
+    Raised when no verification slot frees up in time.
+    """
+
+
+def hash_password(password, rounds=None):
+    """
+    Hash a password with bcrypt.
+
+    Args:
+        password (str): the password to hash.
+        rounds (int, optional): the cost factor, SMS_BCRYPT_ROUNDS by default.
+
+    Returns:
+        str: the hashed password.
+    """
+    salt = bcrypt.gensalt(rounds or ROUNDS)
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+
+def is_legacy(hashed):
+    """
+    Check whether a hash is a legacy unsalted MD5 digest.
+
+    Args:
+        hashed (str): the stored hash.
+
+    Returns:
+        bool: True for an MD5 digest.
+    """
+    return bool(hashed) and _legacy.match(hashed) is not None
+
+
+def needs_rehash(hashed, rounds=None):
+    """
+    Check whether a hash should be replaced on the next successful login.
+
+    Args:
+        hashed (str): the stored hash.
+        rounds (int, optional): the wanted cost factor, SMS_BCRYPT_ROUNDS by default.
+
+    Returns:
+        bool: True for legacy hashes and bcrypt hashes of another cost.
+    """
+    if is_legacy(hashed):
+        return True
+    try:
+        return int(hashed.split("$")[2]) != (rounds or ROUNDS)
+    except (AttributeError, IndexError, ValueError):
+        return True
+
+
+def verify_password(password, hashed):
+    """
+    Verify a password against a stored hash.
+
+    Args:
+        password (str): the password to verify.
+        hashed (str): the stored bcrypt or legacy MD5 hash.
+
+    Returns:
+        bool: True if the password matches.
+    """
+    if not password or not hashed:
+        return False
+    if is_legacy(hashed):
+        digest = md5(password.encode("utf-8")).hexdigest()
+        return hmac.compare_digest(digest, hashed)
+    try:
+        return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+    except ValueError:
+        return False
+
+
+_pool = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="password")
+_slots = threading.BoundedSemaphore(WORKERS + QUEUE)
+
+
+def run_in_pool(fn, *args):
+    """
+    Run a hashing function on the password worker pool and wait for it.
+
+    The calling thread blocks until the result is ready: the pool bounds
+    how many hashes run at once, it does not free the caller.
+
+    Args:
+        fn (callable): the function to run, e.g. verify_password.
+        *args: its arguments.
+
+    Returns:
+        object: the result of the function.
+
+    Raises:
+        PasswordPoolBusy: if the pool stays full for SMS_PASSWORD_QUEUE_TIMEOUT seconds.
+    """
+    if not _slots.acquire(timeout=QUEUE_TIMEOUT):
+        raise PasswordPoolBusy("Too many logins in progress, try again later")
+    try:
+        return _pool.submit(fn, *args).result()
+    finally:
+        _slots.release()
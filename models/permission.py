@@ -35,20 +35,22 @@ class Permission(BaseModel, Base):
     assigned_user_id = Column(String(50), ForeignKey('users.id'), nullable=False)
     access_level = Column(Integer, nullable=False, default=0)
 
-    def __init__(self, permission_name, role_id, assigned_user_id, permission_desc="", access_level=0):
+    def __init__(self, permission_name, role_id=None, assigned_user_id=None, permission_desc="",
+                 access_level=0, **kwargs):
         """
         Initialize a Permission instance.
 
         Args:
             permission_name (str): The name of the permission.
-            role_id (str): The ID of the role associated with the permission.
+            role_id (str, optional): The ID of the role associated with the permission.
             assigned_user_id (str): The ID of the user to whom the permission is assigned.
             permission_desc (str, optional): The description of the permission.
             access_level (int, optional): The access level of the permission.
+            **kwargs: Additional keyword arguments.
         """
-        super().__init__()
+        super().__init__(**kwargs)
         self.permission_name = permission_name
         self.role_id = role_id
         self.assigned_user_id = assigned_user_id
         self.permission_desc = permission_desc
-        self.access_level = 0
+        self.access_level = access_level
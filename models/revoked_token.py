@@ -0,0 +1,41 @@
+#!/usr/bin/python3
+"""
+The revoked token model is defined in this module
+"""
+from sqlalchemy import Column, Integer, String
+
+from models.basemodel import BaseModel, Base
+
+
+class RevokedToken(BaseModel, Base):
+    """
+    RevokedToken model recording an access token revoked before its expiry.
+
+    Args:
+        jti (str): The unique identifier of the token.
+        expires_at (int): The expiry of the token, as a Unix timestamp.
+
+    Attributes:
+        jti (str): The unique identifier of the token.
+        expires_at (int): The expiry of the token, as a Unix timestamp. The
+            record is no longer needed once the token has expired.
+    """
+
+    __tablename__ = 'revoked_tokens'
+
+    jti = Column(String(50), unique=True, nullable=False)
+    expires_at = Column(Integer, nullable=False, index=True)
+
+    def __init__(self, jti, expires_at, *args, **kwargs):
+        """
+        Initialize a RevokedToken instance.
+
+        Args:
+            jti (str): The unique identifier of the token.
+            expires_at (int): The expiry of the token, as a Unix timestamp.
+            *args: Additional positional arguments.
+            **kwargs: Additional keyword arguments.
+        """
+        super().__init__(*args, **kwargs)
+        self.jti = jti
+        self.expires_at = int(expires_at)
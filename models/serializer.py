@@ -0,0 +1,234 @@
+#!/usr/bin/python3
+"""
+The script defines the per-class serializers of the models.
+
+A serializer is built once per class (and field selection) from the
+SQLAlchemy mapper: it reads the mapped columns straight from the instance
+with a single itemgetter or attrgetter and formats dates with precomputed
+converters, instead of copying and inspecting the whole instance __dict__
+on every call.
+"""
+from datetime import date, datetime
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+
+from sqlalchemy import Date, DateTime, inspect
+
+# created_at and updated_at keep the format FileStorage parses them back with
+TIMESTAMPS = ("created_at", "updated_at")
+
+
+def _timestamp(value):
+    """
+    Format a datetime as "%Y-%m-%d %H:%M:%S".
+    """
+    if value.__class__ is datetime:
+        return value.isoformat(" ", "seconds")[:19]
+    return value
+
+
+def _isoformat(value):
+    """
+    Format a date or a datetime in ISO 8601.
+    """
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _converter(key, column):
+    """
+    Get the converter of a column, or None when the value is used as is.
+    """
+    if key in TIMESTAMPS:
+        return _timestamp
+    if isinstance(column.type, (DateTime, Date)):
+        return _isoformat
+    return None
+
+
+def _getter(make_getter, keys):
+    """
+    Get a function reading several keys at once, always as a tuple.
+    """
+    if not keys:
+        return lambda source: ()
+    if len(keys) == 1:
+        get = make_getter(keys[0])
+        return lambda source: (get(source),)
+    return make_getter(*keys)
+
+
+def _parse_date(value):
+    """
+    Parse an ISO 8601 date, or the date of an ISO 8601 datetime.
+    """
+    return datetime.fromisoformat(value).date()
+
+
+@lru_cache(maxsize=256)
+def _parsers(cls):
+    """
+    Get the (column, parser) pairs of the date and datetime columns of a class.
+    """
+    mapper = inspect(cls, raiseerr=False)
+    if mapper is None:
+        return tuple((key, datetime.fromisoformat) for key in TIMESTAMPS)
+    parsers = []
+    for attr in mapper.column_attrs:
+        column_type = attr.columns[0].type
+        if isinstance(column_type, DateTime):
+            parsers.append((attr.key, datetime.fromisoformat))
+        elif isinstance(column_type, Date):
+            parsers.append((attr.key, _parse_date))
+    return tuple(parsers)
+
+
+def parse_columns(cls, obj_s):
+    """
+    Parse the dates of a serialized instance back, the inverse of the
+    converters of its serializer.
+
+    Args:
+        cls (class): the model class.
+        obj_s (dict): the serialized instance, updated in place.
+
+    Returns:
+        dict: obj_s, holding dates and datetimes instead of strings.
+    """
+    for key, parse in _parsers(cls):
+        value = obj_s.get(key)
+        if isinstance(value, str):
+            obj_s[key] = parse(value)
+    return obj_s
+
+
+@lru_cache(maxsize=256)
+def serializer(cls, fields=None):
+    """
+    Get the serializer of a model class.
+
+    Args:
+        cls (class): the model class.
+        fields (tuple, optional): the only attributes to serialize.
+
+    Returns:
+        callable: a function turning an instance of cls into a dict.
+    """
+    mapper = inspect(cls, raiseerr=False)
+    if mapper is None:
+        return _serialize_dict if fields is None else _select(_serialize_dict, fields)
+
+    columns = [(attr.key, _converter(attr.key, attr.columns[0]))
+               for attr in mapper.column_attrs
+               if fields is None or attr.key in fields]
+    # many-to-one relationships are serialized when already loaded
+    references = tuple(rel.key for rel in mapper.relationships
+                       if not rel.uselist and (fields is None or rel.key in fields))
+    with_class = fields is None or "__class__" in fields
+    name = cls.__name__
+
+    keys = tuple(key for key, _ in columns)
+    converters = tuple((key, convert) for key, convert in columns if convert is not None)
+    # the columns are read from __dict__ in one call; attributes missing
+    # from it (expired, deferred or never set) raise KeyError and the
+    # instance is read through its attributes instead
+    read_state = _getter(itemgetter, keys)
+    read_attributes = _getter(attrgetter, keys)
+
+    def serialize(obj):
+        state = obj.__dict__
+        try:
+            values = read_state(state)
+        except KeyError:
+            values = read_attributes(obj)
+        obj_s = dict(zip(keys, values))
+        for key, convert in converters:
+            obj_s[key] = convert(obj_s[key])
+        if with_class:
+            obj_s["__class__"] = name
+        for key in references:
+            if key in state:
+                obj_s[key] = _related(state[key])
+        return obj_s
+
+    return serialize
+
+
+def column_keys(cls, fields=None):
+    """
+    Get the mapped columns of a class, in a field selection.
+
+    Args:
+        cls (class): the model class.
+        fields (iterable, optional): the field selection, unknown fields are ignored.
+
+    Returns:
+        tuple: the column names.
+    """
+    return tuple(attr.key for attr in inspect(cls).column_attrs
+                 if fields is None or attr.key in fields)
+
+
+@lru_cache(maxsize=256)
+def row_serializer(cls, fields=None):
+    """
+    Get the serializer of the rows read with storage.rows.
+
+    The rows must hold the columns given by column_keys(cls, fields), in
+    that order, and serialize to the same dict as the instances would.
+
+    Args:
+        cls (class): the model class.
+        fields (tuple, optional): the field selection.
+
+    Returns:
+        callable: a function turning a row into a dict.
+    """
+    columns = inspect(cls).columns
+    keys = column_keys(cls, fields)
+    converters = tuple((key, _converter(key, columns[key])) for key in keys
+                       if _converter(key, columns[key]) is not None)
+    with_class = fields is None or "__class__" in fields
+    name = cls.__name__
+
+    def serialize(row):
+        obj_s = dict(zip(keys, row))
+        for key, convert in converters:
+            obj_s[key] = convert(obj_s[key])
+        if with_class:
+            obj_s["__class__"] = name
+        return obj_s
+
+    return serialize
+
+
+def _related(value):
+    """
+    Serialize an optional related instance.
+    """
+    return value.serialize() if value is not None else None
+
+
+def _serialize_dict(obj):
+    """
+    Serialize an instance of an unmapped class from its __dict__.
+    """
+    from models.basemodel import BaseModel
+
+    obj_s = {}
+    for key, value in obj.__dict__.items():
+        if key in TIMESTAMPS:
+            value = _timestamp(value)
+        elif isinstance(value, BaseModel):
+            value = value.serialize()
+        obj_s[key] = value
+    obj_s["__class__"] = obj.__class__.__name__
+    return obj_s
+
+
+def _select(serialize, fields):
+    """
+    Restrict a serializer to some fields.
+    """
+    return lambda obj: {key: value for key, value in serialize(obj).items() if key in fields}
@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+"""
+The signing key model is defined in this module
+"""
+from sqlalchemy import Column, String, Text
+
+from models.basemodel import BaseModel, Base
+
+
+class SigningKey(BaseModel, Base):
+    """
+    SigningKey model holding one RSA key pair of the access token keyring.
+
+    The newest key signs the new tokens; the previous ones only verify the
+    tokens they signed, until those expire.
+
+    Args:
+        kid (str): The key identifier, sent in the header of the tokens.
+        public_key (str): The PEM encoded public key.
+        private_key (str): The PEM encoded private key, encrypted with APP_SECRET when set.
+
+    Attributes:
+        kid (str): The key identifier.
+        public_key (str): The PEM encoded public key.
+        private_key (str): The PEM encoded private key.
+    """
+
+    __tablename__ = 'signing_keys'
+
+    kid = Column(String(50), unique=True, nullable=False)
+    public_key = Column(Text, nullable=False)
+    private_key = Column(Text, nullable=False)
+
+    def __init__(self, kid, public_key, private_key, *args, **kwargs):
+        """
+        Initialize a SigningKey instance.
+
+        Args:
+            kid (str): The key identifier.
+            public_key (str): The PEM encoded public key.
+            private_key (str): The PEM encoded private key.
+            *args: Additional positional arguments.
+            **kwargs: Additional keyword arguments.
+        """
+        super().__init__(*args, **kwargs)
+        self.kid = kid
+        self.public_key = public_key
+        self.private_key = private_key
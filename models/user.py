@@ -5,13 +5,12 @@ The user model represents a user in the system.
 
 import re
 from datetime import datetime
-from hashlib import md5
 
-from bcrypt import gensalt
 from sqlalchemy import Column, String, Boolean, Date
 from sqlalchemy.orm import relationship, validates
 
 from models.basemodel import BaseModel, Base
+from models.passwords import hash_password, run_in_pool
 
 
 # from email_validator import validate_email
@@ -19,17 +18,18 @@ from models.basemodel import BaseModel, Base
 
 def _hash_password(password):
     """
-           Hashes the given password using bcrypt.
+           Hashes the given password using bcrypt, on the password worker pool.
 
            Args:
                password (str): The password to hash.
 
            Returns:
                str: The hashed password.
+
+           Raises:
+               PasswordPoolBusy: If the password worker pool stays full.
            """
-    salt = gensalt()
-    hashed_password = md5(password.encode('utf-8')).hexdigest()
-    return hashed_password
+    return run_in_pool(hash_password, password)
 
 
 def validate_password(password_):
@@ -165,7 +165,7 @@ class User(BaseModel, Base):
                  other_names=None,
                  address=None,
                  last_login_date=datetime.now(),
-                 dob=None, last_login_ip=None, *args, **kwargs):
+                 dob=None, last_login_ip=None, password_hash=None, *args, **kwargs):
         """
         Initialize a User instance.
 
@@ -179,6 +179,7 @@ class User(BaseModel, Base):
             address (str, optional): The address of the user.
             dob (Date, optional): The date of birth of the user.
             last_login_ip (str, optional): The last login IP address of the user.
+            password_hash (str, optional): An already hashed password, used instead of password.
             *args: Additional positional arguments.
             **kwargs: Additional keyword arguments.
         """
@@ -186,7 +187,7 @@ class User(BaseModel, Base):
         self.first_name = first_name
         self.last_name = last_name
         self.email = email
-        self.password = _hash_password(password)
+        self.password = password_hash if password_hash else _hash_password(password)
         self.gender = gender
         self.other_names = other_names
         self.contact_number = contact_number
@@ -196,6 +197,21 @@ class User(BaseModel, Base):
         self.last_login_ip = last_login_ip
         self.permission_id = permission_id
 
+    @classmethod
+    def deserialize(cls, obj):
+        """
+        Deserialize a user without hashing its stored password again.
+
+        Args:
+            obj (dict): Serialized representation of the user.
+
+        Returns:
+            User: Deserialized user instance.
+        """
+        obj["password_hash"] = obj.pop("password")
+        obj["password"] = None
+        return super().deserialize(obj)
+
     @classmethod
     def get_by_email(cls, email):
         """
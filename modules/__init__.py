@@ -1 +1,13 @@
-from modules.attendance_tracking.attendance_management import AttendanceManagement
+from importlib import import_module
+
+# imported on first access, importing a submodule must not load them all
+_exports = {
+    "AttendanceManagement": "modules.attendance_tracking.attendance_management",
+    "AttendanceStatistics": "modules.attendance_tracking.attendance_statistics",
+}
+
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_exports[name]), name)
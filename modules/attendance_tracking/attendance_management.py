@@ -8,6 +8,8 @@ This module provides methods to manage attendance records for students.
 from sqlalchemy import desc, asc
 
 from models import storage, Attendance, Class
+from models.engine.pagination import paginate
+from models.serializer import column_keys
 
 
 class AttendanceManagement:
@@ -35,6 +37,79 @@ class AttendanceManagement:
         self.term = term
         self.class_id = class_id
 
+    def _attendance_filters(self, **kwargs):
+        """
+        Builds the filter conditions of the attendance records.
+
+        Returns:
+            list: The conditions on the attendance records.
+        """
+        if self.class_id and not storage.get_by_id(Class, self.class_id):
+            raise ValueError(f"Class with id {self.class_id} was not found.")
+        return self._record_filters(**kwargs)
+
+    async def _attendance_filters_async(self, async_storage, **kwargs):
+        """
+        Builds the filter conditions of the attendance records, checking
+        the class through the async storage.
+
+        Args:
+            async_storage (AsyncDBStorage): The async storage of the running event loop.
+
+        Returns:
+            list: The conditions on the attendance records.
+        """
+        if self.class_id and not await async_storage.get_by_id(Class, self.class_id):
+            raise ValueError(f"Class with id {self.class_id} was not found.")
+        return self._record_filters(**kwargs)
+
+    def _record_filters(self, **kwargs):
+        """
+        Builds the filter conditions on the columns of the attendance records.
+
+        Returns:
+            list: The conditions on the attendance records.
+        """
+        filters = []
+        if self.class_id:
+            filters.append(Attendance.class_id == self.class_id)
+
+        if self.academic_year:
+            filters.append(Attendance.academic_year == self.academic_year)
+
+        if self.term:
+            filters.append(Attendance.term == self.term)
+
+        if kwargs and "id" in kwargs:
+            filters.append(Attendance.id == kwargs["id"])
+
+        return filters
+
+    @staticmethod
+    def _attendance_order(**kwargs):
+        """
+        Builds the ordering of the attendance records.
+
+        Returns:
+            list: The ordering clauses.
+        """
+        if kwargs and "sort" in kwargs:
+            if kwargs["sort"] == "asc":
+                return [asc(Attendance.date)]
+            return [desc(Attendance.date)]
+        return []
+
+    def _get_attendance_query(self, **kwargs):
+        """
+        Builds a SQLAlchemy query based on the provided filters.
+
+        Returns:
+            SQLAlchemy query object: The query for retrieving attendance records.
+        """
+        return (storage.query(Attendance)
+                .filter(*self._attendance_filters(**kwargs))
+                .order_by(*self._attendance_order(**kwargs)))
+
     def get_attendance(self, **kwargs):
         """
         Get attendance records based on the provided filters.
@@ -43,35 +118,67 @@ class AttendanceManagement:
             tuple: A tuple containing a list of attendance records and a message.
         """
         try:
-            query = storage.query(Attendance)
-            if self.class_id:
-                class_ = storage.get(Class, self.class_id)
-                if class_:
-                    query = query.filter(Attendance.class_id == class_.id,
-                                         Class.academic_year == self.academic_year)
-                else:
-                    raise ValueError(f"Class with id {self.class_id} was not found.")
-
-            if self.academic_year:
-                query = query.filter(Attendance.academic_year == self.academic_year)
-
-            if self.term:
-                query = query.filter(Attendance.term == self.term)
-
-            if kwargs and "id" in kwargs:
-                query = query.filter(Attendance.id == kwargs["id"])
-
-            if kwargs and "sort" in kwargs:
-                if kwargs["sort"] == "asc":
-                    query = query.order_by(asc(Attendance.date))
-                else:
-                    query = query.order_by(desc(Attendance.date))
-
-            attendances = query.all()
+            attendances = self._get_attendance_query(**kwargs).all()
+            return attendances, "Attendance records fetched successfully."
+        except Exception as e:
+            return [], f"Failed to fetch attendance records: {str(e)}"
+
+    async def get_attendance_async(self, async_storage, **kwargs):
+        """
+        Get attendance records based on the provided filters, without
+        blocking the event loop.
+
+        Args:
+            async_storage (AsyncDBStorage): The async storage of the running event loop.
+
+        Returns:
+            tuple: A tuple containing a list of attendance records and a message.
+        """
+        try:
+            attendances = await async_storage.select(Attendance,
+                                                     filters=await self._attendance_filters_async(async_storage, **kwargs),
+                                                     order_by=self._attendance_order(**kwargs))
             return attendances, "Attendance records fetched successfully."
         except Exception as e:
             return [], f"Failed to fetch attendance records: {str(e)}"
 
+    def stream_attendance(self, batch_size=1000, fields=None, **kwargs):
+        """
+        Get attendance records based on the provided filters as read-only rows,
+        fetched lazily in batches.
+
+        Args:
+            batch_size (int): The number of records fetched per round trip (default is 1000).
+            fields (iterable, optional): The only columns to read.
+
+        Returns:
+            tuple: A tuple containing an iterable of attendance rows and a message.
+        """
+        attendances = storage.rows(Attendance, columns=column_keys(Attendance, fields),
+                                   filters=self._attendance_filters(**kwargs),
+                                   order_by=self._attendance_order(**kwargs),
+                                   batch_size=batch_size)
+        return attendances, "Attendance records fetched successfully."
+
+    def get_attendance_paginated(self, cursor=None, page_size=10, **kwargs):
+        """
+        Get one page of attendance records based on the provided filters.
+
+        Args:
+            cursor (str, optional): The cursor returned with the previous page.
+            page_size (int): The number of records per page (default is 10).
+
+        Returns:
+            tuple: A tuple containing a list of attendance records, the cursor of the next page
+            (None on the last page) and a message.
+        """
+        try:
+            attendances, next_cursor = paginate(self._get_attendance_query(**kwargs), Attendance,
+                                                cursor=cursor, page_size=page_size)
+            return attendances, next_cursor, "Attendance records fetched successfully."
+        except Exception as e:
+            return None, None, f"Failed to fetch attendance records: {str(e)}"
+
     def get_attendance_by_class_id(self, class_id):
         """
         Get attendance records for a specific class.
@@ -88,6 +195,58 @@ class AttendanceManagement:
         except Exception as e:
             return [], f"Failed to fetch attendance records: {str(e)}"
 
+    def get_attendance_by_class_id_paginated(self, class_id, cursor=None, page_size=10):
+        """
+        Get one page of the attendance records of a class.
+
+        Args:
+            class_id (str): The ID of the class.
+            cursor (str, optional): The cursor returned with the previous page.
+            page_size (int): The number of records per page (default is 10).
+
+        Returns:
+            tuple: A tuple containing a list of attendance records, the cursor of the next page
+            (None on the last page) and a message.
+        """
+        try:
+            attendances, next_cursor = paginate(storage.query(Attendance).filter(Attendance.class_id == class_id),
+                                                Attendance, cursor=cursor, page_size=page_size)
+            return attendances, next_cursor, "Attendance records fetched successfully."
+        except Exception as e:
+            return None, None, f"Failed to fetch attendance records: {str(e)}"
+
+    async def get_attendance_by_class_id_async(self, async_storage, class_id):
+        """
+        Get attendance records for a specific class, without blocking the event loop.
+
+        Args:
+            async_storage (AsyncDBStorage): The async storage of the running event loop.
+            class_id (str): The ID of the class.
+
+        Returns:
+            tuple: A tuple containing a list of attendance records and a message.
+        """
+        try:
+            attendances = await async_storage.select(Attendance, filters=[Attendance.class_id == class_id])
+            return attendances, "Attendance records fetched successfully."
+        except Exception as e:
+            return [], f"Failed to fetch attendance records: {str(e)}"
+
+    def get_attendance_rows_by_class_id(self, class_id, fields=None):
+        """
+        Get attendance records for a specific class as read-only rows.
+
+        Args:
+            class_id (str): The ID of the class.
+            fields (iterable, optional): The only columns to read.
+
+        Returns:
+            tuple: A tuple containing a list of attendance rows and a message.
+        """
+        attendances = storage.rows(Attendance, columns=column_keys(Attendance, fields),
+                                   filters=[Attendance.class_id == class_id])
+        return attendances, "Attendance records fetched successfully."
+
     def get_attendance_by_term(self, term):
         """
         Get attendance records for a specific term.
@@ -120,6 +279,43 @@ class AttendanceManagement:
         except Exception as e:
             return [], f"Failed to fetch attendance records: {str(e)}"
 
+    def get_student_attendance_paginated(self, student_id, cursor=None, page_size=10):
+        """
+        Get one page of the attendance records of a student.
+
+        Args:
+            student_id (str): The ID of the student.
+            cursor (str, optional): The cursor returned with the previous page.
+            page_size (int): The number of records per page (default is 10).
+
+        Returns:
+            tuple: A tuple containing a list of attendance records, the cursor of the next page
+            (None on the last page) and a message.
+        """
+        try:
+            attendances, next_cursor = paginate(storage.query(Attendance).filter(Attendance.student_id == student_id),
+                                                Attendance, cursor=cursor, page_size=page_size)
+            return attendances, next_cursor, "Attendance records fetched successfully."
+        except Exception as e:
+            return None, None, f"Failed to fetch attendance records: {str(e)}"
+
+    async def get_student_attendance_async(self, async_storage, student_id):
+        """
+        Get attendance records for a specific student, without blocking the event loop.
+
+        Args:
+            async_storage (AsyncDBStorage): The async storage of the running event loop.
+            student_id (str): The ID of the student.
+
+        Returns:
+            tuple: A tuple containing a list of attendance records and a message.
+        """
+        try:
+            attendances = await async_storage.select(Attendance, filters=[Attendance.student_id == student_id])
+            return attendances, "Attendance records fetched successfully."
+        except Exception as e:
+            return [], f"Failed to fetch attendance records: {str(e)}"
+
     def create_attendance(self, student_id, status, **kwargs):
         """
         Create a new attendance record.
@@ -148,6 +344,8 @@ class AttendanceManagement:
         """
         Mark attendance for multiple students.
 
+        The records are inserted as a single batch in one transaction.
+
         Args:
             attendances (list): List of attendance records to mark.
 
@@ -155,8 +353,7 @@ class AttendanceManagement:
             tuple: A tuple containing a boolean indicating success and a message.
         """
         try:
-            for attendance in attendances:
-                storage.new(attendance)
+            storage.bulk_save(attendances)
             return True, "Attendance marked successfully"
         except Exception as e:
             return False, f"Failed to mark attendance: {str(e)}"
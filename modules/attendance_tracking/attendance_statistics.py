@@ -0,0 +1,153 @@
+#!/usr/bin/python3
+"""
+Attendance statistics module.
+
+This module computes attendance counts and rates with SQL aggregates
+instead of loading attendance records.
+"""
+from datetime import timedelta
+
+from sqlalchemy import func, case
+
+from models import storage, Attendance
+from models.class_student_association import StudentClassAssociation
+
+
+class AttendanceStatistics:
+    """
+    Attendance statistics module.
+
+    Computes present/absent counts and attendance rates per class, per term
+    and per student with GROUP BY queries.
+
+    Attributes:
+        academic_year (str): Only count records of this academic year.
+        term (str): Only count records of this term.
+        start_date (date): Only count records taken on or after this date.
+        end_date (date): Only count records taken on or before this date.
+    """
+
+    def __init__(self, academic_year=None, term=None, start_date=None, end_date=None):
+        """
+        Initialize the AttendanceStatistics instance.
+
+        Args:
+            academic_year (str): Only count records of this academic year.
+            term (str): Only count records of this term.
+            start_date (date): Only count records taken on or after this date.
+            end_date (date): Only count records taken on or before this date.
+        """
+        if start_date and end_date and start_date > end_date:
+            raise ValueError("start_date cannot be after end_date")
+
+        self.academic_year = academic_year
+        self.term = term
+        self.start_date = start_date
+        self.end_date = end_date
+
+    def _query(self, *group_by):
+        """
+        Builds the aggregate query, grouped by the given columns.
+
+        Returns:
+            SQLAlchemy query object: The query selecting the group columns
+            followed by the present, absent and total counts.
+        """
+        present = func.coalesce(func.sum(case((Attendance.status == 1, 1), else_=0)), 0)
+        absent = func.coalesce(func.sum(case((Attendance.status == 0, 1), else_=0)), 0)
+        query = storage.query(*group_by, present.label("present"), absent.label("absent"),
+                              func.count(Attendance.id).label("total"))
+
+        if self.academic_year:
+            query = query.filter(Attendance.academic_year == self.academic_year)
+        if self.term:
+            query = query.filter(Attendance.term == self.term)
+        if self.start_date:
+            query = query.filter(Attendance.date >= self.start_date)
+        if self.end_date:
+            query = query.filter(Attendance.date < self.end_date + timedelta(days=1))
+
+        if group_by:
+            query = query.group_by(*group_by).order_by(*group_by)
+
+        return query
+
+    @staticmethod
+    def _stats(present, absent, total):
+        """
+        Build the statistics of one group.
+
+        Returns:
+            dict: The counts and the attendance rate in percent.
+        """
+        present = int(present or 0)
+        absent = int(absent or 0)
+        return {
+            "present": present,
+            "absent": absent,
+            "total": int(total or 0),
+            "attendance_rate": round(present / (present + absent) * 100, 2) if present + absent else 0,
+        }
+
+    def class_stats(self, class_id):
+        """
+        Get the attendance statistics of a class.
+
+        Args:
+            class_id (str): The ID of the class.
+
+        Returns:
+            tuple: A tuple containing the statistics and a message.
+        """
+        present, absent, total = self._query().filter(Attendance.class_id == class_id).one()
+        num_roll = (storage.query(func.count(StudentClassAssociation.student_id))
+                    .filter(StudentClassAssociation.class_id == class_id).scalar())
+
+        stats = self._stats(present, absent, total)
+        stats["num_roll"] = num_roll or 0
+        return stats, "Attendance statistics computed successfully."
+
+    def term_stats(self, class_id=None):
+        """
+        Get the attendance statistics per academic year and term.
+
+        Args:
+            class_id (str, optional): Only count records of this class.
+
+        Returns:
+            tuple: A tuple containing a list of statistics and a message.
+        """
+        query = self._query(Attendance.academic_year, Attendance.term)
+        if class_id:
+            query = query.filter(Attendance.class_id == class_id)
+
+        stats = []
+        for academic_year, term, present, absent, total in query:
+            row = self._stats(present, absent, total)
+            row.update({"academic_year": academic_year, "term": term})
+            stats.append(row)
+        return stats, "Attendance statistics computed successfully."
+
+    def student_stats(self, student_id=None, class_id=None):
+        """
+        Get the attendance statistics per student.
+
+        Args:
+            student_id (str, optional): Only count records of this student.
+            class_id (str, optional): Only count records of this class.
+
+        Returns:
+            tuple: A tuple containing a list of statistics and a message.
+        """
+        query = self._query(Attendance.student_id)
+        if student_id:
+            query = query.filter(Attendance.student_id == student_id)
+        if class_id:
+            query = query.filter(Attendance.class_id == class_id)
+
+        stats = []
+        for student_id_, present, absent, total in query:
+            row = self._stats(present, absent, total)
+            row["student_id"] = student_id_
+            stats.append(row)
+        return stats, "Attendance statistics computed successfully."
@@ -8,8 +8,9 @@ including marking attendance, retrieving class information, enrolling and
 unenrolling students, and more.
 """
 
-from models import Class, storage, Student, ClassCourseAssociation, Course, Staff, User
+from models import Class, storage, Student, ClassCourseAssociation, Course, Staff, User, Attendance, Grade
 from models.class_student_association import StudentClassAssociation
+from models.engine.pagination import paginate
 from modules.attendance_tracking.attendance_management import AttendanceManagement
 
 
@@ -294,13 +295,17 @@ class ClassManagement:
         except Exception as e:
             return False, f"Error creating class: {str(e)}"
 
-    def get_classes(self):
+    def get_classes(self, profile=None):
         """
         Returns a list of all classes.
+
+        Args:
+            profile (str, optional): The loader profile used to eager-load
+                relationships, e.g. "class_overview".
         """
 
         try:
-            query = storage.query(Class).order_by(Class.class_name)
+            query = storage.query(Class, profile=profile).order_by(Class.class_name)
         except Exception as e:
             return None, f"Error getting classes: {str(e)}"
 
@@ -318,12 +323,13 @@ class ClassManagement:
             tuple: A tuple containing the ID of the updated class and a message indicating success or failure.
         """
         try:
-            class_ = storage.get_by_id(Class, class_id)
-            if not class_:
-                raise ValueError("Class does not exist")
-            for key, value in class_info.items():
-                setattr(class_, key, value)
-            storage.save(class_)
+            with storage.transaction():
+                class_ = storage.get_by_id(Class, class_id)
+                if not class_:
+                    raise ValueError("Class does not exist")
+                for key, value in class_info.items():
+                    setattr(class_, key, value)
+                storage.save(class_)
             return class_id, "Class updated successfully"
         except Exception as e:
             return None, f"Failed to update class: {str(e)}"
@@ -332,6 +338,10 @@ class ClassManagement:
         """
         Delete an existing class.
 
+        Associated attendance, gradebook, enrollment and course rows are
+        removed with one DELETE statement per table, so the cost does not
+        grow with the history of the class.
+
         Args:
             class_id (int): The ID of the class to delete.
         """
@@ -339,11 +349,15 @@ class ClassManagement:
             class_ = storage.get_by_id(Class, class_id)
             if class_:
                 # Delete associated records like attendance, gradebooks, etc.
-                for attendance_record in class_.attendances:
-                    storage.delete(attendance_record)
-                for gradebook in class_.gradebooks:
-                    storage.delete(gradebook)
-                storage.delete(class_)
+                # in a single transaction
+                with storage.transaction():
+                    storage.delete_by_filter(Attendance, Attendance.class_id == class_id)
+                    storage.delete_by_filter(Grade, Grade.class_id == class_id)
+                    storage.delete_by_filter(StudentClassAssociation,
+                                             StudentClassAssociation.class_id == class_id)
+                    storage.delete_by_filter(ClassCourseAssociation,
+                                             ClassCourseAssociation.class_id == class_id)
+                    storage.delete_by_id(Class, class_id)
         except Exception as e:
             return f"Failed to delete class: {str(e)}"
 
@@ -398,50 +412,85 @@ class ClassManagement:
             dict: A dictionary containing comprehensive details of the class.
         """
         try:
-            class_ = storage.get_by_id(Class, class_id)
+            class_ = storage.get_by_id(Class, class_id, profile="class_details")
             if not class_:
                 raise ValueError("Class does not exist")
 
-            # Serialize the class object to extract details
-            # Include information about enrolled students, associated courses, attendance records, gradebooks, etc.
-            class_details = class_.serialize()
-
-            class_details["grades"] = [grade.serialize() for grade in class_.gradebooks]
-            class_details["attendances"] = [attendance.serialize() for attendance in class_.attendances]
-            class_details["students"] = [student.serialize() for student in class_.students]
             teacher = storage.get_by_id(User, class_.head_class_teacher,)
-            class_details['class_teacher'] = teacher.first_name + " " + teacher.last_name
+            assist = None
             if class_.assist_class_teacher:
                 assist = storage.get_by_id(User, class_.assist_class_teacher)
-                class_details['assist_class_teacher'] = assist.first_name + " " + assist.last_name
 
-
-            return class_details, "Class details retrieved successfully."
+            return self._class_details(class_, teacher, assist), "Class details retrieved successfully."
         except Exception as e:
             return None, f"Failed to retrieve class details: {str(e)}"
 
-    def get_classes_paginated(self, page=1, page_size=10):
+    async def get_class_details_async(self, async_storage, class_id):
         """
-        Get a list of classes with pagination.
+        Get comprehensive details about a class, without blocking the event loop.
 
         Args:
-            page (int): The page number to retrieve (default is 1).
-            page_size (int): The number of classes per page (default is 10).
+            async_storage (AsyncDBStorage): The async storage of the running event loop.
+            class_id (str): The ID of the class.
 
         Returns:
-            tuple: A tuple containing a list of classes, total number of classes, and a message indicating success or failure.
+            dict: A dictionary containing comprehensive details of the class.
         """
         try:
-            classes_query = storage.query(Class)
-            total_classes = classes_query.count()
+            class_ = await async_storage.get_by_id(Class, class_id, profile="class_details")
+            if not class_:
+                raise ValueError("Class does not exist")
 
-            # Calculate offset and limit based on pagination parameters
-            offset = (page - 1) * page_size
-            limit = page_size
+            teacher = await async_storage.get_by_id(User, class_.head_class_teacher)
+            assist = None
+            if class_.assist_class_teacher:
+                assist = await async_storage.get_by_id(User, class_.assist_class_teacher)
 
-            # Retrieve classes for the current page
-            classes = classes_query.offset(offset).limit(limit).all()
+            return self._class_details(class_, teacher, assist), "Class details retrieved successfully."
+        except Exception as e:
+            return None, f"Failed to retrieve class details: {str(e)}"
 
-            return classes, total_classes, "Classes retrieved successfully"
+    @staticmethod
+    def _class_details(class_, teacher, assist=None):
+        """
+        Serialize a class loaded with the "class_details" profile.
+
+        Args:
+            class_ (Class): The class.
+            teacher (User): The head class teacher.
+            assist (User, optional): The assistant class teacher.
+
+        Returns:
+            dict: A dictionary containing comprehensive details of the class.
+        """
+        # Serialize the class object to extract details
+        # Include information about enrolled students, associated courses, attendance records, gradebooks, etc.
+        class_details = class_.serialize()
+
+        class_details["grades"] = [grade.serialize() for grade in class_.gradebooks]
+        class_details["attendances"] = [attendance.serialize() for attendance in class_.attendances]
+        class_details["students"] = [student.serialize() for student in class_.students]
+        class_details['class_teacher'] = teacher.first_name + " " + teacher.last_name
+        if assist is not None:
+            class_details['assist_class_teacher'] = assist.first_name + " " + assist.last_name
+        return class_details
+
+    def get_classes_paginated(self, cursor=None, page_size=10, profile=None):
+        """
+        Get a list of classes with keyset pagination on (created_at, id).
+
+        Args:
+            cursor (str, optional): The cursor returned with the previous page.
+            page_size (int): The number of classes per page (default is 10).
+            profile (str, optional): The loader profile used to eager-load relationships.
+
+        Returns:
+            tuple: A tuple containing a list of classes, the cursor of the next page (None on the
+            last page), and a message indicating success or failure.
+        """
+        try:
+            classes, next_cursor = paginate(storage.query(Class, profile=profile), Class,
+                                            cursor=cursor, page_size=page_size)
+            return classes, next_cursor, "Classes retrieved successfully"
         except Exception as e:
-            return None, 0, f"Failed to retrieve classes: {str(e)}"
+            return None, None, f"Failed to retrieve classes: {str(e)}"
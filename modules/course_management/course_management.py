@@ -3,6 +3,7 @@
 Course Management Module
 """
 from models import storage, Course, ClassCourseAssociation, Class, User, Staff
+from models.engine.pagination import paginate
 
 
 class CourseManagement:
@@ -25,16 +26,20 @@ class CourseManagement:
         self.course_id = course_id
         self.class_id = class_id
 
-    def get_courses(self):
+    def get_courses(self, profile=None):
         """
         Get all courses offered in the school system.
 
+        Args:
+            profile (str, optional): The loader profile used to eager-load
+                relationships, e.g. "course_overview".
+
         Returns:
             tuple: A tuple containing the courses offered in the school system and a status message.
         """
 
         try:
-            courses = storage.query(Course)
+            courses = storage.query(Course, profile=profile)
         except Exception as e:
             return None, f"Failed to retrieve courses: {str(e)}"
 
@@ -60,10 +65,11 @@ class CourseManagement:
                 raise KeyError("Course description cannot be empty")
 
             course = Course(**course_dict)
-            storage.save(course)
+            with storage.transaction():
+                storage.save(course)
 
-            if "class_id" in course_dict:
-                self.associate_course_with_class(course.id, course_dict["class_id"])
+                if "class_id" in course_dict:
+                    self.associate_course_with_class(course.id, course_dict["class_id"])
 
             return course, "Course created successfully"
         except Exception as e:
@@ -113,6 +119,51 @@ class CourseManagement:
         except Exception as e:
             return None, f"Failed to retrieve courses: {str(e)}"
 
+    def get_courses_by_teacher_paginated(self, teacher_id, cursor=None, page_size=10):
+        """
+        Get one page of the courses of a teacher.
+
+        Args:
+            teacher_id (str): The ID of the teacher.
+            cursor (str, optional): The cursor returned with the previous page.
+            page_size (int): The number of courses per page (default is 10).
+
+        Returns:
+            tuple: A tuple containing a list of courses, the cursor of the next page (None on the
+            last page), and a message indicating success or failure.
+        """
+        if storage.get_by_id(Staff, teacher_id) is None:
+            raise ValueError("Teacher does not exist")
+        try:
+            courses, next_cursor = paginate(storage.query(Course).filter(Course.teacher_id == teacher_id), Course,
+                                            cursor=cursor, page_size=page_size)
+            return courses, next_cursor, "Courses retrieved successfully"
+        except Exception as e:
+            return None, None, f"Failed to retrieve courses: {str(e)}"
+
+    def get_courses_by_class_paginated(self, class_id, cursor=None, page_size=10):
+        """
+        Get one page of the courses of a class.
+
+        Args:
+            class_id (str): The ID of the class.
+            cursor (str, optional): The cursor returned with the previous page.
+            page_size (int): The number of courses per page (default is 10).
+
+        Returns:
+            tuple: A tuple containing a list of courses, the cursor of the next page (None on the
+            last page), and a message indicating success or failure.
+        """
+        if storage.get_by_id(Class, class_id) is None:
+            raise ValueError("Class does not exist")
+        try:
+            rows = storage.rows(ClassCourseAssociation, ["course_id"], [ClassCourseAssociation.class_id == class_id])
+            query = storage.query(Course).filter(Course.id.in_([row.course_id for row in rows]))
+            courses, next_cursor = paginate(query, Course, cursor=cursor, page_size=page_size)
+            return courses, next_cursor, "Courses retrieved successfully"
+        except Exception as e:
+            return None, None, f"Failed to retrieve courses: {str(e)}"
+
     def associate_course_with_class(self, course_id, class_id):
         """
         Associate a course with a class.
@@ -165,12 +216,13 @@ class CourseManagement:
             tuple: A tuple containing the ID of the updated course and a message indicating success or failure.
         """
         try:
-            course = storage.get_by_id(Course, course_id)
-            if not course:
-                raise ValueError("Course does not exist")
-            for key, value in course_dict.items():
-                setattr(course, key, value)
-            storage.save(course)
+            with storage.transaction():
+                course = storage.get_by_id(Course, course_id)
+                if not course:
+                    raise ValueError("Course does not exist")
+                for key, value in course_dict.items():
+                    setattr(course, key, value)
+                storage.save(course)
             return course_id, "Course updated successfully"
         except Exception as e:
             return None, f"Failed to update course: {str(e)}"
@@ -217,31 +269,25 @@ class CourseManagement:
         except Exception as e:
             return None, f"Failed to retrieve grades: {str(e)}"
 
-    def get_courses_paginated(self, page=1, page_size=10):
+    def get_courses_paginated(self, cursor=None, page_size=10, profile=None):
         """
-        Get a list of courses with pagination.
+        Get a list of courses with keyset pagination on (created_at, id).
 
         Args:
-            page (int): The page number to retrieve (default is 1).
+            cursor (str, optional): The cursor returned with the previous page.
             page_size (int): The number of courses per page (default is 10).
+            profile (str, optional): The loader profile used to eager-load relationships.
 
         Returns:
-            tuple: A tuple containing a list of courses, total number of courses, and a message indicating success or failure.
+            tuple: A tuple containing a list of courses, the cursor of the next page (None on the
+            last page), and a message indicating success or failure.
         """
         try:
-            courses_query = storage.query(Course)
-            total_courses = courses_query.count()
-
-            # Calculate offset and limit based on pagination parameters
-            offset = (page - 1) * page_size
-            limit = page_size
-
-            # Retrieve courses for the current page
-            courses = courses_query.offset(offset).limit(limit).all()
-
-            return courses, total_courses, "Courses retrieved successfully"
+            courses, next_cursor = paginate(storage.query(Course, profile=profile), Course,
+                                            cursor=cursor, page_size=page_size)
+            return courses, next_cursor, "Courses retrieved successfully"
         except Exception as e:
-            return None, 0, f"Failed to retrieve courses: {str(e)}"
+            return None, None, f"Failed to retrieve courses: {str(e)}"
 
     def get_course_details(self, course_id):
         """
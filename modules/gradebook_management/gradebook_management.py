@@ -6,6 +6,8 @@ This module provides functionality for managing gradebooks in the school system.
 """
 
 from models import Grade, storage
+from models.engine.pagination import paginate
+from models.serializer import column_keys
 
 
 class GradebookManagement:
@@ -24,27 +26,36 @@ class GradebookManagement:
         self.academic_year = academic_year
         self.term = term
 
-    def _get_gradebook_query(self):
+    def _gradebook_filters(self):
         """
-        Builds a SQLAlchemy query based on student_id or class_id.
+        Builds the filter conditions based on student_id or class_id.
 
         Returns:
-            SQLAlchemy query object: The query for retrieving gradebooks.
+            list: The conditions on the gradebooks.
         """
-        query = storage.query(Grade)
+        filters = []
         if self.student_id:
-            query = query.filter(Grade.student_id == self.student_id)
+            filters.append(Grade.student_id == self.student_id)
 
         if self.class_id:
-            query = query.filter(Grade.class_id == self.class_id)
+            filters.append(Grade.class_id == self.class_id)
 
         if self.academic_year:
-            query = query.filter(Grade.academic_year == self.academic_year)
+            filters.append(Grade.academic_year == self.academic_year)
 
         if self.term:
-            query = query.filter(Grade.term == self.term)
+            filters.append(Grade.term == self.term)
+
+        return filters
 
-        return query
+    def _get_gradebook_query(self):
+        """
+        Builds a SQLAlchemy query based on student_id or class_id.
+
+        Returns:
+            SQLAlchemy query object: The query for retrieving gradebooks.
+        """
+        return storage.query(Grade).filter(*self._gradebook_filters())
 
     def _execute_query(self, query):
         """
@@ -77,6 +88,59 @@ class GradebookManagement:
         query = self._get_gradebook_query()
         return self._execute_query(query)
 
+    async def get_gradebooks_async(self, async_storage):
+        """
+        Retrieves gradebooks based on student_id or class_id, without
+        blocking the event loop.
+
+        Args:
+            async_storage (AsyncDBStorage): The async storage of the running event loop.
+
+        Returns:
+            tuple: A tuple containing the retrieved gradebooks or error message,
+                   and a success/failure status.
+        """
+        try:
+            gradebooks = await async_storage.select(Grade, filters=self._gradebook_filters())
+            return gradebooks, "Retrieved gradebook successfully."
+        except Exception as e:
+            return None, f"Failed to retrieve gradebook: {e}"
+
+    def stream_gradebooks(self, batch_size=1000, fields=None):
+        """
+        Retrieves gradebooks based on student_id or class_id as read-only rows,
+        fetched lazily in batches.
+
+        Args:
+            batch_size (int): The number of gradebooks fetched per round trip (default is 1000).
+            fields (iterable, optional): The only columns to read.
+
+        Returns:
+            tuple: A tuple containing an iterable of the gradebook rows and a message.
+        """
+        gradebooks = storage.rows(Grade, columns=column_keys(Grade, fields),
+                                  filters=self._gradebook_filters(), batch_size=batch_size)
+        return gradebooks, "Retrieved gradebook successfully."
+
+    def get_gradebooks_paginated(self, cursor=None, page_size=10):
+        """
+        Retrieves one page of gradebooks based on student_id or class_id.
+
+        Args:
+            cursor (str, optional): The cursor returned with the previous page.
+            page_size (int): The number of gradebooks per page (default is 10).
+
+        Returns:
+            tuple: A tuple containing the retrieved gradebooks, the cursor of
+                   the next page (None on the last page) and a message.
+        """
+        try:
+            gradebooks, next_cursor = paginate(self._get_gradebook_query(), Grade,
+                                               cursor=cursor, page_size=page_size)
+            return gradebooks, next_cursor, "Retrieved gradebook successfully."
+        except Exception as e:
+            return None, None, f"Failed to retrieve gradebook: {e}"
+
     def get_gradebook_by_id(self, grade_id):
         """
         Retrieve a gradebook by its ID.
@@ -90,6 +154,24 @@ class GradebookManagement:
         """
         return self._execute_query(storage.query(Grade).get(grade_id))
 
+    async def get_gradebook_by_id_async(self, async_storage, grade_id):
+        """
+        Retrieve a gradebook by its ID, without blocking the event loop.
+
+        Args:
+            async_storage (AsyncDBStorage): The async storage of the running event loop.
+            grade_id (str): The ID of the gradebook to retrieve.
+
+        Returns:
+            tuple: A tuple containing the retrieved gradebook or error message,
+                   and a success/failure status.
+        """
+        try:
+            gradebook = await async_storage.get_by_id(Grade, grade_id)
+            return gradebook, "Retrieved gradebook successfully."
+        except Exception as e:
+            return None, f"Failed to retrieve gradebook: {e}"
+
     def record_a_grade(self, grade_data):
         """
         Create a new grade in the database.
@@ -128,17 +210,16 @@ class GradebookManagement:
         Returns:
             tuple: A tuple indicating the success status and a message.
         """
-        gradebook = storage.get_by_id(Grade, grade_id)
-        if gradebook:
-            gradebook.update(**kwargs)
-            gradebook.save()
+        try:
+            with storage.transaction():
+                gradebook = storage.get_by_id(Grade, grade_id)
+                if not gradebook:
+                    return False, "Gradebook not found."
+                gradebook.update(**kwargs)
+                storage.save(gradebook)
             return True, "Successfully updated gradebook."
-        else:
-            return False, "Gradebook not found."
-        # try:
-        #
-        # except Exception as e:
-        #     return False, f"Failed to update gradebook: {e}"
+        except Exception as e:
+            return False, f"Failed to update gradebook: {e}"
 
     def delete_grade(self, grade_id):
         """
@@ -2,93 +2,25 @@
 """
 Service v1 app.
 """
-import base64
-import os
 from os import environ
 
 from dotenv import find_dotenv, load_dotenv
 from flasgger import Swagger
 from flask import Flask, jsonify, make_response, request
 from flask_cors import CORS
-from flask_jwt_extended import JWTManager, verify_jwt_in_request
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.ciphers import algorithms, Cipher
-from cryptography.hazmat.primitives.ciphers.modes import GCM
-from apscheduler.schedulers.background import BackgroundScheduler
 
 from models import storage
-from modules.service.v1.microservices import services
+from modules.service.v1.metrics import metrics
+from modules.service.v1.microservices import load_services
+from modules.service.v1.scheduler import create_scheduler
+from modules.service.v1.token_issuer import configure_jwt, signs_locally
+from modules.service.v1.token_verification import configure_revocation, verify_request
 
 ENV_FILE = find_dotenv()
 if ENV_FILE:
     load_dotenv(ENV_FILE)
 
-app = Flask(__name__)
-app.config['JSONIFY_PRETTYPRINT_REGULAR'] = True
-app.config['JWT_SECRET_KEY'] = environ.get('APP_SECRET')
-app.register_blueprint(services)
-CORS(app, resources={r"/services/v1/*": {"origins": "*"}})
-jwt = JWTManager(app)
 
-
-# Function to rotate secret key
-def rotate_secret_key():
-    # Implement logic to generate a new secret key
-    new_secret_key = generate_app_secret()
-    app.config['JWT_SECRET_KEY'] = new_secret_key
-
-
-# Schedule token rotation
-scheduler = BackgroundScheduler()
-scheduler.add_job(rotate_secret_key, 'interval', hours=2)  # Rotate key every 24 hours
-scheduler.start()
-
-
-def generate_app_secret(length=32):
-    """
-  Generates a cryptographically secure app secret of specified length.
-
-  Args:
-      length (int, optional): Length of the secret in bytes. Defaults to 32 (256 bits).
-
-  Returns:
-      str: The generated app secret (base64 encoded).
-  """
-    # Generate random key and initialization vector (IV)
-    key = os.urandom(32)  # 256-bit key
-    iv = os.urandom(12)  # 96-bit IV
-
-    # Create cipher object
-    cipher = Cipher(algorithms.AES(key), GCM(iv), default_backend())
-    encryptor = cipher.encryptor()
-
-    # Hash a random string to create secret data
-    hasher = hashes.Hash(hashes.SHA256(), backend=default_backend())
-    hasher.update(os.urandom(100))  # Generate random data for hashing
-    secret_data = hasher.finalize()
-
-    # Encrypt the secret data
-    ciphertext = encryptor.update(secret_data) + encryptor.finalize()
-
-    # Encode the ciphertext for storage/transmission
-    return base64.b64encode(iv + ciphertext).decode('utf-8')
-
-
-@app.before_request
-def before_request():
-    # prompt user to log in to get an access token
-    if request.endpoint not in ['services.login']:
-        verify_jwt_in_request()
-
-
-@app.teardown_appcontext
-def close_db(exception):
-    """Closes the database again at the end of the request."""
-    storage.close()
-
-
-@app.errorhandler(400)
 def bad_request(error):
     """
     Error handler for 400 Bad Request.
@@ -102,7 +34,6 @@ def bad_request(error):
     return make_response(jsonify({"error": str(error)}), 400)
 
 
-@app.errorhandler(404)
 def not_found(error):
     """
     Error handler for 404 Not Found.
@@ -116,7 +47,6 @@ def not_found(error):
     return make_response(jsonify({"error": str(error)}), 404)
 
 
-@app.errorhandler(500)
 def internal_server_error(error):
     """
     Error handler for 500 Internal Server Error.
@@ -130,16 +60,79 @@ def internal_server_error(error):
     return make_response(jsonify({"error": str(error)}), 500)
 
 
-app.config["SWAGGER"] = {
-    "swagger": "2.0",
-    "title": "Service v1 API",
-    "version": "1.0.0",
-}
+def service_unavailable(error):
+    """
+    Error handler for 503 Service Unavailable.
+
+    Args:
+        error: The error message.
+
+    Returns:
+        JSON: Error message.
+    """
+    return make_response(jsonify({"error": str(error)}), 503)
+
+
+def before_request():
+    # prompt user to log in to get an access token
+    if request.endpoint not in ['services.login', 'metrics']:
+        verify_request()
+
+
+def close_db(exception):
+    """Closes the database again at the end of the request."""
+    storage.close()
+
+
+def create_app(config=None):
+    """
+    Create the service app.
+
+    Creating the app starts no thread and opens no connection of its own,
+    so it can be created once in a preloading server master and forked
+    into the workers. The background jobs run apart, see scheduler.py.
+
+    Args:
+        config (dict, optional): Settings overriding the defaults.
+
+    Returns:
+        Flask: The app.
+    """
+    app = Flask(__name__)
+    app.config['JSONIFY_PRETTYPRINT_REGULAR'] = True
+    app.config['JWT_SECRET_KEY'] = environ.get('APP_SECRET')
+    app.config["SWAGGER"] = {
+        "swagger": "2.0",
+        "title": "Service v1 API",
+        "version": "1.0.0",
+    }
+    if config:
+        app.config.update(config)
+
+    app.register_blueprint(load_services())
+    app.add_url_rule('/metrics', 'metrics', metrics)
+    CORS(app, resources={r"/services/v1/*": {"origins": "*"}})
+    jwt = configure_jwt(app, signing=signs_locally())
+    configure_revocation(jwt)
+
+    app.before_request(before_request)
+    app.teardown_appcontext(close_db)
+    app.register_error_handler(400, bad_request)
+    app.register_error_handler(404, not_found)
+    app.register_error_handler(500, internal_server_error)
+    app.register_error_handler(503, service_unavailable)
+
+    Swagger(app)
+    return app
 
-Swagger(app)
 
 if __name__ == "__main__":
+    # development server, without the reloader that would start a second
+    # scheduler; in production run gunicorn, see gunicorn.conf.py
+    app = create_app()
+    scheduler = create_scheduler()
+    scheduler.start()
     host = environ.get("HOST", "0.0.0.0")
     port = int(environ.get("PORT", 8080))
     debug = environ.get("DEBUG", True)
-    app.run(host=host, port=port, debug=debug, threaded=True)
+    app.run(host=host, port=port, debug=debug, threaded=True, use_reloader=False)
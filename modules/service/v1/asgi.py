@@ -0,0 +1,135 @@
+#!/usr/bin/python3
+"""
+ASGI entry point of the service v1 app.
+
+Usage:
+    uvicorn modules.service.v1.asgi:app
+
+The read-heavy dashboard endpoints listed in ASYNC_ROUTES are served on
+the event loop through the async storage, so a request waiting on the
+database holds no thread and one process serves many concurrent readers.
+Every other request is handed to the Flask app, on a thread pool. The
+async storage belongs to the event loop of the server: it is created
+when the server starts the app and disposed of when it stops (ASGI
+lifespan).
+"""
+import asyncio
+import re
+
+from asgiref.wsgi import WsgiToAsgi
+from flask_jwt_extended.exceptions import JWTExtendedException, NoAuthorizationError, RevokedTokenError
+from jwt import ExpiredSignatureError, InvalidTokenError
+
+from models import create_async_storage, storage
+from modules.class_management.class_management import ClassManagement
+from modules.service.v1.app import create_app
+from modules.service.v1.token_verification import verify_authorization
+
+class_management = ClassManagement()
+
+
+async def get_class(async_storage, class_id):
+    """
+    Retrieves information about a specific class, as the Flask endpoint
+    does.
+
+    Args:
+        async_storage (AsyncDBStorage): The async storage of the app.
+        class_id (str): ID of the class.
+
+    Returns:
+        tuple: The status code and the JSON body.
+    """
+    class_, msg = await class_management.get_class_details_async(async_storage, class_id)
+    if not class_:
+        return 404, {"error": "404 Not Found: Class not found"}
+    return 200, {class_id: class_, "status_msg": msg}
+
+
+# the GET endpoints served on the event loop: path pattern, view
+ASYNC_ROUTES = [
+    (re.compile(r"/services/v1/classes/(?P<class_id>[^/]+)/?"), get_class),
+]
+
+
+class ServiceApp:
+    """
+    The ASGI app of the services: the async endpoints, then the Flask app.
+    """
+
+    def __init__(self, flask_app=None):
+        """
+        Args:
+            flask_app (Flask, optional): The app serving the other requests,
+                and whose settings verify the access tokens.
+        """
+        self.flask_app = flask_app or create_app()
+        self.wsgi_app = WsgiToAsgi(self.flask_app)
+        self.async_storage = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self.lifespan(receive, send)
+        if scope["type"] == "http" and scope["method"] == "GET":
+            for pattern, view in ASYNC_ROUTES:
+                match = pattern.fullmatch(scope["path"])
+                if match:
+                    return await self.respond(scope, send, view, match.groupdict())
+        return await self.wsgi_app(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        """
+        Create the async storage when the server starts, dispose of it when
+        it stops.
+        """
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self.async_storage = create_async_storage()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self.async_storage is not None:
+                    await self.async_storage.dispose()
+                    self.async_storage = None
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def authorize(self, authorization):
+        """
+        Verify the access token of a request, on a thread of the pool: the
+        revocation list is refreshed through the storage now and then.
+        """
+        try:
+            with self.flask_app.app_context():
+                return verify_authorization(authorization)
+        finally:
+            storage.close()
+
+    async def respond(self, scope, send, view, kwargs):
+        """
+        Verify the access token of a request, run its view and send the
+        JSON response.
+        """
+        headers = dict(scope["headers"])
+        authorization = headers.get(b"authorization", b"").decode("latin-1") or None
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self.authorize, authorization)
+        except NoAuthorizationError as e:
+            status, body = 401, {"msg": str(e)}
+        except RevokedTokenError:
+            status, body = 401, {"msg": "Token has been revoked"}
+        except ExpiredSignatureError:
+            status, body = 401, {"msg": "Token has expired"}
+        except (JWTExtendedException, InvalidTokenError) as e:
+            status, body = 422, {"msg": str(e)}
+        else:
+            status, body = await view(self.async_storage, **kwargs)
+
+        response_headers = [(b"content-type", b"application/json")]
+        if b"origin" in headers:
+            response_headers.append((b"access-control-allow-origin", b"*"))
+        await send({"type": "http.response.start", "status": status, "headers": response_headers})
+        await send({"type": "http.response.body", "body": f"{self.flask_app.json.dumps(body)}\n".encode()})
+
+
+app = ServiceApp()
@@ -0,0 +1,218 @@
+#!/usr/bin/python3
+"""
+Response cache for the services blueprint.
+
+Cached responses are keyed by endpoint, query parameters and the current
+generation of every model the endpoint reads. A committed write to a model
+bumps its generation, so the entries built from the old data are never
+looked up again and age out of the backend.
+
+The in-process LRU backend is used by default. It only sees the writes of
+its own process, so gunicorn.conf.py turns the cache off when it runs
+several workers without SMS_CACHE_URL, a redis:// URL sharing the cache,
+and the generations, between workers. Writes are only observed through
+SQLAlchemy sessions, so the cache is off with the file storage engine or
+when SMS_RESPONSE_CACHE=0.
+
+A missed response is built from the primary: a replica lagging behind a
+write would otherwise be cached under the generation of that write.
+"""
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from os import environ
+
+from flask import request, make_response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from models import storage
+
+DEFAULT_TTL = int(environ.get('SMS_CACHE_TTL', 30))
+MAX_ENTRIES = int(environ.get('SMS_CACHE_MAX_ENTRIES', 512))
+
+
+class LRUBackend:
+    """
+    In-process LRU cache whose entries expire after a time to live.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.__entries = OrderedDict()
+        self.__generations = {}
+        self.__lock = threading.Lock()
+
+    def get(self, key):
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < time.monotonic():
+                del self.__entries[key]
+                return None
+            self.__entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self.__lock:
+            self.__entries[key] = (value, time.monotonic() + ttl)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+
+    def generation(self, name):
+        return self.__generations.get(name, 0)
+
+    def bump(self, name):
+        with self.__lock:
+            self.__generations[name] = self.__generations.get(name, 0) + 1
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.__generations.clear()
+
+
+class RedisBackend:
+    """
+    Cache shared by every worker through redis.
+    """
+
+    def __init__(self, url, prefix='sms:cache:'):
+        import pickle
+
+        import redis
+
+        self.__pickle = pickle
+        self.__client = redis.Redis.from_url(url)
+        self.__prefix = prefix
+
+    def get(self, key):
+        value = self.__client.get(self.__prefix + key)
+        return self.__pickle.loads(value) if value is not None else None
+
+    def set(self, key, value, ttl):
+        self.__client.set(self.__prefix + key, self.__pickle.dumps(value), ex=ttl)
+
+    def generation(self, name):
+        return int(self.__client.get(f"{self.__prefix}gen:{name}") or 0)
+
+    def bump(self, name):
+        self.__client.incr(f"{self.__prefix}gen:{name}")
+
+    def clear(self):
+        for key in self.__client.scan_iter(self.__prefix + '*'):
+            self.__client.delete(key)
+
+
+enabled = (environ.get('STORAGE_ENGINE', 'db') != 'file'
+           and environ.get('SMS_RESPONSE_CACHE', '1') != '0')
+backend = RedisBackend(environ['SMS_CACHE_URL']) if environ.get('SMS_CACHE_URL') else LRUBackend()
+
+
+def configure(new_backend=None, enable=True):
+    """
+    Replace the cache backend.
+
+    Args:
+        new_backend (object, optional): An object with the get, set, generation,
+            bump and clear methods of LRUBackend. Defaults to a new LRUBackend.
+        enable (bool): Whether responses are cached.
+    """
+    global backend, enabled
+    backend = new_backend if new_backend is not None else LRUBackend()
+    enabled = enable
+
+
+def invalidate(*models):
+    """
+    Invalidate the cached responses built from some models.
+
+    Args:
+        *models: The model classes or class names that were written.
+    """
+    for model in models:
+        backend.bump(model if isinstance(model, str) else model.__name__)
+
+
+def cached(*models, ttl=DEFAULT_TTL):
+    """
+    Cache the successful responses of a view.
+
+    Args:
+        *models: The model classes the view reads.
+        ttl (int): The time to live of the responses in seconds.
+
+    Returns:
+        callable: The view decorator.
+    """
+    names = tuple(model.__name__ for model in models)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return view(*args, **kwargs)
+
+            generations = ",".join(str(backend.generation(name)) for name in names)
+            params = "&".join(f"{key}={value}" for key, value in sorted(request.args.items(multi=True)))
+            key = f"{request.endpoint}:{sorted(kwargs.items())}:{params}:{generations}"
+
+            hit = backend.get(key)
+            if hit is not None:
+                body, status, mimetype = hit
+                response = make_response(body, status)
+                response.mimetype = mimetype
+                return response
+
+            storage.use_primary()
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                backend.set(key, (response.get_data(), response.status_code, response.mimetype), ttl)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flushed(session, flush_context):
+    """
+    Remember the models written by a flush until the transaction commits.
+    """
+    written = session.info.setdefault("cache_written", set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        written.add(obj.__class__.__name__)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _record_executed(orm_execute_state):
+    """
+    Remember the models written by bulk insert, update and delete statements.
+    """
+    if orm_execute_state.is_select or orm_execute_state.bind_mapper is None:
+        return
+    written = orm_execute_state.session.info.setdefault("cache_written", set())
+    written.add(orm_execute_state.bind_mapper.class_.__name__)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    """
+    Invalidate the responses built from the models written by the transaction.
+    """
+    written = session.info.pop("cache_written", None)
+    if written:
+        invalidate(*written)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back(session):
+    """
+    Forget the writes of a rolled back transaction.
+    """
+    session.info.pop("cache_written", None)
@@ -0,0 +1,149 @@
+#!/usr/bin/python3
+"""
+Conditional GET support for the services blueprint.
+
+The validators of a response are computed from max(updated_at) and the
+row count of the records it is built from, one aggregate query per model
+(updated_at is indexed). With the response cache on, the versions are
+kept in the cache backend under the generations of the models, so they
+are only computed again after a write. When the client already holds the
+current version the view is not run at all and a 304 Not Modified is
+returned.
+"""
+import hashlib
+from datetime import timezone
+from functools import wraps
+
+from flask import request, make_response
+
+from models import storage
+from modules.service.v1 import cache
+
+
+def _validators(versions):
+    """
+    Compute the ETag and the Last-Modified date of some collection versions.
+
+    Args:
+        versions (list): The (latest updated_at, count) of each collection.
+
+    Returns:
+        tuple: The ETag and the Last-Modified date (None without dates).
+    """
+    params = sorted(request.args.items(multi=True))
+    digest = hashlib.sha1(repr((request.path, params, versions)).encode("utf-8")).hexdigest()
+
+    stamps = [latest for latest, _ in versions if latest is not None]
+    last_modified = max(stamps).astimezone(timezone.utc) if stamps else None
+    return digest, last_modified
+
+
+def _versions(models, compute):
+    """
+    Get the collection versions of a request, from the response cache
+    while none of the models it reads has been written.
+
+    Args:
+        models (iterable): The model classes the versions are computed from.
+        compute (callable): Computes the versions.
+
+    Returns:
+        list: The (latest updated_at, count) of each collection.
+    """
+    if not cache.enabled:
+        return compute()
+
+    generations = ",".join(str(cache.backend.generation(model.__name__)) for model in models)
+    key = f"versions:{request.endpoint}:{sorted(request.view_args.items())}:{generations}"
+    versions = cache.backend.get(key)
+    if versions is None:
+        versions = compute()
+        cache.backend.set(key, versions, cache.DEFAULT_TTL)
+    return versions
+
+
+def _respond(view, args, kwargs, versions):
+    """
+    Answer 304 when the client holds the current version, or run the view
+    and attach the validators to its response.
+    """
+    etag, last_modified = _validators(versions)
+
+    if request.if_none_match:
+        not_modified = request.if_none_match.contains_weak(etag)
+    else:
+        not_modified = (last_modified is not None and request.if_modified_since is not None
+                        and last_modified.replace(microsecond=0) <= request.if_modified_since)
+
+    if not_modified:
+        response = make_response("", 304)
+    else:
+        response = make_response(view(*args, **kwargs))
+        if response.status_code != 200:
+            return response
+
+    # the body also holds related data, so the ETag is weak
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    return response
+
+
+def conditional(*models):
+    """
+    Support conditional GETs on a view returning whole collections.
+
+    Args:
+        *models: The model classes the view reads.
+
+    Returns:
+        callable: The view decorator.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            versions = _versions(models, lambda: [storage.version(model) for model in models])
+            return _respond(view, args, kwargs, versions)
+
+        return wrapper
+
+    return decorator
+
+
+def conditional_resource(cls, id_arg, *related, linked=()):
+    """
+    Support conditional GETs on a view returning a single record.
+
+    Args:
+        cls (class): The model class of the record.
+        id_arg (str): The view argument holding the id of the record.
+        *related: Foreign key columns of the related records included in
+            the response, e.g. Grade.class_id.
+        linked (iterable): (model class, function) pairs for the other
+            records included in the response; the function takes the id
+            of the record and returns the condition selecting them, e.g.
+            the teacher of a class.
+
+    Returns:
+        callable: The view decorator.
+    """
+    models = [cls, *(column.class_ for column in related), *(model for model, _ in linked)]
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            id_ = kwargs[id_arg]
+
+            def compute():
+                versions = [storage.version(cls, cls.id == id_)]
+                versions += [storage.version(column.class_, column == id_) for column in related]
+                versions += [storage.version(model, condition(id_)) for model, condition in linked]
+                return versions
+
+            return _respond(view, args, kwargs, _versions(models, compute))
+
+        return wrapper
+
+    return decorator
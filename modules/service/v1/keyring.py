@@ -0,0 +1,252 @@
+#!/usr/bin/python3
+"""
+The keyring of the access token signing keys.
+
+Every token carries the `kid` of the RSA key that signed it. Rotating the
+keyring adds a new key, which signs the tokens from then on, while the
+previous keys keep verifying the tokens they signed until those expire;
+so a rotation never logs anyone out. The keys are stored in the
+signing_keys table, so every worker, and the authentication service, sign
+and verify with the same keys; a worker seeing an unknown kid reloads the
+keyring before rejecting the token. The private keys are encrypted with
+APP_SECRET when it is set.
+
+rotate() only adds a key when the newest one is older than the rotation
+interval, and the kid of the key it adds is derived from the kid of the
+newest one (successor_kid): workers rotating the same keyring at once, or
+creating its first key, all insert the same kid and the unique constraint
+of the column lets a single one through. So it can be scheduled in every
+worker. A key is only deleted once no token it signed can still be valid,
+however many keys were added since. Every worker must share APP_SECRET: a
+worker unable to decrypt the signing key adds a key of its own.
+"""
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from os import environ
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from sqlalchemy.exc import IntegrityError
+
+from models import storage
+from models.signing_key import SigningKey
+
+ROTATION_INTERVAL = timedelta(hours=float(environ.get('SMS_KEY_ROTATION_HOURS', 2)))
+PREVIOUS_KEYS = int(environ.get('SMS_KEYRING_PREVIOUS', 3))
+REFRESH = float(environ.get('SMS_KEYRING_REFRESH', 60))
+# an unknown kid reloads the keyring at most this often
+MIN_REFRESH = 1.0
+# margin for the clock skew between the workers
+LEEWAY = timedelta(minutes=1)
+KEY_SIZE = 2048
+# the namespace of the kids derived by successor_kid()
+KID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, 'sms:signing-keys')
+
+
+def successor_kid(kid):
+    """
+    Get the kid of the key replacing a key.
+
+    Args:
+        kid (str): The kid of the replaced key, None for the first key.
+
+    Returns:
+        str: The kid, the same in every worker.
+    """
+    return uuid.uuid5(KID_NAMESPACE, kid or '').hex
+
+
+def _stored(kid):
+    """
+    Check whether a key is in storage, reading from the primary.
+    """
+    storage.use_primary()
+    return storage.get_by_filter(SigningKey, SigningKey.kid == kid).first() is not None
+
+
+class Keyring:
+    """
+    The signing keys shared through storage.
+    """
+
+    def __init__(self, lifetime, rotation_interval=ROTATION_INTERVAL, previous=PREVIOUS_KEYS,
+                 refresh=REFRESH, passphrase=None):
+        """
+        Args:
+            lifetime (timedelta): The lifetime of the access tokens, for which
+                a previous key stays valid after being replaced.
+            rotation_interval (timedelta): The age at which the signing key is replaced.
+            previous (int): The maximum number of previous keys still accepted.
+            refresh (float): The seconds between two reloads of the keyring.
+            passphrase (str, optional): The passphrase of the private keys.
+        """
+        self.lifetime = lifetime
+        self.rotation_interval = rotation_interval
+        self.previous = previous
+        self.refresh_interval = refresh
+        self.__passphrase = passphrase.encode('utf-8') if passphrase else None
+        self.__public = {}
+        self.__private = {}
+        self.__signing = None
+        self.__records = []
+        self.__refreshed = None
+        self.__lock = threading.RLock()
+
+    def __accepted(self, records, now):
+        """
+        Split the key records, newest first, into the accepted and the retired ones.
+
+        A key is accepted while the tokens it signed before being replaced
+        can be valid, up to `previous` keys; a key younger than the token
+        lifetime is accepted whatever their number.
+        """
+        window = self.lifetime + LEEWAY
+        accepted, retired = records[:1], []
+        for i, record in enumerate(records[1:], start=1):
+            replaced_at = records[i - 1].created_at
+            if (now < replaced_at + window and
+                    (i <= self.previous or now < record.created_at + window)):
+                accepted.append(record)
+            else:
+                retired.append(record)
+        return accepted, retired
+
+    def refresh(self):
+        """
+        Reload the keys from storage.
+        """
+        storage.use_primary()
+        records = sorted(storage.all(SigningKey).values(), key=lambda r: r.created_at, reverse=True)
+        accepted, _ = self.__accepted(records, datetime.now())
+
+        with self.__lock:
+            public = {}
+            for record in accepted:
+                key = self.__public.get(record.kid)
+                if key is None:
+                    key = serialization.load_pem_public_key(record.public_key.encode('utf-8'))
+                public[record.kid] = key
+            self.__public = public
+            self.__private = {kid: key for kid, key in self.__private.items() if kid in public}
+            self.__signing = accepted[0] if accepted else None
+            self.__records = records
+            self.__refreshed = time.monotonic()
+
+    def __refresh_if_stale(self, interval):
+        refreshed = self.__refreshed
+        if refreshed is None or time.monotonic() - refreshed >= interval:
+            self.refresh()
+
+    def rotate(self, force=False):
+        """
+        Add a new signing key when the current one is due, and delete the
+        keys no token can be signed with anymore.
+
+        Args:
+            force (bool): Whether to add a key even if the current one is not due.
+
+        Returns:
+            str: The kid of the new key, or None when no key was added.
+        """
+        with self.__lock:
+            self.refresh()
+            newest = self.__records[0] if self.__records else None
+            if newest is not None and not force and datetime.now() - newest.created_at < self.rotation_interval:
+                return None
+
+            kid = successor_kid(newest.kid if newest else None)
+            added = not _stored(kid) and self.__add(kid, newest)
+            if added:
+                _, retired = self.__accepted(self.__records, datetime.now())
+                for old in retired:
+                    storage.delete(old)
+
+            self.refresh()
+            return kid if added else None
+
+    def __add(self, kid, newest):
+        """
+        Store a new key, unless another worker stored the same kid first.
+
+        Returns:
+            bool: Whether the key was added.
+        """
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=KEY_SIZE)
+        if self.__passphrase:
+            encryption = serialization.BestAvailableEncryption(self.__passphrase)
+        else:
+            encryption = serialization.NoEncryption()
+        record = SigningKey(
+            kid=kid,
+            public_key=private_key.public_key().public_bytes(
+                serialization.Encoding.PEM,
+                serialization.PublicFormat.SubjectPublicKeyInfo).decode('utf-8'),
+            private_key=private_key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8, encryption).decode('utf-8'))
+        if newest is not None and record.created_at <= newest.created_at:
+            # keep the keys ordered whatever the clock skew between the workers
+            record.created_at = record.updated_at = newest.created_at + timedelta(microseconds=1)
+        try:
+            storage.save(record)
+        except IntegrityError:
+            return False
+        self.__private[kid] = private_key
+        self.__records.insert(0, record)
+        return True
+
+    def signing_key(self):
+        """
+        Get the key signing the new tokens, creating the first one if needed.
+
+        Returns:
+            tuple: The kid and the private key.
+        """
+        self.__refresh_if_stale(self.refresh_interval)
+        with self.__lock:
+            if self.__signing is None:
+                self.rotate(force=True)
+            record = self.__signing
+            key = self.__private_key(record)
+            if key is None:
+                # encrypted with another APP_SECRET: sign with a new key,
+                # the old one still verifies the tokens it signed
+                self.rotate(force=True)
+                record = self.__signing
+                key = self.__private_key(record)
+                if key is None:
+                    raise ValueError("The signing key is encrypted with another APP_SECRET")
+            return record.kid, key
+
+    def __private_key(self, record):
+        """
+        Get the private key of a record, None if it cannot be decrypted.
+        """
+        key = self.__private.get(record.kid)
+        if key is None:
+            try:
+                key = serialization.load_pem_private_key(record.private_key.encode('utf-8'),
+                                                         password=self.__passphrase)
+            except (TypeError, ValueError):
+                return None
+            self.__private[record.kid] = key
+        return key
+
+    def public_key(self, kid):
+        """
+        Get the key verifying the tokens signed by a key.
+
+        Args:
+            kid (str): The identifier of the signing key.
+
+        Returns:
+            RSAPublicKey: The public key, or None if the key is unknown or retired.
+        """
+        self.__refresh_if_stale(self.refresh_interval)
+        key = self.__public.get(kid)
+        if key is None:
+            self.__refresh_if_stale(MIN_REFRESH)
+            key = self.__public.get(kid)
+        return key
@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+"""
+The /metrics endpoint, in the Prometheus text format.
+
+It exposes the database connection pools of the worker answering the
+scrape, the primary and each read replica; every series carries the pid
+of the worker, since each worker has its own pools, and the bind of the
+pool. The scraper must send SMS_METRICS_TOKEN as a bearer token; without
+it set the endpoint is off.
+"""
+import hmac
+import os
+from os import environ
+
+from flask import Response, abort, request
+
+from models import storage
+
+METRICS_TOKEN = environ.get('SMS_METRICS_TOKEN')
+
+_GAUGES = (
+    ("size", "Connections the pool keeps open"),
+    ("checked_out", "Connections in use"),
+    ("checked_in", "Idle connections in the pool"),
+    ("overflow", "Connections open beyond the pool size"),
+)
+_COUNTERS = (
+    ("connects", "Connections opened"),
+    ("checkouts", "Connections handed out"),
+    ("checkins", "Connections returned"),
+    ("invalidations", "Connections invalidated"),
+    ("timeouts", "Checkouts that timed out waiting for a connection"),
+)
+
+
+def render_pool_metrics(statuses, pid):
+    """
+    Format the pool metrics in the Prometheus text format.
+
+    Args:
+        statuses (dict): the pool status of each bind, see DBStorage.pool_statuses().
+        pid (int): the process id of the worker.
+
+    Returns:
+        str: the metrics.
+    """
+    labels = {bind: f'pid="{pid}",bind="{bind}"' for bind in statuses}
+    lines = []
+    for key, help_ in _GAUGES:
+        lines += [f"# HELP sms_db_pool_{key} {help_}.",
+                  f"# TYPE sms_db_pool_{key} gauge"]
+        lines += [f"sms_db_pool_{key}{{{labels[bind]}}} {status[key]}" for bind, status in statuses.items()]
+    for key, help_ in _COUNTERS:
+        lines += [f"# HELP sms_db_pool_{key}_total {help_}.",
+                  f"# TYPE sms_db_pool_{key}_total counter"]
+        lines += [f"sms_db_pool_{key}_total{{{labels[bind]}}} {status[key]}" for bind, status in statuses.items()]
+
+    lines += ["# HELP sms_db_pool_wait_seconds Time spent waiting for a connection.",
+              "# TYPE sms_db_pool_wait_seconds histogram"]
+    for bind, status in statuses.items():
+        for bound, count in status["wait_buckets"]:
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'sms_db_pool_wait_seconds_bucket{{{labels[bind]},le="{le}"}} {count}')
+        lines += [f"sms_db_pool_wait_seconds_sum{{{labels[bind]}}} {status['wait_sum']}",
+                  f"sms_db_pool_wait_seconds_count{{{labels[bind]}}} {status['wait_count']}"]
+    return "\n".join(lines) + "\n"
+
+
+def metrics():
+    """
+    Expose the metrics of the worker.
+
+    Returns:
+        Response: The metrics, in the Prometheus text format.
+    """
+    # the endpoint is exempt from the access tokens: without its own token it is off
+    if not METRICS_TOKEN:
+        abort(404, "Set SMS_METRICS_TOKEN to expose the metrics")
+    sent = request.headers.get('Authorization', '')
+    if not hmac.compare_digest(sent, f"Bearer {METRICS_TOKEN}"):
+        abort(401)
+
+    # a worker that has not used the storage yet has no pool to report
+    statuses = storage.pool_statuses() if storage.initialized else {}
+    body = render_pool_metrics(statuses, os.getpid()) if statuses else ""
+    return Response(body, content_type="text/plain; version=0.0.4; charset=utf-8")
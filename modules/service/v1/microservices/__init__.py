@@ -1,13 +1,24 @@
 #!/usr/bin/python3
 """Blueprint for microservices."""
+from importlib import import_module
+
 from flask import Blueprint
 
 services = Blueprint('services', __name__, url_prefix='/services/v1')
 
-import modules.service.v1.microservices.attendace_service
-from modules.service.v1.microservices.index import *
-from modules.service.v1.microservices.attendace_service import *
-from modules.service.v1.microservices.course_service import *
-from modules.service.v1.microservices.class_service import *
-from modules.service.v1.microservices.user_service import *
-from modules.service.v1.microservices.grade_service import *
+# the modules adding their views to the blueprint, imported by load_services()
+SERVICE_MODULES = ("index", "attendace_service", "course_service",
+                   "class_service", "user_service", "grade_service")
+
+
+def load_services():
+    """
+    Import the service modules so their views are added to the blueprint.
+    Call it before registering the blueprint on an app.
+
+    Returns:
+        Blueprint: The services blueprint.
+    """
+    for name in SERVICE_MODULES:
+        import_module(f"{__name__}.{name}")
+    return services
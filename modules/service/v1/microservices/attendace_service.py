@@ -3,12 +3,19 @@
 This module provides functionality for attendance tracking.
 """
 
+from datetime import datetime
+
 from flask import jsonify, request, abort, make_response
 
-from models import Attendance
+from models import Attendance, Class, Student, storage
+from models.serializer import row_serializer
 from modules.attendance_tracking.attendance_management import AttendanceManagement
+from modules.attendance_tracking.attendance_statistics import AttendanceStatistics
 from modules.class_management.class_management import ClassManagement
 from modules.service.v1.microservices import services
+from modules.service.v1.microservices.fields import requested_fields
+from modules.service.v1.microservices.pagination import page_request
+from modules.service.v1.microservices.streaming import wants_ndjson, stream_ndjson, stream_json
 class_management = ClassManagement()
 attendance_management = AttendanceManagement()
 
@@ -18,16 +25,27 @@ def get_all_attendance():
     """
     Retrieves attendance records for all students.
 
+    Query Parameters:
+        limit (int, optional): Paginate the records with pages of this size.
+        cursor (str, optional): The next_cursor of the previous page.
+        fields (str, optional): Comma separated attributes to return for each record.
+
     Returns:
         JSON: Attendance records for all students.
     """
+    page = page_request()
+    fields = requested_fields()
     try:
-        attendances, msg = attendance_management.get_attendance()
-        attendance_list = [attendance.serialize() for attendance in attendances]
-        result = {
-            "status_msg": msg,
-            "attendances": attendance_list
-        }
+        result = {}
+        if page:
+            attendances, result["next_cursor"], msg = attendance_management.get_attendance_paginated(*page)
+            if attendances is None:
+                return make_response(jsonify({"error": msg}), 400)
+        else:
+            attendances, msg = attendance_management.get_attendance()
+
+        result["status_msg"] = msg
+        result["attendances"] = [attendance.serialize(fields) for attendance in attendances]
         return make_response(jsonify(result), 200)
     except Exception as e:
         abort(500)
@@ -70,6 +88,13 @@ def get_attendance_by_term_academic_year(academic_year, term):
         academic_year (str): Academic year.
         term (str): Term.
 
+    Query Parameters:
+        format (str, optional): `ndjson` streams one attendance record per line.
+        fields (str, optional): Comma separated attributes to return for each record.
+
+    The records are streamed as they are fetched, so a whole academic year
+    is exported without holding it in memory.
+
     Returns:
         JSON: Attendance records for the specified academic year and term.
     """
@@ -81,10 +106,15 @@ def get_attendance_by_term_academic_year(academic_year, term):
 
         term = term.replace("_", " ")
         academic_year = academic_year.replace("_", "/")
+        fields = requested_fields()
+        if fields:
+            # the records are keyed by id
+            fields = tuple(sorted(set(fields) | {"id"}))
 
         attendance_management.term = term
         attendance_management.academic_year = academic_year
-        attendances, msg = attendance_management.get_attendance()
+        attendances, msg = attendance_management.stream_attendance(fields=fields)
+        serialize = row_serializer(Attendance, fields)
 
         # for attendance in attendances:
         #     if attendance.classe.class_name in attendance_dict:
@@ -98,15 +128,16 @@ def get_attendance_by_term_academic_year(academic_year, term):
         #         attendance_dict[attendance.classe.class_name] \
         #             [attendance.date.strftime("%A, %d-%m-%y")] = [attendance.serialize()]
 
-        attendance_dict = {attendance.id: attendance.serialize() for attendance in attendances}
+        if wants_ndjson():
+            return stream_ndjson(attendances, serialize)
 
         result = {
             "academic_year": academic_year,
-            "term": term,
-            "attendances": attendance_dict
+            "term": term
         }
 
-        return jsonify(result), 200
+        return stream_json(result, "attendances", attendances, serialize,
+                           keyed_by=lambda attendance: attendance.id)
 
     except ValueError as ve:
         abort(400, str(ve))
@@ -122,14 +153,26 @@ def get_attendance_student(student_id):
     Args:
         student_id (str): ID of the student.
 
+    Query Parameters:
+        limit (int, optional): Paginate the records with pages of this size.
+        cursor (str, optional): The next_cursor of the previous page.
+
     Returns:
         JSON: Attendance records for the specified student.
     """
+    page = page_request()
     try:
         if not student_id:
             abort(400, "Student ID cannot be empty")
 
-        attendances, msg = attendance_management.get_student_attendance(student_id)
+        result = {}
+        if page:
+            attendances, result["next_cursor"], msg = attendance_management.get_student_attendance_paginated(
+                student_id, *page)
+            if attendances is None:
+                return make_response(jsonify({"error": msg}), 400)
+        else:
+            attendances, msg = attendance_management.get_student_attendance(student_id)
         # attendance_dict = defaultdict(lambda: defaultdict(lambda: defaultdict(lambda: defaultdict())))
         # # for attendance in attendances:
         #     class_name = attendance.classe.class_name
@@ -141,10 +184,12 @@ def get_attendance_student(student_id):
         # Convert to normal dict
         attendance_dict = {attendance.id: attendance.serialize() for attendance in attendances}
 
-        result = {
-            "student_name": attendances[0].student.first_name + " " + attendances[0].student.last_name,
+        # a page past the last record has no record to name the student
+        student = attendances[0].student if attendances else storage.get_by_id(Student, student_id)
+        result.update({
+            "student_name": student.first_name + " " + student.last_name if student else None,
             "result": attendance_dict,
-        }
+        })
 
         return jsonify(result), 200
     except ValueError as ve:
@@ -152,37 +197,126 @@ def get_attendance_student(student_id):
     except Exception as e:
         abort(500, f"Internal Server Error: {str(e)}")
 
+def _attendance_statistics():
+    """
+    Builds an AttendanceStatistics engine from the request query parameters
+    academic_year, term, start_date and end_date (YYYY-MM-DD).
+
+    Returns:
+        AttendanceStatistics: The statistics engine.
+    """
+    args = request.args
+    try:
+        start_date = datetime.strptime(args["start_date"], "%Y-%m-%d") if args.get("start_date") else None
+        end_date = datetime.strptime(args["end_date"], "%Y-%m-%d") if args.get("end_date") else None
+    except ValueError:
+        raise ValueError("start_date and end_date must be formatted as YYYY-MM-DD")
+
+    return AttendanceStatistics(academic_year=args.get("academic_year"),
+                                term=args.get("term"),
+                                start_date=start_date,
+                                end_date=end_date)
+
+
 @services.route("/attendance/class/<class_id>/stats", methods=["GET"], strict_slashes=False)
 def get_attendance_class_stats(class_id):
+    """
+    Retrieves attendance statistics for a specific class.
+
+    Query parameters academic_year, term, start_date and end_date
+    (YYYY-MM-DD) restrict the records counted.
+
+    Args:
+        class_id (str): ID of the class.
+
+    Returns:
+        JSON: Roll size, present and absent counts and attendance rate.
+    """
+    if storage.get_by_id(Class, class_id) is None:
+        abort(404, "Class not found")
 
     try:
-        if not class_id:
-            abort(400, "Class ID cannot be empty")
-        class_ = class_management.get_class(class_id)
-        attendances, msg = attendance_management.get_attendance_by_class_id(class_id=class_id)
+        results, msg = _attendance_statistics().class_stats(class_id)
 
-        present = [attendance.status  for attendance in attendances if attendance.status == 1]
-        absent = [attendance.status for attendance in attendances if attendance.status == 0]
+        return jsonify(results), 200
+    except ValueError as ve:
+        abort(400, str(ve))
+    except Exception as e:
+        abort(500, f"Internal Server Error: {str(e)}")
 
-        num_present= len(present)
-        num_absent = len(absent)
-        num_roll =  len(class_.students)
 
-        if num_roll != 0:
-            attendance_rate = int((num_present/(60 * num_roll)) * 100)
-        else:
-            attendance_rate = 0
+@services.route("/attendance/class/<class_id>/stats/terms", methods=["GET"], strict_slashes=False)
+def get_attendance_class_term_stats(class_id):
+    """
+    Retrieves attendance statistics per academic year and term for a class.
 
-        results = {
-            "num_roll": num_roll,
-            "present": num_present,
-            "absent": num_absent,
-            "attendance_rate": attendance_rate
-        }
+    Args:
+        class_id (str): ID of the class.
+
+    Returns:
+        JSON: Statistics for each academic year and term.
+    """
+    if storage.get_by_id(Class, class_id) is None:
+        abort(404, "Class not found")
 
+    try:
+        results, msg = _attendance_statistics().term_stats(class_id=class_id)
+        return jsonify({"class_id": class_id, "terms": results, "status_msg": msg}), 200
+    except ValueError as ve:
+        abort(400, str(ve))
+    except Exception as e:
+        abort(500, f"Internal Server Error: {str(e)}")
+
+
+@services.route("/attendance/class/<class_id>/stats/students", methods=["GET"], strict_slashes=False)
+def get_attendance_class_student_stats(class_id):
+    """
+    Retrieves attendance statistics per student for a class.
+
+    Args:
+        class_id (str): ID of the class.
+
+    Returns:
+        JSON: Statistics for each student of the class.
+    """
+    if storage.get_by_id(Class, class_id) is None:
+        abort(404, "Class not found")
+
+    try:
+        results, msg = _attendance_statistics().student_stats(class_id=class_id)
+        return jsonify({"class_id": class_id, "students": results, "status_msg": msg}), 200
+    except ValueError as ve:
+        abort(400, str(ve))
+    except Exception as e:
+        abort(500, f"Internal Server Error: {str(e)}")
+
+
+@services.route("/attendance/student/<student_id>/stats", methods=["GET"], strict_slashes=False)
+def get_attendance_student_stats(student_id):
+    """
+    Retrieves attendance statistics for a specific student.
+
+    Args:
+        student_id (str): ID of the student.
+
+    Returns:
+        JSON: Present and absent counts and attendance rate of the student.
+    """
+    if storage.get_by_id(Student, student_id) is None:
+        abort(404, "Student not found")
+
+    try:
+        results, msg = _attendance_statistics().student_stats(student_id=student_id)
+        if results:
+            results = results[0]
+        else:
+            results = {"student_id": student_id, "present": 0, "absent": 0,
+                       "total": 0, "attendance_rate": 0}
         return jsonify(results), 200
+    except ValueError as ve:
+        abort(400, str(ve))
     except Exception as e:
-        abort(500, e)
+        abort(500, f"Internal Server Error: {str(e)}")
 
 
 
@@ -194,14 +328,35 @@ def get_attendance_by_class(class_id):
     Args:
         class_id (str): ID of the class.
 
+    Query Parameters:
+        fields (str, optional): Comma separated attributes to return for each record.
+        limit (int, optional): Paginate the records with pages of this size.
+        cursor (str, optional): The next_cursor of the previous page.
+
     Returns:
         JSON: Attendance records for the specified class.
     """
-    try:
-        if not class_id:
-            abort(400, "Class ID cannot be empty")
+    class_ = storage.get_by_id(Class, class_id)
+    if not class_:
+        abort(404, "Class not found")
 
-        attendances, msg = attendance_management.get_attendance_by_class_id(class_id=class_id)
+    page = page_request()
+    try:
+        fields = requested_fields()
+        if fields:
+            # the records are keyed by id
+            fields = tuple(sorted(set(fields) | {"id"}))
+
+        result = {}
+        if page:
+            attendances, result["next_cursor"], msg = attendance_management.get_attendance_by_class_id_paginated(
+                class_id, *page)
+            if attendances is None:
+                return make_response(jsonify({"error": msg}), 400)
+            serialize = lambda attendance: attendance.serialize(fields)
+        else:
+            attendances, msg = attendance_management.get_attendance_rows_by_class_id(class_id, fields=fields)
+            serialize = row_serializer(Attendance, fields)
         # Initialize an empty nested dictionary to store attendance data
         # attendance_dict = defaultdict(lambda: defaultdict(lambda: defaultdict(lambda: defaultdict(list))))
         # for attendance in attendances:
@@ -216,12 +371,12 @@ def get_attendance_by_class(class_id):
         # # Convert defaultdict to regular dictionary
         # attendance_dict = dict(attendance_dict)
 
-        attendance_dict = {attendance.id: attendance.serialize() for attendance in attendances}
-        result = {
+        attendance_dict = {attendance.id: serialize(attendance) for attendance in attendances}
+        result.update({
             "class_id": class_id,
-            "class_name": attendances[0].classe.class_name,
+            "class_name": class_.class_name,
             "attendance": attendance_dict
-        }
+        })
         # for attendance in attendances:
         #     acd_year = attendance.academic_year
         #     term = attendance.term
@@ -1,68 +1,95 @@
 #!/usr/bin/python3
 """
 The authentication service module
+
+It signs access tokens for the services configured with
+SMS_TOKEN_ISSUER=remote, which authenticate with the shared client
+credentials (CLIENT_ID and CLIENT_SECRET) over HTTP Basic.
 """
-from datetime import datetime, timedelta, UTC
+import hmac
 from os import environ as env
 
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import serialization
 from dotenv import find_dotenv, load_dotenv
-from flask import Flask, jsonify, request
-from flask_jwt_extended import JWTManager, create_access_token
+from flask import Blueprint, Flask, current_app, jsonify, request
+from jwt import PyJWTError
+
+from modules.service.v1.token_issuer import LocalTokenIssuer, configure_jwt
+from modules.service.v1.token_verification import configure_revocation, revoke_token
 
 ENV_FILE = find_dotenv()
 if ENV_FILE:
     load_dotenv(ENV_FILE)
 
-with open('private.pem', 'rb') as key_file:
-    private_key = serialization.load_pem_private_key(key_file.read(), None, default_backend())
-
-app = Flask(__name__)
-app.config['JWT_SECRET_KEY'] = env.get("APP_SECRET")
-jwt = JWTManager(app)
+auth = Blueprint('auth', __name__)
+token_issuer = LocalTokenIssuer()
 
-blacklist = set()
 
-
-@jwt.invalid_token_loader
-def invalid_token():
+def invalid_token(reason):
     return jsonify({'message': 'Token is invalid'}), 401
 
 
-@app.route('/auth', methods=['POST'], strict_slashes=False)
+def create_app(config=None):
+    """
+    Create the authentication service app.
+
+    Args:
+        config (dict, optional): Settings overriding the defaults.
+
+    Returns:
+        Flask: The app.
+    """
+    app = Flask(__name__)
+    app.config['JWT_SECRET_KEY'] = env.get("APP_SECRET")
+    app.config['CLIENT_ID'] = env.get("CLIENT_ID")
+    app.config['CLIENT_SECRET'] = env.get("CLIENT_SECRET")
+    if config:
+        app.config.update(config)
+    jwt = configure_jwt(app)
+    configure_revocation(jwt)
+    jwt.invalid_token_loader(invalid_token)
+    app.register_blueprint(auth)
+    return app
+
+
+def client_authenticated():
+    """
+    Check the client credentials of the request against the shared ones.
+
+    Returns:
+        bool: False when they differ, or when no client secret is configured.
+    """
+    credentials = request.authorization
+    client_id, client_secret = current_app.config['CLIENT_ID'], current_app.config['CLIENT_SECRET']
+    if credentials is None or not client_secret:
+        return False
+    return (hmac.compare_digest(str(credentials.username or ''), str(client_id or ''))
+            and hmac.compare_digest(str(credentials.password or ''), client_secret))
+
+
+@auth.route('/auth', methods=['POST'], strict_slashes=False)
 def login():
-    data = request.get_json()
+    if not client_authenticated():
+        return jsonify({'message': 'Client authentication required'}), 401
+
+    data = request.get_json(silent=True)
     try:
         if not data:
             return jsonify({'message': 'No data'}), 400
 
         email = data['email']
-        password = data['password']
         id_ = data["id"]
 
-        if not email or not password:
-            return jsonify({'message': 'Email and password are required'}), 400
+        if not email or not id_:
+            return jsonify({'message': 'Email and id are required'}), 400
 
-        additional_claims = {'email': email,
-                             'password': password,
-                             'client_id': env.get("CLIENT_ID"),
-                             'client_secret': env.get("CLIENT_SECRET"),
-                             'iss': 'http://localhost:8000/auth',
-                             'exp': datetime.now(UTC) + timedelta(minutes=30)}
-
-        token = create_access_token(identity=id_, additional_claims=additional_claims)
-
-        # token = jwt.encode(additional_claims, private_key, algorithm='RS256')
-
-        access_token = token
+        access_token = token_issuer.issue(id_, email)
     except Exception as e:
         return jsonify({'message': str(e)}), 500
 
     return jsonify({"access_token": access_token}), 200
 
 
-@app.route('/logout', methods=['POST'], strict_slashes=False)
+@auth.route('/logout', methods=['POST'], strict_slashes=False)
 def logout():
     try:
         # Get the raw JWT token from the request
@@ -70,19 +97,15 @@ def logout():
         if not token:
             return jsonify({'message': 'No token provided'}), 401
 
-        # Add token to blacklist
-        blacklist.add(token)
+        # Revoke the token for every worker until it expires
+        revoke_token(token)
 
         return jsonify({'message': 'Logout successful'}), 200
+    except PyJWTError:
+        return jsonify({'message': 'Token is invalid'}), 401
     except Exception as e:
         return jsonify({'message': f'Internal Server Error: {str(e)}'}), 500
 
 
-# Check if token is revoked
-# @jwt.token_in_blocklist_loader()
-# def check_token_in_blacklist(decrypted_token):
-#     return decrypted_token['jti'] in blacklist
-
-
 if __name__ == '__main__':
-    app.run(host=env.get("AUTH_SERVER_HOST", "0.0.0.0"), port=env.get("AUTH_SERVER_PORT", 8080))
+    create_app().run(host=env.get("AUTH_SERVER_HOST", "0.0.0.0"), port=env.get("AUTH_SERVER_PORT", 8080))
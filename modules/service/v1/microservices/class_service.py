@@ -10,58 +10,110 @@ unenrolling students, and more.
 
 from flask import jsonify, request, abort, make_response
 
-from models import storage, Student
+from models import storage, Student, Class, Grade, Attendance, User, StudentClassAssociation
+from modules.service.v1.cache import cached
+from modules.service.v1.conditional import conditional, conditional_resource
 from modules.class_management.class_management import ClassManagement
 from modules.service.v1.microservices import services
+from modules.service.v1.microservices.pagination import page_request
 from modules.user_management.user_management import UserManagement
 
 class_management = ClassManagement()
 user_management = UserManagement()
 
 
+def _class_teachers(class_id):
+    """
+    Select the head and the assistant teachers of a class.
+    """
+    rows = storage.rows(Class, ["head_class_teacher", "assist_class_teacher"], [Class.id == class_id])
+    return User.id.in_([teacher for row in rows for teacher in row if teacher])
+
+
+def _class_students(class_id):
+    """
+    Select the students enrolled in a class.
+    """
+    rows = storage.rows(StudentClassAssociation, ["student_id"], [StudentClassAssociation.class_id == class_id])
+    return Student.id.in_([row.student_id for row in rows])
+
+
+def _class_list(classes):
+    """
+    Serializes classes with their grades, students, attendances and teachers.
+
+    Args:
+        classes (list): The classes to serialize.
+
+    Returns:
+        list: The serialized classes.
+    """
+    teacher_ids = [class_.head_class_teacher for class_ in classes]
+    teacher_ids += [class_.assist_class_teacher for class_ in classes if class_.assist_class_teacher]
+    teachers, _ = user_management.get_users_by_ids(teacher_ids)
+
+    class_list = []
+    for class_ in classes:
+        class_details = class_.serialize()
+
+        class_details["grades"] = [grade.serialize() for grade in class_.gradebooks]
+        class_details["attendances"] = []
+
+        class_details["students"] = [student.serialize() for student in class_.students]
+        teacher = teachers[class_.head_class_teacher]
+        class_details['class_teacher'] = teacher.first_name + " " + teacher.last_name
+        if class_.assist_class_teacher:
+            assist = teachers[class_.assist_class_teacher]
+            class_details['assist_class_teacher'] = assist.first_name + " " + assist.last_name
+
+        for attendance in class_.attendances:
+            student_name = attendance.student.first_name + " " + attendance.student.last_name
+            attendance = attendance.serialize()
+            attendance['student_name'] = student_name
+
+            class_details['attendances'].append(attendance)
+
+        class_list.append(class_details)
+
+    return class_list
+
+
 @services.route('/classes', methods=['GET'], strict_slashes=False)
+@conditional(Class, Grade, Attendance, Student, StudentClassAssociation, User)
+@cached(Class, Grade, Attendance, Student, StudentClassAssociation, User)
 def get_all_classes():
     """
     Retrieves information about all classes.
 
+    Query Parameters:
+        limit (int, optional): Paginate the classes with pages of this size.
+        cursor (str, optional): The next_cursor of the previous page.
+
     Returns:
         JSON: Information about all classes.
     """
+    page = page_request()
     try:
-        classes, msg = class_management.get_classes()
-        class_list = []
-        for class_ in classes:
-            class_details = class_.serialize()
-
-            class_details["grades"] = [grade.serialize() for grade in class_.gradebooks]
-            class_details["attendances"] = []
-
-            class_details["students"] = [student.serialize() for student in class_.students]
-            teacher, _ = user_management.get_user(class_.head_class_teacher)
-            class_details['class_teacher'] = teacher.first_name + " " + teacher.last_name
-            if class_.assist_class_teacher:
-                assist, _ = user_management.get_user(class_.assist_class_teacher)
-                class_details['assist_class_teacher'] = assist.first_name + " " + assist.last_name
-
-            for attendance in class_.attendances:
-                student_name = attendance.student.first_name + " " + attendance.student.last_name
-                attendance = attendance.serialize()
-                attendance['student_name'] = student_name
-
-                class_details['attendances'].append(attendance)
-
-            class_list.append(class_details)
-
-        result = {
-            "status_msg": msg,
-            "classes": class_list
-        }
+        result = {}
+        if page:
+            classes, result["next_cursor"], msg = class_management.get_classes_paginated(
+                *page, profile="class_overview")
+            if classes is None:
+                return make_response(jsonify({"error": msg}), 400)
+        else:
+            classes, msg = class_management.get_classes(profile="class_overview")
+
+        result["status_msg"] = msg
+        result["classes"] = _class_list(classes)
         return make_response(jsonify(result), 200)
     except Exception as e:
         abort(500)
 
 
 @services.route("/classes/<class_id>", methods=["GET"], strict_slashes=False)
+@conditional_resource(Class, "class_id", Grade.class_id, Attendance.class_id,
+                      StudentClassAssociation.class_id,
+                      linked=((Student, _class_students), (User, _class_teachers)))
 def get_class(class_id):
     """
     Retrieves information about a specific class.
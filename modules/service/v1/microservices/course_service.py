@@ -19,45 +19,81 @@ Endpoints:
 
 from flask import jsonify, request, abort, make_response
 
-from models import storage, User
+from models import storage, User, Course, Class, ClassCourseAssociation, Grade
+from modules.service.v1.cache import cached
+from modules.service.v1.conditional import conditional, conditional_resource
 from modules.course_management.course_management import CourseManagement
 from modules.service.v1.microservices import services
+from modules.service.v1.microservices.pagination import page_request
+from modules.user_management.user_management import UserManagement
 
 course_management = CourseManagement()
+user_management = UserManagement()
+
+
+def _course_teacher(course_id):
+    """
+    Select the teacher of a course.
+    """
+    rows = storage.rows(Course, ["teacher_id"], [Course.id == course_id])
+    return User.id.in_([row.teacher_id for row in rows])
+
+
+def _course_classes(course_id):
+    """
+    Select the classes taking a course.
+    """
+    rows = storage.rows(ClassCourseAssociation, ["class_id"], [ClassCourseAssociation.course_id == course_id])
+    return Class.id.in_([row.class_id for row in rows])
 
 
 @services.route('/courses', methods=['GET'], strict_slashes=False)
+@conditional(Course, ClassCourseAssociation, Class, User)
+@cached(Course, ClassCourseAssociation, Class, User)
 def get_all_courses():
     """
     Retrieves information about all courses.
 
+    Query Parameters:
+        limit (int, optional): Paginate the courses with pages of this size.
+        cursor (str, optional): The next_cursor of the previous page.
+
     Returns:
         JSON: Information about all courses.
     """
+    page = page_request()
     try:
-        courses, msg = course_management.get_courses()
+        result = {}
+        if page:
+            courses, result["next_cursor"], msg = course_management.get_courses_paginated(
+                *page, profile="course_overview")
+            if courses is None:
+                return make_response(jsonify({"error": msg}), 400)
+        else:
+            courses, msg = course_management.get_courses(profile="course_overview")
+            courses = courses.all()
+        teachers, _ = user_management.get_users_by_ids(course.teacher_id for course in courses)
 
         course_list = []
 
         for course in courses:
             classes = course.classes
-            teacher = course.teacher
-            teacher_ = storage.get_by_id(User, teacher.id)
+            teacher_ = teachers[course.teacher_id]
             course = course.serialize()
             course["classes"] = [class_.classe.serialize() for class_ in classes]
             course["teacher"] = teacher_.first_name + " " + teacher_.last_name
             course_list.append(course)
 
-        result = {
-            "status_msg": msg,
-            "courses": course_list
-        }
+        result["status_msg"] = msg
+        result["courses"] = course_list
         return make_response(jsonify(result), 200)
     except Exception as e:
         abort(500, f"Internal Server Error: {str(e)}")
 
 
 @services.route("/courses/<course_id>", methods=["GET"], strict_slashes=False)
+@conditional_resource(Course, "course_id", ClassCourseAssociation.course_id, Grade.course_id,
+                      linked=((Class, _course_classes), (User, _course_teacher)))
 def get_course(course_id):
     """
     Retrieves information about a specific course.
@@ -182,16 +218,29 @@ def get_course_by_teacher(teacher_id):
     Args:
         teacher_id (str): ID of the teacher.
 
+    Query Parameters:
+        limit (int, optional): Paginate the courses with pages of this size.
+        cursor (str, optional): The next_cursor of the previous page.
+
     Returns:
         JSON: Courses associated with the specified teacher.
     """
     if teacher_id is None:
         abort(400, "Teacher ID cannot be None")
 
+    page = page_request()
     try:
-        courses, msg = course_management.get_courses_by_teacher(teacher_id)
+        result = {}
+        if page:
+            courses, result["next_cursor"], msg = course_management.get_courses_by_teacher_paginated(
+                teacher_id, *page)
+            if courses is None:
+                return make_response(jsonify({"error": msg}), 400)
+        else:
+            courses, msg = course_management.get_courses_by_teacher(teacher_id)
         if courses or courses == []:
-            return jsonify({"courses": {course.id: course.serialize() for course in courses}, "message": msg}), 200
+            result.update({"courses": {course.id: course.serialize() for course in courses}, "message": msg})
+            return jsonify(result), 200
     except ValueError as ve:
         abort(400, str(ve))
     except Exception as e:
@@ -206,16 +255,29 @@ def get_course_by_class(class_id):
     Args:
         class_id (str): ID of the class.
 
+    Query Parameters:
+        limit (int, optional): Paginate the courses with pages of this size.
+        cursor (str, optional): The next_cursor of the previous page.
+
     Returns:
         JSON: Courses associated with the specified class.
     """
     if class_id is None:
         abort(400, "Class ID cannot be None")
 
+    page = page_request()
     try:
-        courses, msg = course_management.get_courses_by_class(class_id)
+        result = {}
+        if page:
+            courses, result["next_cursor"], msg = course_management.get_courses_by_class_paginated(
+                class_id, *page)
+            if courses is None:
+                return make_response(jsonify({"error": msg}), 400)
+        else:
+            courses, msg = course_management.get_courses_by_class(class_id)
         if courses or courses == []:
-            return jsonify({"courses": {course.id: course.serialize() for course in courses}, "message": msg}), 200
+            result.update({"courses": {course.id: course.serialize() for course in courses}, "message": msg})
+            return jsonify(result), 200
 
     except ValueError as ve:
         abort(400, str(ve))
@@ -0,0 +1,20 @@
+#!/usr/bin/python3
+"""
+Field selection shared by the list endpoints.
+
+`?fields=id,status,date` restricts every serialized row to those attributes.
+"""
+from flask import request
+
+
+def requested_fields():
+    """
+    Read the field selection of the current request.
+
+    Returns:
+        tuple: The requested attributes, or None to serialize every attribute.
+    """
+    fields = request.args.get('fields')
+    if not fields:
+        return None
+    return tuple(sorted({field.strip() for field in fields.split(',') if field.strip()})) or None
@@ -7,8 +7,13 @@ This module provides a RESTful API for managing gradebooks in the school system.
 
 from flask import jsonify, request, abort
 
+from models import Grade
+from models.serializer import row_serializer
 from modules.gradebook_management.gradebook_management import GradebookManagement
 from modules.service.v1.microservices import services
+from modules.service.v1.microservices.fields import requested_fields
+from modules.service.v1.microservices.pagination import page_request
+from modules.service.v1.microservices.streaming import wants_ndjson, stream_ndjson, stream_json
 
 gradebook_management = GradebookManagement()
 
@@ -18,6 +23,14 @@ def get_gradebooks():
     """
     Retrieves gradebooks based on student ID or class ID provided in the query parameters.
 
+    Query Parameters:
+        limit (int, optional): Paginate the gradebooks with pages of this size.
+        cursor (str, optional): The next_cursor of the previous page.
+        format (str, optional): `ndjson` streams one gradebook per line.
+        fields (str, optional): Comma separated attributes to return for each gradebook.
+
+    Without pagination the gradebooks are streamed as they are fetched.
+
     Returns:
         JSON (200): A list of retrieved gradebooks and a success message.
         JSON (400): Error message for bad request (e.g., invalid query parameters).
@@ -33,13 +46,23 @@ def get_gradebooks():
         gradebook_management.academic_year = academic_year
         gradebook_management.term = term
 
-    results, msg = gradebook_management.get_gradebooks()
-
-    results = [gradebook.serialize() for gradebook in results]
-
+    page = page_request()
+    fields = requested_fields()
+    if not page:
+        results, msg = gradebook_management.stream_gradebooks(fields=fields)
+        serialize = row_serializer(Grade, fields)
+        if wants_ndjson():
+            return stream_ndjson(results, serialize)
+        return stream_json({"message": msg}, "grades", results, serialize)
+
+    response = {}
+    results, response["next_cursor"], msg = gradebook_management.get_gradebooks_paginated(*page)
     if results is None:
         return abort(400, msg)
-    return jsonify({"grades": results, "message": msg}), 200
+
+    response["grades"] = [gradebook.serialize(fields) for gradebook in results]
+    response["message"] = msg
+    return jsonify(response), 200
 
 
 @services.route('/grades/<grade_id>', methods=['GET'], strict_slashes=False)
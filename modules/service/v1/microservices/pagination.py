@@ -0,0 +1,39 @@
+#!/usr/bin/python3
+"""
+Pagination helpers shared by the list endpoints.
+
+A list endpoint only paginates when the request asks for it with a `limit`
+or a `cursor` query parameter, so existing clients keep receiving the full list.
+"""
+from os import environ as env
+
+from flask import request, abort
+
+from models.engine.pagination import decode_cursor
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = int(env.get('SMS_MAX_PAGE_SIZE', 100))
+
+
+def page_request():
+    """
+    Read the pagination parameters of the current request.
+
+    Returns:
+        tuple: The cursor and the page size, or None when the request does not paginate.
+    """
+    if 'cursor' not in request.args and 'limit' not in request.args:
+        return None
+
+    cursor = request.args.get('cursor') or None
+    try:
+        page_size = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+        if cursor:
+            decode_cursor(cursor)
+    except ValueError as e:
+        abort(400, str(e))
+
+    if page_size < 1:
+        abort(400, "limit must be a positive integer")
+
+    return cursor, min(page_size, MAX_PAGE_SIZE)
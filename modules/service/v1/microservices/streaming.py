@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+"""
+Streaming helpers for the export endpoints.
+
+Large result sets are written to the response while the rows are fetched,
+so the ORM objects, their dicts and the JSON text of one batch are all the
+memory an export needs, however many rows it returns.
+"""
+from flask import Response, current_app, request, stream_with_context
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def wants_ndjson():
+    """
+    Check whether the client asked for newline delimited JSON.
+
+    Returns:
+        bool: True for `?format=ndjson` or an `Accept: application/x-ndjson` header.
+    """
+    if request.args.get('format') == 'ndjson':
+        return True
+    return request.accept_mimetypes.best == NDJSON_MIMETYPE
+
+
+def stream_ndjson(rows, serialize):
+    """
+    Stream rows as newline delimited JSON, one object per line.
+
+    Args:
+        rows (iterable): The rows to stream.
+        serialize (callable): Turns a row into a JSON-serializable value.
+
+    Returns:
+        Response: The streaming response.
+    """
+    dumps = current_app.json.dumps
+
+    def generate():
+        for row in rows:
+            yield dumps(serialize(row)) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+
+
+def stream_json(document, key, rows, serialize, keyed_by=None):
+    """
+    Stream a JSON object whose `key` member holds the rows.
+
+    The members of `document` are written first, then the rows as a JSON
+    array, or as an object keyed by `keyed_by(row)` when it is given, so the
+    body is the same document jsonify would have built in memory.
+
+    Args:
+        document (dict): The other members of the JSON object.
+        key (str): The member holding the rows.
+        rows (iterable): The rows to stream.
+        serialize (callable): Turns a row into a JSON-serializable value.
+        keyed_by (callable, optional): Returns the key of a row.
+
+    Returns:
+        Response: The streaming response.
+    """
+    dumps = current_app.json.dumps
+    opening, closing = ('{', '}') if keyed_by else ('[', ']')
+
+    def generate():
+        head = dumps(document)[:-1]
+        yield head + (', ' if document else '') + dumps(key) + ': ' + opening
+        separator = ''
+        for row in rows:
+            item = dumps(serialize(row))
+            if keyed_by:
+                item = dumps(keyed_by(row)) + ': ' + item
+            yield separator + item
+            separator = ', '
+        yield closing + '}'
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
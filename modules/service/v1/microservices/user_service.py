@@ -2,15 +2,21 @@
 """
 The management service
 """
-from datetime import datetime, timedelta, UTC
+from datetime import datetime, UTC
 
-import requests
 from flasgger import swag_from
-from os import environ as env
 from dotenv import load_dotenv, find_dotenv
 from flask import jsonify, request, abort, make_response
 
+from models import User, Staff
+from models.passwords import PasswordPoolBusy
+from modules.service.v1.cache import cached
+from modules.service.v1.conditional import conditional
 from modules.service.v1.microservices import services
+from modules.service.v1.microservices.fields import requested_fields
+from modules.service.v1.microservices.pagination import page_request
+from modules.service.v1.token_issuer import issuer as token_issuer, TokenIssueError, TOKEN_LIFETIME
+from modules.service.v1.token_verification import revoke_current_token
 from modules.user_management.user_management import UserManagement
 
 user_management = UserManagement()
@@ -19,10 +25,6 @@ ENV_FILE = find_dotenv()
 if ENV_FILE:
     load_dotenv(ENV_FILE)
 
-AUTH_SERVER = env.get('AUTH_SERVER_HOST')
-AUTH_PORT = env.get('AUTH_SERVER_PORT')
-AUTH_PATH = f"http://{AUTH_SERVER}:{AUTH_PORT}/auth"
-
 
 @services.route('/login', methods=['POST'], strict_slashes=False)
 @swag_from('swagger_docs/login.yml')
@@ -48,41 +50,41 @@ def login():
     except ValueError as e:
         abort(400, str(e))
 
+    except PasswordPoolBusy as e:
+        abort(503, str(e))
+
     except Exception as e:
         abort(500, str(e))
 
-    data["id"] = user.id
-
-    r = requests.post(AUTH_PATH, json=data)
+    try:
+        access_token = token_issuer.issue(user.id, email)
+    except TokenIssueError as e:
+        return jsonify({"message": "Failed to create access token. Please try again.", "error": str(e)}), e.status_code
 
-    if r.status_code == 200:
-        response = {
-            'access_token': r.json()['access_token'],
-            'user_id': user.id,
-            'token_type': 'jwt',
-            'expires_in': datetime.now() + timedelta(minutes=30),
-        }
+    response = {
+        'access_token': access_token,
+        'user_id': user.id,
+        'token_type': 'jwt',
+        'expires_in': datetime.now() + TOKEN_LIFETIME,
+    }
 
-        user_management.update_user(user.id, **{"last_login_date": datetime.now(UTC),
-                                                "last_login_ip": request.remote_addr})
+    user_management.update_user(user.id, **{"last_login_date": datetime.now(UTC),
+                                            "last_login_ip": request.remote_addr})
 
-    else:
-        return jsonify({"message": "Failed to create access token. Please try again.", "error": r.text}), r.status_code
     return jsonify(response), 200
 
 
 @services.route('/logout', methods=['POST'], strict_slashes=False)
 def logout():
-    data = request.headers
-
-    authorization = data.get('Authorization')
-
-    if not authorization:
-        abort(400, 'Missing Authorization')
+    """
+    Revoke the access token of the request until it expires.
 
-    r = requests.post('http://127.0.0.1:8000/auth', json=jsonify({"access_token": authorization}))
+    Returns:
+        JSON: Logout message
+    """
+    revoke_current_token()
 
-    return jsonify(r.json()), r.status_code
+    return jsonify({"message": "Logout successful"}), 200
 
 
 @services.route('/users', methods=['GET'], strict_slashes=False)
@@ -90,17 +92,28 @@ def get_users():
     """
     Get all users
 
+    Query Parameters:
+        limit (int, optional): Paginate the users with pages of this size.
+        cursor (str, optional): The next_cursor of the previous page.
+        fields (str, optional): Comma separated attributes to return for each user.
+
     Returns:
         JSON: List of users
     """
+    page = page_request()
+    fields = requested_fields()
     try:
-        users, msg = user_management.get_all_users()
-        if users:
-            users_dict = {user.id: user.serialize() for user in users}
-            results = {
-                'users': users_dict,
-                'message': msg
-            }
+        results = {}
+        if page:
+            users, results['next_cursor'], msg = user_management.get_users_paginated(*page)
+            if users is None:
+                return make_response(jsonify({"error": msg}), 400)
+        else:
+            users, msg = user_management.get_all_users()
+        if users or page:
+            # a page past the last user is empty, not missing
+            results['users'] = {user.id: user.serialize(fields) for user in users}
+            results['message'] = msg
 
             return make_response(jsonify(results), 200)
         else:
@@ -133,16 +146,28 @@ def get_user(user_id):
 
 
 @services.route("/users/staff", methods=['GET'], strict_slashes=False)
+@conditional(Staff, User)
+@cached(Staff, User)
 def get_all_staff():
     """
     Get all staff users
 
+    Query Parameters:
+        limit (int, optional): Paginate the staff with pages of this size.
+        cursor (str, optional): The next_cursor of the previous page.
+
     Returns:
         JSON: List of staff
     """
-
+    page = page_request()
+    result = {}
     try:
-        staffs, msg = user_management.get_all_staff()
+        if page:
+            staffs, result["next_cursor"], msg = user_management.get_staff_paginated(*page)
+            if staffs is None:
+                return make_response(jsonify({"error": msg}), 400)
+        else:
+            staffs, msg = user_management.get_all_staff()
         staffs = [user_management.get_staff_details(staff.id)[0] for staff in staffs]
         staff_dict = {staff["id"]: staff for staff in staffs}
     except ValueError as e:
@@ -150,7 +175,8 @@ def get_all_staff():
     except Exception as e:
         abort(500, f"Internal Server Error: {str(e)}")
 
-    return make_response(jsonify({"staff": staff_dict, "status_msg": msg}), 200)
+    result.update({"staff": staff_dict, "status_msg": msg})
+    return make_response(jsonify(result), 200)
 
 
 @services.route("/users/staff/<staff_id>", methods=['GET'], strict_slashes=False)
@@ -182,12 +208,22 @@ def get_all_parents():
     """
     Get all parent users
 
+    Query Parameters:
+        limit (int, optional): Paginate the parents with pages of this size.
+        cursor (str, optional): The next_cursor of the previous page.
+
     Returns:
         JSON: List of parent users
     """
-
+    page = page_request()
+    result = {}
     try:
-        parents, msg = user_management.get_all_parent()
+        if page:
+            parents, result["next_cursor"], msg = user_management.get_parents_paginated(*page)
+            if parents is None:
+                return make_response(jsonify({"error": msg}), 400)
+        else:
+            parents, msg = user_management.get_all_parent()
         parents = [user_management.get_parent_details(parent.id)[0] for parent in parents]
         parents_dict = {parent["id"]: parent for parent in parents}
     except ValueError as e:
@@ -195,7 +231,8 @@ def get_all_parents():
     except Exception as e:
         abort(500, f"Internal Server Error: {str(e)}")
 
-    return make_response(jsonify({"parents": parents_dict, "status_msg": msg}), 200)
+    result.update({"parents": parents_dict, "status_msg": msg})
+    return make_response(jsonify(result), 200)
 
 
 @services.route("/users/parents/<parent_id>", methods=['GET'], strict_slashes=False)
@@ -242,6 +279,8 @@ def create_user():
         return make_response(jsonify(result), 200)
     except ValueError as e:
         abort(404, str(e))
+    except PasswordPoolBusy as e:
+        abort(503, str(e))
     except Exception as e:
         abort(500, f"Internal Server Error: {str(e)}")
 
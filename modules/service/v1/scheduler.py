@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+"""
+The background jobs of the services.
+
+The jobs must run in exactly one process of a deployment, by default a
+process of their own, started next to gunicorn:
+
+    python3 -m modules.service.v1.scheduler
+
+Set SMS_SCHEDULER=worker to run them in one gunicorn worker instead (see
+gunicorn.conf.py). Never in the gunicorn master: it forks the workers.
+"""
+from functools import wraps
+
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.blocking import BlockingScheduler
+
+from models import storage
+from modules.service.v1.token_issuer import keyring
+from modules.service.v1.token_verification import revocations
+
+
+def _job(fn):
+    """
+    Wrap a job to release its storage session once it has run, as the
+    app does at the end of each request.
+    """
+
+    @wraps(fn)
+    def run():
+        try:
+            return fn()
+        finally:
+            storage.close()
+
+    return run
+
+
+def create_scheduler(blocking=False):
+    """
+    Create the scheduler of the background jobs, not started.
+
+    Args:
+        blocking (bool): Whether start() runs the jobs in the calling thread.
+
+    Returns:
+        BaseScheduler: The scheduler.
+    """
+    scheduler = BlockingScheduler() if blocking else BackgroundScheduler()
+    job_defaults = {'coalesce': True, 'max_instances': 1}
+    # rotate() is a no-op until the current signing key is due
+    scheduler.add_job(_job(keyring.rotate), 'interval', minutes=10, id='rotate_signing_keys', **job_defaults)
+    scheduler.add_job(_job(revocations.purge), 'interval', hours=1, id='purge_revoked_tokens', **job_defaults)
+    return scheduler
+
+
+if __name__ == "__main__":
+    create_scheduler(blocking=True).start()
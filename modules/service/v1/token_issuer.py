@@ -0,0 +1,209 @@
+#!/usr/bin/python3
+"""
+Access token issuance.
+
+By default tokens are signed in-process with RS256 using the current key
+of the shared keyring (see keyring.py), so a login needs no call to
+another service. Set SMS_TOKEN_ISSUER=remote to have the authentication
+service sign them instead; it is then called through a pooled keep-alive
+HTTP session with connect and read timeouts, authenticated with the
+shared client credentials (CLIENT_ID and CLIENT_SECRET).
+
+Tokens only carry the user id, email and client id: the password and the
+client secret never leave the server.
+"""
+import os
+from datetime import timedelta
+from os import environ
+
+import requests
+from dotenv import find_dotenv, load_dotenv
+from flask import current_app, g
+from flask_jwt_extended import JWTManager, create_access_token
+from jwt import InvalidSignatureError
+from requests.adapters import HTTPAdapter
+
+from modules.service.v1.keyring import Keyring
+
+ENV_FILE = find_dotenv()
+if ENV_FILE:
+    load_dotenv(ENV_FILE)
+
+PUBLIC_KEY_PATH = environ.get('SMS_JWT_PUBLIC_KEY', 'public.pem')
+ISSUER = environ.get('SMS_JWT_ISSUER', 'http://localhost:8000/auth')
+TOKEN_LIFETIME = timedelta(minutes=int(environ.get('SMS_TOKEN_MINUTES', 30)))
+
+
+class TokenIssueError(Exception):
+    """
+    Raised when an access token could not be issued.
+    """
+
+    def __init__(self, message, status_code=502):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+keyring = Keyring(TOKEN_LIFETIME, passphrase=environ.get('APP_SECRET'))
+
+
+def _signing_key():
+    """
+    Get the signing key of the current app context, so that the kid header
+    and the signature of a token always come from the same key.
+    """
+    key = g.get('_jwt_signing_key')
+    if key is None:
+        key = g._jwt_signing_key = keyring.signing_key()
+    return key
+
+
+def configure_jwt(app, signing=True):
+    """
+    Configure an app to verify, and optionally sign, RS256 access tokens
+    with the keyring.
+
+    Tokens without a kid, signed before the keyring, are verified with the
+    public key of the deployment (public.pem) when it exists.
+
+    Args:
+        app (Flask): The app.
+        signing (bool): Whether the app signs tokens.
+
+    Returns:
+        JWTManager: The manager of the app.
+    """
+    app.config['JWT_ALGORITHM'] = 'RS256'
+    app.config['JWT_ACCESS_TOKEN_EXPIRES'] = TOKEN_LIFETIME
+    app.config['JWT_ENCODE_ISSUER'] = ISSUER
+    if os.path.isfile(PUBLIC_KEY_PATH):
+        with open(PUBLIC_KEY_PATH, 'rb') as key_file:
+            app.config['JWT_PUBLIC_KEY'] = key_file.read()
+    jwt = JWTManager(app)
+
+    @jwt.decode_key_loader
+    def decode_key(jwt_header, jwt_data):
+        kid = jwt_header.get('kid')
+        if kid is None and current_app.config.get('JWT_PUBLIC_KEY'):
+            return current_app.config['JWT_PUBLIC_KEY']
+        key = keyring.public_key(kid)
+        if key is None:
+            raise InvalidSignatureError("Unknown signing key")
+        return key
+
+    if signing:
+        @jwt.encode_key_loader
+        def encode_key(identity):
+            return _signing_key()[1]
+
+        @jwt.additional_headers_loader
+        def kid_header(identity):
+            return {'kid': _signing_key()[0]}
+
+    return jwt
+
+
+def token_claims(email):
+    """
+    Build the additional claims of an access token.
+
+    Args:
+        email (str): The email of the user.
+
+    Returns:
+        dict: The claims.
+    """
+    return {'email': email, 'client_id': environ.get('CLIENT_ID')}
+
+
+class LocalTokenIssuer:
+    """
+    Signs access tokens in-process with the app's private key.
+    """
+
+    def issue(self, user_id, email):
+        """
+        Issue an access token.
+
+        Args:
+            user_id (str): The ID of the user.
+            email (str): The email of the user.
+
+        Returns:
+            str: The access token.
+        """
+        return create_access_token(identity=user_id, additional_claims=token_claims(email))
+
+
+class RemoteTokenIssuer:
+    """
+    Asks the authentication service for access tokens.
+    """
+
+    def __init__(self, url, client_id, client_secret, timeout=(1.0, 5.0), pool_size=20):
+        """
+        Args:
+            url (str): The token endpoint of the authentication service.
+            client_id (str): The client id shared with the authentication service.
+            client_secret (str): The client secret shared with the authentication service.
+            timeout (tuple): The connect and read timeouts in seconds.
+            pool_size (int): The number of keep-alive connections kept open.
+        """
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.auth = (client_id, client_secret)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def issue(self, user_id, email):
+        """
+        Issue an access token.
+
+        Args:
+            user_id (str): The ID of the user.
+            email (str): The email of the user.
+
+        Returns:
+            str: The access token.
+
+        Raises:
+            TokenIssueError: If the authentication service is unreachable or refuses.
+        """
+        try:
+            r = self.session.post(self.url, json={'id': user_id, 'email': email}, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise TokenIssueError(f"Authentication service unavailable: {e}")
+
+        if r.status_code in (401, 403):
+            # the client credentials of this service were refused
+            raise TokenIssueError(r.text)
+        if r.status_code != 200:
+            raise TokenIssueError(r.text, r.status_code)
+        return r.json()['access_token']
+
+
+def signs_locally():
+    """
+    Check whether tokens are signed in-process.
+
+    Returns:
+        bool: False when SMS_TOKEN_ISSUER=remote.
+    """
+    return environ.get('SMS_TOKEN_ISSUER', 'local') != 'remote'
+
+
+def _default_issuer():
+    """
+    Build the issuer selected by SMS_TOKEN_ISSUER.
+    """
+    if not signs_locally():
+        url = f"http://{environ.get('AUTH_SERVER_HOST')}:{environ.get('AUTH_SERVER_PORT')}/auth"
+        timeout = (float(environ.get('SMS_AUTH_CONNECT_TIMEOUT', 1)),
+                   float(environ.get('SMS_AUTH_READ_TIMEOUT', 5)))
+        return RemoteTokenIssuer(url, environ.get('CLIENT_ID'), environ.get('CLIENT_SECRET'), timeout=timeout)
+    return LocalTokenIssuer()
+
+
+issuer = _default_issuer()
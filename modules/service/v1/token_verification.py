@@ -0,0 +1,295 @@
+#!/usr/bin/python3
+"""
+Access token verification.
+
+Verifying an RS256 signature on every request costs far more than the
+request itself for the cheap endpoints, so the decoded claims of a token
+are cached under the SHA-256 of its Authorization header until the token
+expires. A cache hit skips the signature check but never the revocation
+check.
+
+Revoked tokens are recorded by jti in storage (the revoked_tokens table),
+so every worker, and the authentication service, agree on them. Each
+worker keeps the set of the unexpired revocations in memory, refreshed
+from storage every SMS_REVOCATION_REFRESH seconds, which bounds how long
+another worker may still accept a token revoked elsewhere; revocations
+made by the worker itself apply at once.
+
+See benchmarks/auth_overhead.py for the per-request cost.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from os import environ
+
+from flask import g, request
+from flask_jwt_extended import decode_token, get_jwt, get_unverified_jwt_headers, verify_jwt_in_request
+from flask_jwt_extended.config import config
+from flask_jwt_extended.exceptions import NoAuthorizationError, RevokedTokenError, WrongTokenError
+from sqlalchemy.exc import IntegrityError
+
+from models import storage
+from models.revoked_token import RevokedToken
+
+CLAIMS_CACHE_SIZE = int(environ.get('SMS_CLAIMS_CACHE_SIZE', 4096))
+REVOCATION_REFRESH = float(environ.get('SMS_REVOCATION_REFRESH', 5))
+
+
+class RevocationList:
+    """
+    The revoked token identifiers, shared through storage.
+    """
+
+    def __init__(self, refresh=REVOCATION_REFRESH):
+        """
+        Args:
+            refresh (float): The seconds between two reads of the revocations
+                made by the other workers.
+        """
+        self.refresh_interval = refresh
+        self.__revoked = set()
+        self.__refreshed = None
+        self.__lock = threading.Lock()
+
+    def refresh(self):
+        """
+        Reload the unexpired revocations from storage.
+        """
+        # a lagging replica would miss the latest revocations
+        storage.use_primary()
+        now = int(time.time())
+        rows = storage.rows(RevokedToken, ["jti"], filters=[RevokedToken.expires_at > now])
+        revoked = {row.jti for row in rows}
+        with self.__lock:
+            self.__revoked = revoked
+            self.__refreshed = time.monotonic()
+
+    def __refresh_if_stale(self):
+        refreshed = self.__refreshed
+        if refreshed is None or time.monotonic() - refreshed >= self.refresh_interval:
+            self.refresh()
+
+    def is_revoked(self, jti):
+        """
+        Check whether a token was revoked.
+
+        Args:
+            jti (str): The unique identifier of the token.
+
+        Returns:
+            bool: True if the token was revoked.
+        """
+        if not jti:
+            return False
+        self.__refresh_if_stale()
+        return jti in self.__revoked
+
+    def revoke(self, jti, expires_at):
+        """
+        Revoke a token until it expires.
+
+        Args:
+            jti (str): The unique identifier of the token.
+            expires_at (int): The expiry of the token, as a Unix timestamp.
+        """
+        if expires_at <= time.time() or self.is_revoked(jti):
+            return
+        try:
+            storage.save(RevokedToken(jti=jti, expires_at=expires_at))
+        except IntegrityError:
+            # another worker revoked it since the last refresh
+            pass
+        with self.__lock:
+            self.__revoked.add(jti)
+
+    def purge(self):
+        """
+        Delete the records of the revoked tokens that have expired.
+
+        Returns:
+            int: The number of deleted records.
+        """
+        return storage.delete_by_filter(RevokedToken, RevokedToken.expires_at <= int(time.time()))
+
+
+class ClaimsCache:
+    """
+    LRU cache of verified token claims, kept until the tokens expire.
+    """
+
+    def __init__(self, max_entries=CLAIMS_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Get the header and the claims of a verified token.
+
+        Args:
+            key (str): The hash of the token.
+
+        Returns:
+            tuple: The header and the claims, or None.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            header, claims = entry
+            if claims.get('exp', 0) <= time.time():
+                del self.__entries[key]
+                return None
+            self.__entries.move_to_end(key)
+            return header, claims
+
+    def set(self, key, header, claims):
+        """
+        Remember the header and the claims of a verified token.
+
+        Args:
+            key (str): The hash of the token.
+            header (dict): The header of the token.
+            claims (dict): The claims of the token.
+        """
+        if 'exp' not in claims:
+            return
+        with self.__lock:
+            self.__entries[key] = (header, claims)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+
+    def discard(self, key):
+        with self.__lock:
+            self.__entries.pop(key, None)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+
+revocations = RevocationList()
+claims_cache = ClaimsCache()
+
+
+def configure_revocation(jwt):
+    """
+    Make a JWTManager reject the revoked tokens.
+
+    Args:
+        jwt (JWTManager): The manager of the app.
+    """
+
+    @jwt.token_in_blocklist_loader
+    def token_revoked(jwt_header, jwt_data):
+        return revocations.is_revoked(jwt_data.get('jti'))
+
+
+def _token_key():
+    """
+    Get the cache key of the token sent in the Authorization header, or None
+    when the app reads tokens from elsewhere too.
+    """
+    if list(config.token_location) != ['headers']:
+        return None
+    authorization = request.headers.get(config.header_name)
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization.encode('utf-8')).hexdigest()
+
+
+def verify_request():
+    """
+    Verify the access token of the current request, through the claims cache.
+
+    Raises:
+        NoAuthorizationError, InvalidTokenError, RevokedTokenError: As
+            verify_jwt_in_request does, and handled by the JWTManager.
+    """
+    if request.method in config.exempt_methods:
+        return
+
+    key = _token_key()
+    hit = claims_cache.get(key) if key is not None else None
+    if hit is None:
+        verified = verify_jwt_in_request()
+        if key is not None and verified is not None:
+            claims_cache.set(key, *verified)
+        return
+
+    header, claims = hit
+    if revocations.is_revoked(claims.get('jti')):
+        raise RevokedTokenError(header, claims)
+
+    # the request state verify_jwt_in_request leaves for get_jwt(); no user
+    # lookup loader is registered, so there is no loaded user
+    g._jwt_extended_jwt_user = None
+    g._jwt_extended_jwt_header = header
+    g._jwt_extended_jwt = claims
+    g._jwt_extended_jwt_location = 'headers'
+
+
+def verify_authorization(authorization):
+    """
+    Verify the Authorization header of a request served outside of the
+    Flask app (see modules/service/v1/asgi.py), through the claims cache.
+    Needs an app context of the app.
+
+    Args:
+        authorization (str): The Authorization header, None if missing.
+
+    Returns:
+        dict: The claims of the access token.
+
+    Raises:
+        NoAuthorizationError, InvalidTokenError, WrongTokenError,
+            RevokedTokenError: If the token is missing, invalid, not an
+            access token or revoked.
+    """
+    prefix = f"{config.header_type} "
+    if not authorization or not authorization.startswith(prefix):
+        raise NoAuthorizationError(f"Missing {config.header_name} Header")
+
+    key = hashlib.sha256(authorization.encode('utf-8')).hexdigest()
+    hit = claims_cache.get(key)
+    if hit is None:
+        token = authorization[len(prefix):]
+        claims = decode_token(token)
+        if claims.get('type') != 'access':
+            raise WrongTokenError("Only non-refresh tokens are allowed")
+        hit = (get_unverified_jwt_headers(token), claims)
+        claims_cache.set(key, *hit)
+
+    header, claims = hit
+    if revocations.is_revoked(claims.get('jti')):
+        raise RevokedTokenError(header, claims)
+    return claims
+
+
+def revoke_current_token():
+    """
+    Revoke the access token of the current, verified, request.
+    """
+    claims = get_jwt()
+    revocations.revoke(claims['jti'], claims['exp'])
+    key = _token_key()
+    if key is not None:
+        claims_cache.discard(key)
+
+
+def revoke_token(encoded_token):
+    """
+    Revoke an encoded access token.
+
+    Args:
+        encoded_token (str): The token, with or without the "Bearer " prefix.
+
+    Raises:
+        InvalidTokenError, ExpiredSignatureError: If the token cannot be decoded.
+    """
+    if encoded_token.startswith('Bearer '):
+        encoded_token = encoded_token[len('Bearer '):]
+    claims = decode_token(encoded_token, allow_expired=True)
+    revocations.revoke(claims['jti'], claims['exp'])
@@ -0,0 +1,10 @@
+#!/usr/bin/python3
+"""
+WSGI entry point of the service v1 app.
+
+Usage:
+    gunicorn modules.service.v1.wsgi:app
+"""
+from modules.service.v1.app import create_app
+
+app = create_app()
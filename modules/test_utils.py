@@ -22,14 +22,15 @@ def create_staff_member():
     """Create a staff member and associated parent."""
     first_name = faker.first_name()
     last_name = faker.last_name()
-    email = faker.email()
+    email = faker.unique.email()
     user = User(first_name=first_name, last_name=last_name, email=email, password="StrongPassword!1234",
                 is_staff=True, is_active=True, gender=random.choice(['male', 'female']))
-    user.save()
-    staff = Staff(id=user.id)
-    staff.save()
-    parent = Parent(parent_id=user.id)
-    parent.save()
+    with storage.transaction():
+        user.save()
+        staff = Staff(id=user.id)
+        staff.save()
+        parent = Parent(parent_id=user.id)
+        parent.save()
     return staff, parent
 
 
@@ -94,19 +95,22 @@ def create_class(name, staff_id, students, assist_clss_teacher_id):
 def create_students(parent_id, range_=50):
     """Create a specified number of students associated with a parent."""
     students = []
-    for _ in range(range_):
-        student = Student(first_name=faker.first_name(), last_name=faker.last_name(),
-                          dob=faker.date_between(start_date='-25y', end_date='-25y'),
-                          parent_id=parent_id, expected_graduation=faker.date_time(),
-                          gender=random.choice(["Male", "Female"]), admission_date=datetime.now())
-        student.save()
-        storage.save()
-        students.append(student)
+    with storage.transaction():
+        for _ in range(range_):
+            student = Student(first_name=faker.first_name(), last_name=faker.last_name(),
+                              dob=faker.date_between(start_date='-25y', end_date='-25y'),
+                              parent_id=parent_id, expected_graduation=faker.date_time(),
+                              gender=random.choice(["Male", "Female"]), admission_date=datetime.now())
+            student.save()
+            students.append(student)
     return students
 
 
 def populate_db(range_=50):
-    """Populate the database with staff, parents, students, classes, courses, grades, and attendance records."""
+    """Populate the database with staff, parents, students, classes, courses, grades, and attendance records.
+
+    Returns the ID of the first class.
+    """
     parents = []
     teachers = []
     for _ in range(range_):
@@ -134,9 +138,12 @@ def populate_db(range_=50):
                                 random.choice(courses))
         grades.append(grade_id)
 
-    for student in students:
-        for _ in range(range_):
-            create_attendance(student.id, random.choice([class_.id for class_ in classes]))
+    with storage.transaction():
+        for student in students:
+            for _ in range(range_):
+                create_attendance(student.id, random.choice([class_.id for class_ in classes]))
+
+    return classes[0].id
 
 
 
@@ -15,7 +15,9 @@ Classes:
 import validate_email
 
 from models import storage, User, Staff, Parent
-from models.user import _hash_password, validate_password
+from models.engine.pagination import paginate
+from models.passwords import hash_password, needs_rehash, run_in_pool, verify_password
+from models.user import validate_password
 
 
 class UserManagement:
@@ -222,6 +224,24 @@ class UserManagement:
 
         return user, "User retrieved successfully"
 
+    def get_users_by_ids(self, user_ids):
+        """
+        Retrieve several users by ID with a single query.
+
+        Args:
+            user_ids (iterable): The IDs of the users to retrieve.
+
+        Returns:
+            tuple: A tuple containing a dict of the users keyed by ID and a message.
+        """
+        user_ids = list(set(user_ids))
+        if not user_ids:
+            return {}, "Users retrieved successfully"
+
+        users = storage.query(User).filter(User.id.in_(user_ids)).all()
+
+        return {user.id: user for user in users}, "Users retrieved successfully"
+
     def get_staff_role(self, user_id):
         """
         Retrieve the role of a staff user by ID.
@@ -298,8 +318,10 @@ class UserManagement:
         if not validate_password(new_password):
             return False, "New password must be at least 8 characters long and meet complexity requirements"
 
-        user.password = _hash_password(new_password)
-        storage.save()
+        password_hash = run_in_pool(hash_password, new_password)
+        with storage.transaction():
+            user.password = password_hash
+            storage.save(user)
         return True, "Password changed successfully"
 
     def search_users(self, query):
@@ -422,6 +444,24 @@ class UserManagement:
 
         return users, "All users retrieved successfully"
 
+    def get_users_paginated(self, cursor=None, page_size=10):
+        """
+        Get one page of users with keyset pagination on (created_at, id).
+
+        Args:
+            cursor (str, optional): The cursor returned with the previous page.
+            page_size (int): The number of users per page (default is 10).
+
+        Returns:
+            tuple: A tuple containing the users of the page, the cursor of the next page
+            (None on the last page) and a message.
+        """
+        try:
+            users, next_cursor = paginate(storage.query(User), User, cursor=cursor, page_size=page_size)
+            return users, next_cursor, "All users retrieved successfully"
+        except Exception as e:
+            return None, None, f"Unable to retrieve users: {e}"
+
     def get_all_staff(self):
         """
         Get all staff users in the database
@@ -450,6 +490,42 @@ class UserManagement:
         except Exception as e:
             return None, f"Unable to retrieve parents: {e}"
 
+    def get_staff_paginated(self, cursor=None, page_size=10):
+        """
+        Get one page of staff users with keyset pagination on (created_at, id).
+
+        Args:
+            cursor (str, optional): The cursor returned with the previous page.
+            page_size (int): The number of staff users per page (default is 10).
+
+        Returns:
+            tuple: A tuple containing the staff users of the page, the cursor of the next page
+            (None on the last page) and a message.
+        """
+        try:
+            staffs, next_cursor = paginate(storage.query(Staff), Staff, cursor=cursor, page_size=page_size)
+            return staffs, next_cursor, "All staff users retrieved successfully"
+        except Exception as e:
+            return None, None, f"Unable to retrieve staffs: {e}"
+
+    def get_parents_paginated(self, cursor=None, page_size=10):
+        """
+        Get one page of parent users with keyset pagination on (created_at, id).
+
+        Args:
+            cursor (str, optional): The cursor returned with the previous page.
+            page_size (int): The number of parent users per page (default is 10).
+
+        Returns:
+            tuple: A tuple containing the parent users of the page, the cursor of the next page
+            (None on the last page) and a message.
+        """
+        try:
+            parents, next_cursor = paginate(storage.query(Parent), Parent, cursor=cursor, page_size=page_size)
+            return parents, next_cursor, "All parent users retrieved successfully"
+        except Exception as e:
+            return None, None, f"Unable to retrieve parents: {e}"
+
     def login(self, email, password, role="admin"):
         """
         logins in a user
@@ -471,9 +547,12 @@ class UserManagement:
         #     if not staff:
         #         raise ValueError(f"Staff with id '{user.id}' not found")
 
-        hashed_password = _hash_password(password)
-
-        if user.password != hashed_password:
+        if not run_in_pool(verify_password, password, user.password):
             raise ValueError("Password does not match")
 
+        if needs_rehash(user.password):
+            # legacy MD5 hashes and outdated bcrypt costs are upgraded on login
+            user.password = run_in_pool(hash_password, password)
+            storage.save(user)
+
         return user, "User verified"
@@ -0,0 +1,4 @@
+import os
+
+# keep bcrypt cheap in the test suite, production cost comes from the environment
+os.environ.setdefault("SMS_BCRYPT_ROUNDS", "4")
@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+import asyncio
+import os
+import tempfile
+import unittest
+
+from models.engine.async_dbstorage import AsyncDBStorage, async_url
+from models.engine.dbstorage import DBStorage
+from models.revoked_token import RevokedToken
+
+
+class TestAsyncDBStorage(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.db_file = tempfile.NamedTemporaryFile(suffix=".db", delete=False).name
+        self.storage = DBStorage(url=f"sqlite:///{self.db_file}")
+        self.storage.create_schema()
+        self.tokens = [RevokedToken(f"jti-{i}", i) for i in range(3)]
+        self.storage.bulk_save(self.tokens)
+        self.async_storage = AsyncDBStorage(url=f"sqlite:///{self.db_file}")
+
+    def test_async_url(self):
+        self.assertEqual(async_url("mysql+mysqldb://u:p@host/sms").drivername, "mysql+aiomysql")
+        self.assertEqual(async_url("sqlite:///sms.db").drivername, "sqlite+aiosqlite")
+        with self.assertRaises(ValueError):
+            async_url("postgresql://host/sms")
+
+    async def test_reads_the_records_written_by_the_storage(self):
+        token = await self.async_storage.get_by_id(RevokedToken, self.tokens[1].id)
+        self.assertEqual(token.jti, "jti-1")
+        self.assertIsNone(await self.async_storage.get_by_id(RevokedToken, "missing"))
+
+        tokens = await self.async_storage.select(RevokedToken, filters=[RevokedToken.expires_at > 0],
+                                                 order_by=[RevokedToken.expires_at.desc()])
+        self.assertEqual([token.jti for token in tokens], ["jti-2", "jti-1"])
+
+        rows = await self.async_storage.rows(RevokedToken, columns=["jti"], order_by=[RevokedToken.jti])
+        self.assertEqual([row.jti for row in rows], ["jti-0", "jti-1", "jti-2"])
+        self.assertEqual((await self.async_storage.version(RevokedToken))[1], 3)
+
+    async def test_concurrent_reads(self):
+        tokens = await asyncio.gather(*(self.async_storage.get_by_id(RevokedToken, token.id)
+                                        for token in self.tokens * 10))
+
+        self.assertEqual([token.jti for token in tokens], [token.jti for token in self.tokens] * 10)
+
+    async def test_memory_database(self):
+        storage = AsyncDBStorage(url="sqlite://")
+        await storage.create_schema()
+
+        self.assertEqual(await storage.select(RevokedToken), [])
+        await storage.dispose()
+
+    async def asyncTearDown(self):
+        await self.async_storage.dispose()
+
+    def tearDown(self):
+        self.storage.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.db_file + suffix):
+                os.remove(self.db_file + suffix)
+
+
+if __name__ == '__main__':
+    unittest.main()
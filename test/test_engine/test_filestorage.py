@@ -1,9 +1,16 @@
 #!/usr/bin/python3
 import os
 import unittest
+from datetime import date, datetime
 
-from models import BaseModel
-from models.engine.filestorage import FileStorage
+from sqlalchemy import inspect
+
+from models import (Announcement, Attendance, BaseModel, Class, ClassCourseAssociation, Course, Grade,
+                    Parent, Permission, RevokedToken, SigningKey, Staff, Student, StudentClassAssociation)
+from models.engine.filestorage import FileStorage, _dump, classes
+from models.feedback import Feedback
+from models.qualification import Qualification
+from models.engine.pagination import paginate
 from models.user import User
 
 
@@ -20,7 +27,7 @@ class TestFileStorage(unittest.TestCase):
     def test_save_and_reload(self):
         # Create a user object
         user = User(first_name="John", last_name="Doe",
-                    email="john@example.com", password="password")
+                    email="john@example.com", password="password", gender="male")
         # Add user to storage
         self.storage.new(user)
         # Save storage to file
@@ -40,7 +47,7 @@ class TestFileStorage(unittest.TestCase):
 
         user = User(first_name="Jane", last_name="Doe",
                     email="john@example.com",
-                    password="password")
+                    password="password", gender="female")
         self.storage.new(user)
         self.storage.save()
 
@@ -59,8 +66,234 @@ class TestFileStorage(unittest.TestCase):
 
         self.assertEqual(len(self.storage.all()), 2)
 
+    def test_new_is_journaled(self):
+        self.storage.close()
+        self.storage.reload()
+        journal = self.storage._FileStorage__journal
+        self.assertEqual(os.path.getsize(journal), 0)
+
+        bases = [BaseModel() for _ in range(3)]
+        for base in bases:
+            self.storage.new(base)
+        self.storage.delete(bases[0])
+
+        with open(journal) as file:
+            self.assertEqual(len(file.readlines()), 4)
+
+        self.storage.close()
+        self.storage.reload()
+
+        self.assertNotIn("BaseModel." + bases[0].id, self.storage.all())
+        self.assertIn("BaseModel." + bases[1].id, self.storage.all())
+        self.assertIn("BaseModel." + bases[2].id, self.storage.all())
+
+    def test_torn_journal_entry_is_cut_off(self):
+        journal = self.storage._FileStorage__journal
+        kept = BaseModel()
+        self.storage.new(kept)
+        with open(journal, "a") as file:
+            file.write('{"op": "new", "key": "BaseModel.torn", "obj": {"id"')
+
+        self.storage.close()
+        self.storage.reload()
+        self.assertIn("BaseModel." + kept.id, self.storage.all())
+
+        later = BaseModel()
+        self.storage.new(later)
+        self.storage.close()
+        self.storage.reload()
+
+        self.assertIn("BaseModel." + kept.id, self.storage.all())
+        self.assertIn("BaseModel." + later.id, self.storage.all())
+        self.assertNotIn("BaseModel.torn", self.storage.all())
+
+    def test_corrupt_journal_entry_is_an_error(self):
+        journal = self.storage._FileStorage__journal
+        self.storage.new(BaseModel())
+        with open(journal, "a") as file:
+            file.write('{"op": "new", "key": "BaseModel.corrupt"\n')
+        self.storage.new(BaseModel())
+        size = os.path.getsize(journal)
+
+        self.storage.close()
+        with self.assertRaisesRegex(ValueError, "Corrupt entry on line 2"):
+            self.storage.reload()
+        self.assertEqual(os.path.getsize(journal), size)
+
+    def test_every_model_round_trips(self):
+        user = User(first_name="Ama", last_name="Mensah", email="ama@example.com", password=None,
+                    password_hash="hash", gender="female", dob=date(1990, 5, 1),
+                    last_login_date=date(2024, 1, 8))
+        objs = [
+            user,
+            Staff(id=user.id, department="Science"),
+            Parent(parent_id=user.id, occupation="Trader"),
+            Student(first_name="Kofi", last_name="Mensah", gender="male", parent_id=user.id,
+                    expected_graduation=date(2026, 7, 1), admission_date=date(2023, 9, 1), dob=date(2012, 3, 4)),
+            Class(class_name="B7", head_class_teacher=user.id, academic_year="2023/24"),
+            Course(course_name="Science", course_description="Integrated Science", teacher_id=user.id,
+                   department="Science"),
+            Attendance(class_id="c1", student_id="s1", term="Term 1", status=1, academic_year="2023/24",
+                       date=datetime(2024, 1, 8, 9, 30)),
+            Grade(grade=7, grade_desc="Exam", term="Term 1", academic_year="2023/24", course_id="co1",
+                  class_id="c1", student_id="s1"),
+            Announcement(content="No school on Friday", staff_id=user.id, target="all",
+                         date=datetime(2024, 1, 5, 8, 0)),
+            Feedback(content="Thanks", user_id=user.id),
+            Permission(permission_name="grades:write", assigned_user_id=user.id, access_level=2),
+            Qualification(name="BEd", staff_id=user.id, desc="Bachelor of Education"),
+            RevokedToken("jti", 1700000000),
+            SigningKey("kid", "public", "private"),
+            StudentClassAssociation(student_id="s1", class_id="c1"),
+            ClassCourseAssociation(class_id="c1", course_id="co1", description="core"),
+        ]
+        self.assertEqual({obj.__class__ for obj in objs} | {BaseModel}, set(classes.values()))
+        self.storage.bulk_save(objs)
+        self.storage.save()
+        self.storage.bulk_save([Parent(id="journaled-parent")])
+
+        self.storage.close()
+        self.storage.reload()
+
+        self.assertIn("Parent.journaled-parent", self.storage.all())
+        for obj in objs:
+            key = f"{obj.__class__.__name__}.{getattr(obj, 'id', None) or 'c1.co1'}"
+            loaded = self.storage.all()[key]
+            self.assertEqual(_dump(loaded), _dump(obj), key)
+            for column in inspect(obj.__class__).column_attrs:
+                self.assertEqual(type(getattr(loaded, column.key)), type(getattr(obj, column.key)),
+                                 f"{key}.{column.key}")
+
+    def test_save_compacts_journal(self):
+        base = BaseModel()
+        self.storage.save(base)
+        journal = self.storage._FileStorage__journal
+        self.assertGreater(os.path.getsize(journal), 0)
+
+        self.storage.save()
+
+        self.assertEqual(os.path.getsize(journal), 0)
+        self.storage.close()
+        self.storage.reload()
+        self.assertIn("BaseModel." + base.id, self.storage.all())
+
+    def test_all_by_class(self):
+        attendance = Attendance(class_id="class-1", student_id="student-1",
+                                term="Term 1", status=1, academic_year="2023/24")
+        self.storage.new(attendance)
+
+        self.assertEqual(list(self.storage.all(Attendance)), ["Attendance." + attendance.id])
+        self.assertEqual(list(self.storage.all(BaseModel)), ["BaseModel." + self.base.id])
+        self.assertIs(self.storage.get_by_id(Attendance, attendance.id), attendance)
+
+    def test_query_uses_indexes(self):
+        attendances = [Attendance(class_id=f"class-{i % 2}", student_id=f"student-{i % 3}",
+                                  term="Term 1", status=i % 2, academic_year="2023/24")
+                       for i in range(12)]
+        for attendance in attendances:
+            self.storage.new(attendance)
+
+        self.assertEqual(len(self.storage.lookup(Attendance, "class_id", "class-0")), 6)
+        self.assertIsNone(self.storage.lookup(Attendance, "term", "Term 1"))
+
+        query = self.storage.query(Attendance).filter(Attendance.class_id == "class-0",
+                                                      Attendance.student_id == "student-0")
+        self.assertEqual(query.count(), 2)
+        self.assertEqual(self.storage.get_by_filter(Attendance, Attendance.status == 1).count(), 6)
+
+        moved = attendances[0]
+        moved.class_id = "class-9"
+        self.storage.new(moved)
+        self.assertEqual(self.storage.query(Attendance).filter_by(class_id="class-9").all(), [moved])
+        self.assertEqual(len(self.storage.lookup(Attendance, "class_id", "class-0")), 5)
+
+        self.storage.delete(moved)
+        self.assertEqual(self.storage.query(Attendance).filter_by(class_id="class-9").count(), 0)
+
+    def test_save_reindexes_updated_objects(self):
+        first = Attendance(class_id="c1", student_id="s1", term="Term 1", status=1, academic_year="2023/24")
+        second = Attendance(class_id="c1", student_id="s2", term="Term 1", status=1, academic_year="2023/24")
+        self.storage.bulk_save([first, second])
+
+        first.update(class_id="c2")
+        self.storage.save()
+        self.assertEqual(self.storage.query(Attendance).filter_by(class_id="c1").all(), [second])
+        self.assertEqual(self.storage.query(Attendance).filter_by(class_id="c2").all(), [first])
+
+        second.update(class_id="c2", student_id="s3")
+        self.storage.save(second)
+        self.assertEqual(self.storage.lookup(Attendance, "class_id", "c1"), [])
+        self.assertEqual(self.storage.query(Attendance).filter_by(class_id="c2").count(), 2)
+        self.assertEqual(self.storage.lookup(Attendance, "student_id", "s3"), [second])
+
+    def test_bulk_save(self):
+        journal = self.storage._FileStorage__journal
+        open(journal, "w").close()
+        attendances = [Attendance(class_id="class-1", student_id=f"student-{i}",
+                                  term="Term 1", status=1, academic_year="2023/24")
+                       for i in range(40)]
+        self.storage.bulk_save(attendances)
+
+        self.assertEqual(len(self.storage.all(Attendance)), 40)
+        with open(journal) as file:
+            self.assertEqual(len(file.readlines()), 40)
+
+    def test_transaction(self):
+        journal = self.storage._FileStorage__journal
+        open(journal, "w").close()
+
+        with self.storage.transaction():
+            kept = BaseModel()
+            self.storage.new(kept)
+            self.storage.save()
+            self.assertEqual(os.path.getsize(journal), 0)
+        self.assertGreater(os.path.getsize(journal), 0)
+
+        with self.assertRaises(ValueError):
+            with self.storage.transaction():
+                dropped = BaseModel()
+                self.storage.new(dropped)
+                raise ValueError("rollback")
+
+        self.assertIn("BaseModel." + kept.id, self.storage.all())
+        self.assertNotIn("BaseModel." + dropped.id, self.storage.all())
+
+    def test_paginate(self):
+        users = [User(first_name="John", last_name="Doe", email=f"john{i}@example.com",
+                      password="password", gender="male") for i in range(5)]
+        self.storage.bulk_save(users)
+
+        pages, cursor = [], None
+        while True:
+            page, cursor = paginate(self.storage.query(User), User, cursor=cursor, page_size=2)
+            pages.append([user.id for user in page])
+            if cursor is None:
+                break
+
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        expected = sorted(users, key=lambda user: (user.created_at, user.id))
+        self.assertEqual(sum(pages, []), [user.id for user in expected])
+
+        with self.assertRaises(ValueError):
+            paginate(self.storage.query(User), User, cursor="not-a-cursor")
+
+    def test_rows(self):
+        # 1 marks a student present and 0 absent
+        present = Attendance(student_id="s1", class_id="c1", term="Term 1", status=1, academic_year="2023/24")
+        absent = Attendance(student_id="s2", class_id="c1", term="Term 1", status=0, academic_year="2023/24")
+        self.storage.bulk_save([present, absent])
+
+        rows = self.storage.rows(Attendance, columns=("id", "status"),
+                                 filters=[Attendance.status == 0])
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0].id, absent.id)
+        self.assertEqual(rows[0]._asdict(), {"id": absent.id, "status": 0})
+
     def tearDown(self):
         os.remove(self.storage._FileStorage__storage)
+        if os.path.exists(self.storage._FileStorage__journal):
+            os.remove(self.storage._FileStorage__journal)
+        self.storage.close()
 
 
 if __name__ == '__main__':
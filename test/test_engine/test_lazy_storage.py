@@ -0,0 +1,46 @@
+#!/usr/bin/python3
+import unittest
+
+from models.engine.lazy_storage import LazyStorage
+
+
+class FakeStorage:
+    def __init__(self):
+        self.reloads = 0
+
+    def reload(self):
+        self.reloads += 1
+
+    def all(self, cls=None):
+        return {}
+
+
+class TestLazyStorage(unittest.TestCase):
+    def setUp(self):
+        self.created = []
+
+        def factory():
+            self.created.append(FakeStorage())
+            return self.created[-1]
+
+        self.storage = LazyStorage(factory)
+
+    def test_created_on_first_use(self):
+        self.assertFalse(self.storage.initialized)
+        self.assertEqual(self.created, [])
+
+        self.assertEqual(self.storage.all(), {})
+        self.assertEqual(self.storage.all(), {})
+
+        self.assertTrue(self.storage.initialized)
+        self.assertEqual(len(self.created), 1)
+        self.assertEqual(self.created[0].reloads, 1)
+
+    def test_after_fork_does_not_create(self):
+        self.storage.after_fork()
+
+        self.assertFalse(self.storage.initialized)
+
+
+if __name__ == '__main__':
+    unittest.main()
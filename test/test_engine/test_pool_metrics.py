@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import create_engine, exc, text
+
+from models.engine.pool_metrics import InstrumentedQueuePool
+from modules.service.v1.metrics import render_pool_metrics
+
+
+class TestPoolMetrics(unittest.TestCase):
+    def setUp(self):
+        self.db_file = tempfile.NamedTemporaryFile(suffix=".db", delete=False).name
+        self.engine = create_engine(f"sqlite:///{self.db_file}", poolclass=InstrumentedQueuePool,
+                                    pool_size=1, max_overflow=0, pool_timeout=0.05)
+        self.pool = self.engine.pool
+        self.pool.metrics.listen(self.pool)
+
+    def test_counts_checkouts_and_timeouts(self):
+        with self.engine.connect() as conn:
+            conn.execute(text("select 1"))
+            with self.assertRaises(exc.TimeoutError):
+                self.engine.connect()
+            status = self.pool.metrics.snapshot(self.pool)
+            self.assertEqual(status["checked_out"], 1)
+
+        status = self.pool.metrics.snapshot(self.pool)
+        self.assertEqual(status["connects"], 1)
+        self.assertEqual(status["checkouts"], 1)
+        self.assertEqual(status["checkins"], 1)
+        self.assertEqual(status["timeouts"], 1)
+        self.assertEqual(status["wait_count"], 2)
+        self.assertEqual(status["wait_buckets"][-1], (float("inf"), 2))
+
+    def test_metrics_survive_dispose(self):
+        metrics = self.pool.metrics
+        self.engine.dispose()
+
+        self.assertIs(self.engine.pool.metrics, metrics)
+
+    def test_render(self):
+        with self.engine.connect():
+            pass
+        status = self.pool.metrics.snapshot(self.pool)
+        body = render_pool_metrics({"primary": status, "replica0": dict(status, checkouts=0)}, 42)
+
+        self.assertIn('sms_db_pool_checkouts_total{pid="42",bind="primary"} 1', body)
+        self.assertIn('sms_db_pool_checkouts_total{pid="42",bind="replica0"} 0', body)
+        self.assertIn('sms_db_pool_wait_seconds_bucket{pid="42",bind="primary",le="+Inf"} 1', body)
+        self.assertEqual(body.count("# TYPE sms_db_pool_checkouts_total counter"), 1)
+
+    def tearDown(self):
+        self.engine.dispose()
+        os.remove(self.db_file)
+
+
+if __name__ == '__main__':
+    unittest.main()
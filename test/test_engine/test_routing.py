@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import create_engine
+
+from models.basemodel import Base
+from models.engine.dbstorage import DBStorage
+from models.revoked_token import RevokedToken
+
+
+class TestReplicaRouting(unittest.TestCase):
+    def setUp(self):
+        self.files = [tempfile.NamedTemporaryFile(suffix=".db", delete=False).name for _ in range(3)]
+        for db_file in self.files:
+            engine = create_engine(f"sqlite:///{db_file}")
+            Base.metadata.create_all(engine)
+            engine.dispose()
+        primary, *replicas = [f"sqlite:///{db_file}" for db_file in self.files]
+        self.storage = DBStorage(url=primary, replica_urls=replicas)
+
+    def add_token(self, url, jti):
+        # write a row to one database directly, as replication would
+        engine = create_engine(url)
+        with engine.begin() as conn:
+            conn.execute(RevokedToken.__table__.insert(), {"id": jti, "jti": jti, "expires_at": 0})
+        engine.dispose()
+
+    def jtis(self):
+        return {token.jti for token in self.storage.query(RevokedToken).all()}
+
+    def test_reads_go_round_robin_to_the_replicas(self):
+        self.add_token(f"sqlite:///{self.files[1]}", "first")
+        self.add_token(f"sqlite:///{self.files[2]}", "second")
+
+        seen = []
+        for _ in range(2):
+            seen.append(self.jtis())
+            self.storage.close()
+
+        self.assertCountEqual(seen, [{"first"}, {"second"}])
+
+    def test_reads_after_a_write_go_to_the_primary(self):
+        self.add_token(f"sqlite:///{self.files[1]}", "replica")
+        self.add_token(f"sqlite:///{self.files[2]}", "replica")
+        self.assertEqual(self.jtis(), {"replica"})
+
+        self.storage.new(RevokedToken("primary", 0))
+        self.storage.save()
+
+        self.assertEqual(self.jtis(), {"primary"})
+        self.assertEqual(len(self.storage.all(RevokedToken)), 1)
+
+    def test_use_primary(self):
+        self.storage.use_primary()
+
+        self.assertEqual(self.jtis(), set())
+
+    def test_pool_status_of_every_bind(self):
+        self.add_token(f"sqlite:///{self.files[1]}", "first")
+        self.jtis()
+        self.storage.close()
+
+        statuses = self.storage.pool_statuses()
+
+        self.assertEqual(list(statuses), ["primary", "replica0", "replica1"])
+        self.assertEqual([status["checkouts"] for status in statuses.values()], [0, 1, 0])
+
+    def tearDown(self):
+        self.storage.close()
+        for db_file in self.files:
+            os.remove(db_file)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/python3
+import os
+import tempfile
+import threading
+import unittest
+
+from sqlalchemy.exc import IntegrityError
+
+from models.engine.dbstorage import DBStorage
+from models.revoked_token import RevokedToken
+from models.user import User
+
+
+class TestSQLiteStorage(unittest.TestCase):
+    def test_memory_database_has_its_schema(self):
+        storage = DBStorage(url="sqlite://")
+        storage.new(RevokedToken("memory", 0))
+
+        self.assertEqual(len(storage.all(RevokedToken)), 1)
+        storage.close()
+
+    def test_memory_database_is_shared_by_the_threads(self):
+        storage = DBStorage(url="sqlite:///:memory:")
+        storage.new(RevokedToken("shared", 0))
+        storage.close()
+
+        seen = []
+
+        def read():
+            seen.append(len(storage.all(RevokedToken)))
+            storage.close()
+
+        thread = threading.Thread(target=read)
+        thread.start()
+        thread.join()
+        self.assertEqual(seen, [1])
+
+    def test_memory_database_isolates_the_threads(self):
+        storage = DBStorage(url="sqlite://")
+        saved = threading.Event()
+
+        def save():
+            storage.new(RevokedToken("committed", 0))
+            storage.close()
+            saved.set()
+
+        with self.assertRaises(RuntimeError):
+            with storage.transaction():
+                storage.new(RevokedToken("rolled-back", 0))
+                thread = threading.Thread(target=save)
+                thread.start()
+                # the writer waits for this transaction to end
+                self.assertFalse(saved.wait(0.2))
+                raise RuntimeError("abort")
+        thread.join()
+
+        self.assertEqual([token.jti for token in storage.all(RevokedToken).values()], ["committed"])
+        storage.close()
+
+    def test_failed_commit_is_rolled_back(self):
+        storage = DBStorage(url="sqlite://")
+        storage.new(RevokedToken("duplicate", 0))
+        with self.assertRaises(IntegrityError):
+            storage.new(RevokedToken("duplicate", 0))
+
+        storage.new(RevokedToken("next", 0))
+        self.assertEqual(len(storage.all(RevokedToken)), 2)
+        storage.close()
+
+    def test_failed_transaction_rolls_every_step_back(self):
+        storage = DBStorage(url="sqlite://")
+        storage.new(RevokedToken("kept", 0))
+
+        with self.assertRaises(IntegrityError):
+            with storage.transaction():
+                storage.new(RevokedToken("added", 0))
+                storage.delete_by_filter(RevokedToken, RevokedToken.jti == "kept")
+                storage.bulk_save([RevokedToken("bulk", 0)])
+                with storage.transaction():
+                    storage.save(RevokedToken("nested", 0))
+                storage.new(RevokedToken("added", 0))
+
+        self.assertEqual([token.jti for token in storage.all(RevokedToken).values()], ["kept"])
+        storage.close()
+
+    def test_file_database_uses_wal_and_foreign_keys(self):
+        db_file = tempfile.NamedTemporaryFile(suffix=".db", delete=False).name
+        try:
+            storage = DBStorage(url=f"sqlite:///{db_file}")
+            storage.create_schema()
+            with storage.query(User).session.connection() as conn:
+                pragmas = [conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+                           for name in ("journal_mode", "foreign_keys")]
+            self.assertEqual(pragmas, ["wal", 1])
+            self.assertEqual(storage.pool_status()["connects"], 1)
+            storage.close()
+        finally:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(db_file + suffix):
+                    os.remove(db_file + suffix)
+
+
+if __name__ == '__main__':
+    unittest.main()
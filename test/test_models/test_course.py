@@ -17,7 +17,8 @@ class TestCourseModel(unittest.TestCase):
         self.course = Course(
             course_name="Mathematics",
             course_description="Introduction to Algebra",
-            teacher_id="12345"
+            teacher_id="12345",
+            department="Mathematics"
         )
         self.session.add(self.course)
         self.session.commit()
@@ -22,7 +22,7 @@ class TestGradebookModel(unittest.TestCase):
 
         # Create sample data for testing
         self.course = Course(course_name="Mathematics", course_description="Introduction to Algebra",
-                             teacher_id="12345")
+                             teacher_id="12345", department="Mathematics")
         self.class_ = Class(class_name="B7B", head_class_teacher="1245", academic_year="2023/24")
         self.student = Student(first_name="John",
                                last_name="Doe",
@@ -31,11 +31,11 @@ class TestGradebookModel(unittest.TestCase):
                                admission_date=datetime.today(),
                                gender="Male",
                                expected_graduation=datetime(2025, 1, 5))
-        self.gradebook_entry = Grade(grade=85, grade_desc="Homework", term="Term 1", course_id=self.course.id,
+        self.gradebook_entry = Grade(grade=85, out_of=100, grade_desc="Homework", term="Term 1", course_id=self.course.id,
                                      class_id=self.class_.id,
                                      student_id=self.student.id,
                                      academic_year="2023/24")
-        gradebook_entry2 = Grade(grade=86, grade_desc="Classwork", term="Term 2", course_id=self.course.id,
+        gradebook_entry2 = Grade(grade=86, out_of=100, grade_desc="Classwork", term="Term 2", course_id=self.course.id,
                                  class_id=self.class_.id,
                                  student_id=self.student.id, academic_year="2023/24")
 
@@ -0,0 +1,151 @@
+#!/usr/bin/python3
+import unittest
+from datetime import date, datetime
+
+from sqlalchemy import inspect
+
+from models import (Announcement, Attendance, BaseModel, Class, ClassCourseAssociation, Course, Grade,
+                    Parent, Permission, RevokedToken, SigningKey, Staff, Student, StudentClassAssociation)
+from models.engine.filestorage import classes
+from models.feedback import Feedback
+from models.qualification import Qualification
+from models.serializer import column_keys, row_serializer, serializer
+from models.user import User
+
+
+def to_dict(obj):
+    """
+    The reference serialization of a model instance: every column read
+    through its attribute, created_at and updated_at as
+    "%Y-%m-%d %H:%M:%S", the other dates in ISO 8601, and the loaded
+    many-to-one references.
+    """
+    mapper = inspect(obj.__class__)
+    obj_s = {}
+    for attr in mapper.column_attrs:
+        value = getattr(obj, attr.key)
+        if attr.key in ("created_at", "updated_at") and isinstance(value, datetime):
+            value = value.strftime("%Y-%m-%d %H:%M:%S")
+        elif isinstance(value, date):
+            value = value.isoformat()
+        obj_s[attr.key] = value
+    for rel in mapper.relationships:
+        if not rel.uselist and rel.key in obj.__dict__:
+            related = obj.__dict__[rel.key]
+            obj_s[rel.key] = to_dict(related) if related is not None else None
+    obj_s["__class__"] = obj.__class__.__name__
+    return obj_s
+
+
+def every_model():
+    """
+    Get an instance of every mapped model.
+    """
+    user = User(first_name="Ama", last_name="Mensah", email="ama@example.com", password=None,
+                password_hash="hash", gender="female", dob=date(1990, 5, 1),
+                last_login_date=date(2024, 1, 8))
+    return [
+        user,
+        Staff(id=user.id, department="Science"),
+        Parent(parent_id=user.id, occupation="Trader"),
+        Student(first_name="Kofi", last_name="Mensah", gender="male", parent_id=user.id,
+                expected_graduation=date(2026, 7, 1), admission_date=date(2023, 9, 1), dob=date(2012, 3, 4)),
+        Class(class_name="B7", head_class_teacher=user.id, academic_year="2023/24"),
+        Course(course_name="Science", course_description="Integrated Science", teacher_id=user.id,
+               department="Science"),
+        Attendance(class_id="c1", student_id="s1", term="Term 1", status=1, academic_year="2023/24",
+                   date=datetime(2024, 1, 8, 9, 30, 15, 250)),
+        Grade(grade=7, grade_desc="Exam", term="Term 1", academic_year="2023/24", course_id="co1",
+              class_id="c1", student_id="s1"),
+        Announcement(content="No school on Friday", staff_id=user.id, target="all",
+                     date=datetime(2024, 1, 5, 8, 0)),
+        Feedback(content="Thanks", user_id=user.id),
+        Permission(permission_name="grades:write", assigned_user_id=user.id, access_level=2),
+        Qualification(name="BEd", staff_id=user.id, desc="Bachelor of Education"),
+        RevokedToken("jti", 1700000000),
+        SigningKey("kid", "public", "private"),
+        StudentClassAssociation(student_id="s1", class_id="c1"),
+        ClassCourseAssociation(class_id="c1", course_id="co1", description="core"),
+    ]
+
+
+def fill(obj):
+    """
+    Set every column of an instance, so that all of them are in its __dict__.
+    """
+    for key in column_keys(obj.__class__):
+        setattr(obj, key, getattr(obj, key))
+    return obj
+
+
+class TestSerializer(unittest.TestCase):
+    def setUp(self):
+        self.objs = every_model()
+        self.assertEqual({obj.__class__ for obj in self.objs} | {BaseModel}, set(classes.values()))
+
+    def test_serializer_matches_the_reference(self):
+        for obj in map(fill, self.objs):
+            with self.subTest(model=obj.__class__.__name__):
+                self.assertTrue(set(column_keys(obj.__class__)) <= obj.__dict__.keys())
+                self.assertEqual(serializer(obj.__class__)(obj), to_dict(obj))
+
+    def test_missing_columns_are_read_through_their_attribute(self):
+        for obj in map(fill, self.objs):
+            cls = obj.__class__
+            with self.subTest(model=cls.__name__):
+                key = column_keys(cls)[-1]
+                delattr(obj, key)
+                self.assertNotIn(key, obj.__dict__)
+
+                obj_s = serializer(cls)(obj)
+
+                self.assertEqual(obj_s, to_dict(obj))
+                self.assertIsNone(obj_s[key])
+
+    def test_row_serializer_matches_the_reference(self):
+        for obj in map(fill, self.objs):
+            cls = obj.__class__
+            with self.subTest(model=cls.__name__):
+                row = tuple(getattr(obj, key) for key in column_keys(cls))
+                self.assertEqual(row_serializer(cls)(row), to_dict(obj))
+
+                fields = ("id", "created_at", "__class__")
+                row = tuple(getattr(obj, key) for key in column_keys(cls, fields))
+                expected = {key: value for key, value in to_dict(obj).items() if key in fields}
+                self.assertEqual(row_serializer(cls, fields)(row), expected)
+                self.assertEqual(serializer(cls, fields)(obj), expected)
+
+    def test_dates_formatting(self):
+        attendance = self.objs[6]
+        attendance.created_at = attendance.updated_at = datetime(2024, 1, 8, 9, 30, 15, 250)
+        user = self.objs[0]
+
+        attendance_s, user_s = attendance.serialize(), user.serialize()
+
+        self.assertEqual(attendance_s["created_at"], "2024-01-08 09:30:15")
+        self.assertEqual(attendance_s["updated_at"], "2024-01-08 09:30:15")
+        self.assertEqual(attendance_s["date"], "2024-01-08T09:30:15.000250")
+        self.assertEqual(user_s["dob"], "1990-05-01")
+        self.assertEqual(user_s["last_login_date"], "2024-01-08")
+
+    def test_loaded_reference_is_serialized(self):
+        student = self.objs[3]
+        association = StudentClassAssociation(student=student, class_id="c1")
+
+        obj_s = association.serialize()
+
+        self.assertEqual(obj_s["student"], student.serialize())
+        self.assertEqual(obj_s, to_dict(association))
+        self.assertNotIn("class_", obj_s)
+
+    def test_unmapped_model(self):
+        base = BaseModel()
+        base.created_at = datetime(2024, 1, 8, 9, 30, 15, 250)
+
+        self.assertEqual(base.serialize(), {"id": base.id, "created_at": "2024-01-08 09:30:15",
+                                            "updated_at": base.updated_at.strftime("%Y-%m-%d %H:%M:%S"),
+                                            "__class__": "BaseModel"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -33,8 +33,10 @@ class TestStaffModel(unittest.TestCase):
             status="active"
         )
 
-        self.course1 = Course(course_name="Mathematics", course_description="B8 mathematics", teacher_id=self.staff.id)
-        self.course2 = Course(course_name="Physics", course_description="B7 physics", teacher_id=self.staff.id)
+        self.course1 = Course(course_name="Mathematics", course_description="B8 mathematics", teacher_id=self.staff.id,
+                              department="Mathematics")
+        self.course2 = Course(course_name="Physics", course_description="B7 physics", teacher_id=self.staff.id,
+                              department="Science")
         self.qualification1 = Qualification("Bsc", desc="Mathematics", staff_id=self.staff.id, )
         self.qualification2 = Qualification("Msc", desc="Physics", staff_id=self.staff.id, )
 
@@ -1,6 +1,11 @@
+import threading
 import unittest
 from datetime import datetime
+from hashlib import md5
+from unittest import mock
 
+from models import passwords
+from models.passwords import PasswordPoolBusy, hash_password, needs_rehash, verify_password
 from models.user import User
 
 
@@ -39,6 +44,29 @@ class UserModelTestCase(unittest.TestCase):
 
     def test_password(self):
         self.assertNotEqual(self.user.password, "password")
+        self.assertTrue(verify_password("password", self.user.password))
+        self.assertFalse(verify_password("Password", self.user.password))
+
+    def test_legacy_password(self):
+        legacy = md5(b"password").hexdigest()
+        self.assertTrue(verify_password("password", legacy))
+        self.assertFalse(verify_password("Password", legacy))
+        self.assertTrue(needs_rehash(legacy))
+        self.assertFalse(needs_rehash(hash_password("password")))
+        self.assertTrue(needs_rehash(hash_password("password", rounds=5), rounds=6))
+
+    def test_password_is_hashed_on_the_pool(self):
+        full = threading.BoundedSemaphore(1)
+        full.acquire()
+        with mock.patch.object(passwords, "_slots", full), mock.patch.object(passwords, "QUEUE_TIMEOUT", 0):
+            with self.assertRaises(PasswordPoolBusy):
+                User("first", "last", "busy@test.com", "password", gender="Male")
+            user = User("first", "last", "busy@test.com", None, "Male", password_hash=self.user.password)
+        self.assertEqual(user.password, self.user.password)
+
+    def test_deserialize_keeps_password_hash(self):
+        user = User.deserialize(self.user.serialize())
+        self.assertEqual(user.password, self.user.password)
 
     def test_other_names(self):
         self.assertIsNone(self.user.other_names)
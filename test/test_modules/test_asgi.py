@@ -0,0 +1,101 @@
+#!/usr/bin/python3
+"""
+Tests for the ASGI app of the services
+"""
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+from flask_jwt_extended import create_access_token
+
+import models
+from models import Class
+from modules.class_management.class_management import ClassManagement
+from modules.service.v1.app import create_app
+from modules.service.v1 import metrics
+from modules.service.v1.asgi import ServiceApp
+from modules.test_utils import create_staff_member
+
+
+@unittest.skipIf(models.STORAGE_ENGINE == "file", "the async storage needs a database")
+class TestServiceApp(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        teacher, parent = create_staff_member()
+        self.class_ = Class(class_name="B9A", head_class_teacher=teacher.id, academic_year="2023/24")
+        self.class_.save()
+        self.class_id = self.class_.id
+        self.app = ServiceApp(create_app())
+        with self.app.flask_app.app_context():
+            self.token = create_access_token(identity=teacher.id)
+
+    async def asyncSetUp(self):
+        self.lifespan = asyncio.Queue()
+        self.lifespan_sent = asyncio.Queue()
+        self.lifespan_task = asyncio.create_task(
+            self.app({"type": "lifespan"}, self.lifespan.get, self.lifespan_sent.put))
+        await self.lifespan.put({"type": "lifespan.startup"})
+        self.assertEqual((await self.lifespan_sent.get())["type"], "lifespan.startup.complete")
+
+    async def get(self, path, token=None):
+        headers = [(b"host", b"localhost")]
+        if token is not None:
+            headers.append((b"authorization", f"Bearer {token}".encode()))
+        scope = {"type": "http", "http_version": "1.1", "method": "GET", "scheme": "http",
+                 "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+                 "headers": headers, "server": ("localhost", 80), "client": ("127.0.0.1", 5000)}
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        await self.app(scope, receive, send)
+        body = b"".join(message.get("body", b"") for message in sent[1:])
+        return sent[0]["status"], body
+
+    async def test_class_details_are_served_on_the_loop(self):
+        status, body = await self.get(f"/services/v1/classes/{self.class_id}", self.token)
+
+        self.assertEqual(status, 200)
+        details = ClassManagement().get_class_details(self.class_id)[0]
+        self.assertEqual(json.loads(body)[self.class_id], json.loads(json.dumps(details)))
+
+        status, body = await self.get("/services/v1/classes/missing", self.token)
+        self.assertEqual(status, 404)
+
+    async def test_access_token_is_required(self):
+        status, body = await self.get(f"/services/v1/classes/{self.class_id}")
+        self.assertEqual((status, json.loads(body)), (401, {"msg": "Missing Authorization Header"}))
+
+        status, body = await self.get(f"/services/v1/classes/{self.class_id}", "not-a-token")
+        self.assertEqual(status, 422)
+
+    async def test_other_requests_go_to_the_flask_app(self):
+        with mock.patch.object(metrics, "METRICS_TOKEN", "scrape"):
+            status, body = await self.get("/metrics", "scrape")
+
+        self.assertEqual(status, 200)
+        self.assertIn(b"sms_db_pool", body)
+
+    async def test_shutdown_disposes_the_async_storage(self):
+        await self.lifespan.put({"type": "lifespan.shutdown"})
+        self.assertEqual((await self.lifespan_sent.get())["type"], "lifespan.shutdown.complete")
+        await self.lifespan_task
+        self.assertIsNone(self.app.async_storage)
+
+    async def asyncTearDown(self):
+        if not self.lifespan_task.done():
+            await self.lifespan.put({"type": "lifespan.shutdown"})
+            await self.lifespan_task
+
+    def tearDown(self):
+        ClassManagement().delete_class(self.class_id)
+        models.storage.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+"""
+Tests for the async management calls
+"""
+import unittest
+from datetime import datetime
+
+import models
+from models import (Attendance, Class, Course, Grade, Student, StudentClassAssociation, create_async_storage,
+                    storage)
+from modules.attendance_tracking.attendance_management import AttendanceManagement
+from modules.class_management.class_management import ClassManagement
+from modules.gradebook_management.gradebook_management import GradebookManagement
+from modules.test_utils import create_staff_member
+
+
+@unittest.skipIf(models.STORAGE_ENGINE == "file", "the async storage needs a database")
+class TestAsyncManagement(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.async_storage = create_async_storage()
+
+    def setUp(self):
+        teacher, parent = create_staff_member()
+        self.class_ = Class(class_name="B8A", head_class_teacher=teacher.id, academic_year="2023/24")
+        self.student = Student(first_name="Ama", last_name="Mensah", parent_id=parent.id,
+                               admission_date=datetime(2023, 9, 1), gender="Female",
+                               expected_graduation=datetime(2026, 7, 1))
+        self.class_.students.append(StudentClassAssociation(student=self.student))
+        self.class_.save()
+        course = Course(course_name="Science", course_description="Integrated Science",
+                        teacher_id=teacher.id, department="Science")
+        course.save()
+        self.course_id = course.id
+
+        storage.bulk_save([Attendance(class_id=self.class_.id, student_id=self.student.id,
+                                      academic_year="2023/24", term="Term 1", status=day % 2,
+                                      date=datetime(2024, 1, day)) for day in range(1, 4)])
+        self.grade = Grade(grade=75, out_of=100, grade_desc="Exam", term="Term 1", academic_year="2023/24",
+                           course_id=course.id, class_id=self.class_.id, student_id=self.student.id)
+        self.grade.save()
+
+    async def test_attendance(self):
+        management = AttendanceManagement(class_id=self.class_.id, term="Term 1")
+
+        attendances, msg = await management.get_attendance_async(self.async_storage, sort="asc")
+        self.assertEqual([a.id for a in attendances],
+                         [a.id for a in management.get_attendance(sort="asc")[0]])
+        self.assertEqual(len(attendances), 3)
+
+        attendances, msg = await management.get_attendance_by_class_id_async(self.async_storage, self.class_.id)
+        self.assertEqual(len(attendances), 3)
+        attendances, msg = await management.get_student_attendance_async(self.async_storage, self.student.id)
+        self.assertEqual(len(attendances), 3)
+
+        attendances, msg = await AttendanceManagement(class_id="missing").get_attendance_async(self.async_storage)
+        self.assertEqual(attendances, [])
+        self.assertIn("was not found", msg)
+
+    async def test_gradebooks(self):
+        management = GradebookManagement(student_id=self.student.id)
+
+        gradebooks, msg = await management.get_gradebooks_async(self.async_storage)
+        self.assertEqual([g.id for g in gradebooks], [self.grade.id])
+        gradebook, msg = await management.get_gradebook_by_id_async(self.async_storage, self.grade.id)
+        self.assertEqual(gradebook.grade, 75)
+
+    async def test_class_details(self):
+        details, msg = await ClassManagement().get_class_details_async(self.async_storage, self.class_.id)
+
+        self.assertEqual(details, ClassManagement().get_class_details(self.class_.id)[0])
+        self.assertEqual(len(details["attendances"]), 3)
+        self.assertEqual(len(details["grades"]), 1)
+        self.assertEqual(len(details["students"]), 1)
+
+        details, msg = await ClassManagement().get_class_details_async(self.async_storage, "missing")
+        self.assertIsNone(details)
+
+    async def asyncTearDown(self):
+        await self.async_storage.dispose()
+
+    def tearDown(self):
+        ClassManagement().delete_class(self.class_.id)
+        storage.delete_by_id(Course, self.course_id)
+        storage.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -117,6 +117,13 @@ class TestAttendanceManagement(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.attendance_management.create_attendance(student_id="1234", status=1)
 
+    def test_get_attendance_paginated_invalid_cursor(self):
+        attendances, next_cursor, msg = AttendanceManagement().get_attendance_paginated(cursor="not-a-cursor")
+
+        self.assertIsNone(attendances)
+        self.assertIsNone(next_cursor)
+        self.assertEqual(msg, "Failed to fetch attendance records: Invalid pagination cursor")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,35 @@
+#!/usr/bin/python3
+"""
+Tests for the attendance service endpoints
+"""
+import unittest
+
+from flask_jwt_extended import create_access_token
+
+from modules.service.v1.app import create_app
+
+
+class TestAttendanceStatisticsEndpoints(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app()
+        with self.app.app_context():
+            token = create_access_token(identity="user-1")
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.client = self.app.test_client()
+
+    def test_unknown_class_is_not_found(self):
+        for path in ("stats", "stats/terms", "stats/students"):
+            response = self.client.get(f"/services/v1/attendance/class/missing/{path}", headers=self.headers)
+            self.assertEqual(response.status_code, 404, path)
+            self.assertIn("Class not found", response.get_json()["error"])
+
+    def test_unknown_student_is_not_found(self):
+        response = self.client.get("/services/v1/attendance/student/missing/stats", headers=self.headers)
+
+        self.assertEqual(response.status_code, 404)
+        self.assertIn("Student not found", response.get_json()["error"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+"""
+Tests for attendance statistics
+"""
+import random
+import unittest
+from datetime import datetime
+
+from faker import Faker
+
+import models
+from models import Attendance, Class, Parent, Staff, Student, User, StudentClassAssociation, storage
+from modules import AttendanceStatistics
+
+
+@unittest.skipIf(models.STORAGE_ENGINE == "file", "the statistics are SQL aggregates")
+class TestAttendanceStatistics(unittest.TestCase):
+
+    def setUp(self):
+        self.faker = Faker()
+        user = User(first_name=self.faker.first_name(), last_name=self.faker.last_name(),
+                    email=self.faker.email(), password=self.faker.password(),
+                    gender=random.choice(['male', 'female']))
+        user.save()
+        Staff(id=user.id).save()
+        parent = Parent(parent_id=user.id)
+        parent.save()
+
+        self.class_ = Class(class_name="Class 1", head_class_teacher=user.id, academic_year="2023/24")
+        self.students = []
+        for _ in range(4):
+            student = Student(first_name=self.faker.first_name(), last_name=self.faker.last_name(),
+                              parent_id=parent.id, expected_graduation=self.faker.date_time(),
+                              gender=random.choice(["Male", "Female"]), admission_date=datetime.now())
+            self.class_.students.append(StudentClassAssociation(student=student))
+            self.students.append(student)
+        self.class_.save()
+
+        # Students 0 and 1 attend both days, 2 and 3 only the first day of term 1.
+        attendances = []
+        for day, term in ((1, "Term 1"), (2, "Term 1"), (3, "Term 2")):
+            for index, student in enumerate(self.students):
+                status = 1 if day == 1 or index < 2 else 0
+                attendances.append(Attendance(class_id=self.class_.id, student_id=student.id,
+                                              academic_year="2023/24", term=term, status=status,
+                                              date=datetime(2024, 1, day)))
+        storage.bulk_save(attendances)
+
+    def test_class_stats(self):
+        stats, msg = AttendanceStatistics().class_stats(self.class_.id)
+        self.assertEqual(stats["num_roll"], 4)
+        self.assertEqual(stats["present"], 8)
+        self.assertEqual(stats["absent"], 4)
+        self.assertEqual(stats["attendance_rate"], round(8 / 12 * 100, 2))
+
+    def test_class_stats_date_range(self):
+        stats, msg = AttendanceStatistics(start_date=datetime(2024, 1, 2),
+                                          end_date=datetime(2024, 1, 2)).class_stats(self.class_.id)
+        self.assertEqual((stats["present"], stats["absent"]), (2, 2))
+
+    def test_term_stats(self):
+        stats, msg = AttendanceStatistics().term_stats(class_id=self.class_.id)
+        self.assertEqual([(row["term"], row["present"], row["absent"]) for row in stats],
+                         [("Term 1", 6, 2), ("Term 2", 2, 2)])
+
+    def test_student_stats(self):
+        stats, msg = AttendanceStatistics(term="Term 1").student_stats(student_id=self.students[3].id)
+        self.assertEqual(len(stats), 1)
+        self.assertEqual((stats[0]["present"], stats[0]["absent"]), (1, 1))
+
+    def test_invalid_date_range(self):
+        with self.assertRaises(ValueError):
+            AttendanceStatistics(start_date=datetime(2024, 2, 1), end_date=datetime(2024, 1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
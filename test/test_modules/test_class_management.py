@@ -8,7 +8,7 @@ from datetime import datetime
 
 from faker import Faker
 
-from models import Class, Student, User, Staff, Parent, Course, storage
+from models import Class, Student, User, Staff, Parent, Course, Attendance, storage
 from modules.class_management.class_management import ClassManagement
 from modules.test_utils import populate_db
 
@@ -97,7 +97,8 @@ class ClassManagementTestCase(unittest.TestCase):
         course = Course(
             course_name="Mathematics",
             course_description="Introduction to Algebra",
-            teacher_id=self.user.id
+            teacher_id=self.user.id,
+            department="Mathematics"
         )
 
         staff, _ = self._create_staff_member()
@@ -122,6 +123,35 @@ class ClassManagementTestCase(unittest.TestCase):
         self.assertIsNotNone(result)
         self.assertIsInstance(result, dict)
 
+    def test_delete_class(self):
+        new_class = self._create_class()
+        parent = Parent(parent_id=self.user1.id)
+        students = self._create_students(parent.id, 5)
+        storage.bulk_save([Attendance(student_id=student.id, class_id=new_class.id,
+                                      academic_year="2023/24", term="Term 1", status=1)
+                           for student in students])
+
+        self.class_management.delete_class(new_class.id)
+
+        self.assertIsNone(storage.get_by_id(Class, new_class.id))
+        self.assertEqual(storage.query(Attendance).filter(Attendance.class_id == new_class.id).count(), 0)
+
+    def test_get_classes_paginated(self):
+        new_class = self._create_class()
+
+        classes, next_cursor, msg = self.class_management.get_classes_paginated(page_size=1000)
+
+        self.assertIn(new_class.id, [class_.id for class_ in classes])
+        self.assertIsNone(next_cursor)
+        self.assertEqual(msg, "Classes retrieved successfully")
+
+    def test_get_classes_paginated_invalid_cursor(self):
+        classes, next_cursor, msg = self.class_management.get_classes_paginated(cursor="not-a-cursor")
+
+        self.assertIsNone(classes)
+        self.assertIsNone(next_cursor)
+        self.assertEqual(msg, "Failed to retrieve classes: Invalid pagination cursor")
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/python3
+import unittest
+from datetime import timedelta
+from unittest.mock import patch
+
+from flask import Flask, jsonify
+from werkzeug.http import http_date
+
+from models import RevokedToken, SigningKey, storage
+from modules.service.v1 import cache
+from modules.service.v1.conditional import conditional, conditional_resource
+
+
+class TestConditional(unittest.TestCase):
+    def setUp(self):
+        self.backend, self.enabled = cache.backend, cache.enabled
+        cache.configure(cache.LRUBackend(), enable=self.enabled)
+        self.calls = 0
+        self.app = Flask(__name__)
+
+        @self.app.route("/tokens")
+        @conditional(RevokedToken)
+        def tokens():
+            self.calls += 1
+            return jsonify({"calls": self.calls})
+
+        @self.app.route("/tokens/<token_id>")
+        @conditional_resource(RevokedToken, "token_id",
+                              linked=((SigningKey, lambda token_id: SigningKey.kid == "linked"),))
+        def token(token_id):
+            self.calls += 1
+            return jsonify({"calls": self.calls})
+
+        self.client = self.app.test_client()
+        self.token = RevokedToken("conditional", 0)
+        self.key = SigningKey("linked", "public", "private")
+        self.objs = [self.token, self.key]
+        for obj in self.objs:
+            storage.new(obj)
+
+    def test_etag_answers_not_modified(self):
+        response = self.client.get("/tokens")
+        etag = response.headers["ETag"]
+        self.assertTrue(etag.startswith('W/"'))
+        self.assertEqual(response.cache_control.no_cache, True)
+
+        response = self.client.get("/tokens", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["ETag"], etag)
+        self.assertEqual(self.calls, 1)
+
+        self.assertNotEqual(self.client.get("/tokens?limit=2").headers["ETag"], etag)
+
+    def test_write_changes_the_etag(self):
+        etag = self.client.get("/tokens").headers["ETag"]
+        self.objs.append(RevokedToken("conditional-new", 0))
+        storage.new(self.objs[-1])
+
+        response = self.client.get("/tokens", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertEqual(self.calls, 2)
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get("/tokens").last_modified
+
+        response = self.client.get("/tokens", headers={"If-Modified-Since": http_date(last_modified)})
+        self.assertEqual(response.status_code, 304)
+
+        earlier = last_modified - timedelta(hours=1)
+        response = self.client.get("/tokens", headers={"If-Modified-Since": http_date(earlier)})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.calls, 2)
+
+    def test_resource_etag_follows_its_linked_records(self):
+        path = f"/tokens/{self.token.id}"
+        etag = self.client.get(path).headers["ETag"]
+
+        self.objs.append(SigningKey("unlinked", "public", "private"))
+        storage.new(self.objs[-1])
+        self.assertEqual(self.client.get(path, headers={"If-None-Match": etag}).status_code, 304)
+
+        self.key.update(public_key="rotated")
+        storage.save(self.key)
+        self.assertEqual(self.client.get(path, headers={"If-None-Match": etag}).status_code, 200)
+
+    def test_versions_are_cached_until_a_write(self):
+        cache.configure(cache.LRUBackend())
+        with patch.object(storage, "version", wraps=storage.version) as version:
+            self.client.get("/tokens")
+            self.client.get("/tokens?limit=2")
+            self.assertEqual(version.call_count, 1)
+
+            cache.invalidate(RevokedToken)
+            self.client.get("/tokens")
+            self.assertEqual(version.call_count, 2)
+
+    def tearDown(self):
+        cache.configure(self.backend, enable=self.enabled)
+        for obj in self.objs:
+            storage.delete(obj)
+        storage.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
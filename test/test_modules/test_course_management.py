@@ -10,12 +10,13 @@ class TestCourseManagement(unittest.TestCase):
         # Initialize CourseManagement instance
         self.course_management = CourseManagement()
         self.staff, self.parent = create_staff_member()
-        self.clss = create_class()
+        self.clss = create_class("B8A", self.staff.id, [], None)
         course_dict = {
             "course_name": "Test Course",
             "course_description": "This is a test course",
             "teacher_id": self.staff.id,
             "class_id": self.clss.id,
+            "department": "Science",
         }
 
         self.course = Course(**course_dict)
@@ -29,6 +30,7 @@ class TestCourseManagement(unittest.TestCase):
             "course_description": "This is a test course",
             "teacher_id": self.staff.id,
             "class_id": self.clss.id,
+            "department": "Science",
         }
         course, message = self.course_management.create_course(course_dict)
         self.course = course
@@ -60,12 +62,13 @@ class TestCourseManagement(unittest.TestCase):
         self.assertIsNotNone(result)
 
     def test_disassociate_course_with_class(self):
-        new_class = create_class()
+        new_class = create_class("B8B", self.staff.id, [], None)
         course_dict = {
             "course_name": "Test Course",
             "course_description": "This is a test course",
             "teacher_id": self.staff.id,
-            "class_id": new_class.id
+            "class_id": new_class.id,
+            "department": "Science",
         }
         course, msg = self.course_management.create_course(course_dict)
         result, msg = self.course_management.disassociate_course_from_class(course.id, new_class.id)
@@ -82,5 +85,33 @@ class TestCourseManagement(unittest.TestCase):
         self.assertTrue(result)
 
 
+class TestCoursesPaginated(unittest.TestCase):
+    def setUp(self):
+        self.course_management = CourseManagement()
+        self.staff, self.parent = create_staff_member()
+        self.course = Course(course_name="Test Course", course_description="This is a test course",
+                             teacher_id=self.staff.id, department="Science")
+        self.course.save()
+        self.course_id = self.course.id
+
+    def test_get_courses_paginated(self):
+        courses, next_cursor, msg = self.course_management.get_courses_paginated(page_size=1000)
+
+        self.assertIn(self.course_id, [course.id for course in courses])
+        self.assertIsNone(next_cursor)
+        self.assertEqual(msg, "Courses retrieved successfully")
+
+    def test_get_courses_paginated_invalid_cursor(self):
+        courses, next_cursor, msg = self.course_management.get_courses_paginated(cursor="not-a-cursor")
+
+        self.assertIsNone(courses)
+        self.assertIsNone(next_cursor)
+        self.assertEqual(msg, "Failed to retrieve courses: Invalid pagination cursor")
+
+    def tearDown(self):
+        self.course_management.delete_course(self.course_id)
+        storage.close()
+
+
 if __name__ == "__main__":
     unittest.main()
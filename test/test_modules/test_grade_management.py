@@ -16,7 +16,7 @@ class TestGradebookManagement(unittest.TestCase):
         """
         self.teacher, self.parent = create_staff_member()
         self.course = Course(course_name="Mathematics", course_description="Introduction to Algebra",
-                             teacher_id=self.teacher.id)
+                             teacher_id=self.teacher.id, department="Mathematics")
         self.course.save()
 
         self.class_ = Class(class_name="B7B", head_class_teacher=self.teacher.id, academic_year="2023/24")
@@ -173,5 +173,14 @@ class TestGradebookManagement(unittest.TestCase):
         self.assertFalse(success)
         self.assertIn("gradebook not found", message.lower())
 
+    def test_get_gradebooks_paginated_invalid_cursor(self):
+        """
+        Test getting a page of gradebooks with an invalid cursor.
+        """
+        gradebooks, next_cursor, message = GradebookManagement().get_gradebooks_paginated(cursor="not-a-cursor")
+        self.assertIsNone(gradebooks)
+        self.assertIsNone(next_cursor)
+        self.assertIn("invalid pagination cursor", message.lower())
+
     if __name__ == "__main__":
         unittest.main()
@@ -0,0 +1,139 @@
+#!/usr/bin/python3
+import unittest
+from datetime import timedelta
+from os import environ
+from unittest import mock
+
+import jwt
+from flask import Flask, jsonify
+from flask_jwt_extended import create_access_token, get_jwt, verify_jwt_in_request
+
+import models
+from models import storage
+from models.signing_key import SigningKey
+from modules.service.v1 import token_issuer
+from modules.service.v1 import keyring
+from modules.service.v1.keyring import LEEWAY, Keyring
+from modules.service.v1.token_issuer import configure_jwt
+
+
+class TestKeyring(unittest.TestCase):
+    def setUp(self):
+        for record in storage.all(SigningKey).values():
+            storage.delete(record)
+        self.keyring = token_issuer.keyring
+        token_issuer.keyring = Keyring(timedelta(minutes=30), rotation_interval=timedelta(hours=2),
+                                       previous=1, passphrase=environ.get("APP_SECRET"))
+
+        self.app = Flask(__name__)
+        configure_jwt(self.app)
+
+        @self.app.route("/me")
+        def me():
+            verify_jwt_in_request()
+            return jsonify({"id": get_jwt()["sub"]})
+
+        self.client = self.app.test_client()
+
+    def token(self, identity):
+        with self.app.app_context():
+            return create_access_token(identity=identity)
+
+    def get_me(self, token):
+        return self.client.get("/me", headers={"Authorization": f"Bearer {token}"})
+
+    def test_tokens_carry_the_kid(self):
+        token = self.token("user-1")
+        kid, _ = token_issuer.keyring.signing_key()
+
+        self.assertEqual(jwt.get_unverified_header(token)["kid"], kid)
+        self.assertEqual(self.get_me(token).get_json(), {"id": "user-1"})
+
+    def test_rotation_keeps_previous_tokens_valid(self):
+        old = self.token("user-1")
+
+        self.assertIsNone(token_issuer.keyring.rotate())
+        new_kid = token_issuer.keyring.rotate(force=True)
+        new = self.token("user-2")
+
+        self.assertEqual(jwt.get_unverified_header(new)["kid"], new_kid)
+        self.assertEqual(self.get_me(old).status_code, 200)
+        self.assertEqual(self.get_me(new).status_code, 200)
+
+    def test_rotation_retires_keys_past_the_window(self):
+        first = self.token("user-1")
+        record = storage.get_by_filter(SigningKey, SigningKey.kid == token_issuer.keyring.signing_key()[0]).first()
+        record.created_at -= token_issuer.keyring.lifetime + 2 * LEEWAY
+        storage.save(record)
+        token_issuer.keyring.rotate(force=True)
+        token_issuer.keyring.rotate(force=True)
+
+        self.assertEqual(len(storage.all(SigningKey)), 2)
+        self.assertNotEqual(self.get_me(first).status_code, 200)
+
+    def test_young_keys_are_never_retired(self):
+        first = self.token("user-1")
+        for _ in range(3):
+            token_issuer.keyring.rotate(force=True)
+
+        self.assertEqual(len(storage.all(SigningKey)), 4)
+        self.assertEqual(self.get_me(first).status_code, 200)
+
+    def worker(self):
+        return Keyring(timedelta(minutes=30), previous=1, passphrase=environ.get("APP_SECRET"))
+
+    def test_workers_create_a_single_first_key(self):
+        first, second = self.worker(), self.worker()
+        second.refresh()
+        kid, _ = first.signing_key()
+
+        # the second worker found the keyring empty before the first one added its key
+        with mock.patch.object(second, "refresh"):
+            self.assertIsNone(second.rotate(force=True))
+        second.refresh()
+
+        self.assertEqual(second.signing_key()[0], kid)
+        self.assertEqual(len(storage.all(SigningKey)), 1)
+        self.assertIsNotNone(second.public_key(kid))
+
+    @unittest.skipIf(models.STORAGE_ENGINE == "file", "the file storage has no unique constraint")
+    def test_concurrent_insert_of_the_first_key(self):
+        first, second = self.worker(), self.worker()
+        kid, _ = first.signing_key()
+
+        # both workers passed the check before either inserted its key
+        with mock.patch.object(second, "refresh"), mock.patch.object(keyring, "_stored", return_value=False):
+            self.assertIsNone(second.rotate(force=True))
+        second.refresh()
+
+        self.assertEqual(second.signing_key()[0], kid)
+        self.assertEqual([record.kid for record in storage.all(SigningKey).values()], [kid])
+
+    def test_rotations_from_the_same_key_add_one_key(self):
+        first, second = self.worker(), self.worker()
+        first.signing_key()
+        second.refresh()
+        kid = first.rotate(force=True)
+
+        with mock.patch.object(second, "refresh"):
+            self.assertIsNone(second.rotate(force=True))
+        second.refresh()
+
+        self.assertEqual(second.signing_key()[0], kid)
+        self.assertEqual(len(storage.all(SigningKey)), 2)
+
+    def test_other_workers_see_new_keys(self):
+        token_issuer.keyring.rotate(force=True)
+        other = Keyring(timedelta(minutes=30), passphrase=environ.get("APP_SECRET"))
+        kid, _ = other.signing_key()
+
+        self.assertEqual(kid, token_issuer.keyring.signing_key()[0])
+        self.assertIsNotNone(other.public_key(kid))
+
+    def tearDown(self):
+        token_issuer.keyring = self.keyring
+        storage.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+#!/usr/bin/python3
+"""
+Tests for the /metrics endpoint
+"""
+import unittest
+from unittest import mock
+
+from models import storage
+from modules.service.v1 import metrics
+from modules.service.v1.app import create_app
+
+
+class TestMetricsEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.client = create_app().test_client()
+
+    def test_off_without_a_token(self):
+        with mock.patch.object(metrics, "METRICS_TOKEN", None):
+            response = self.client.get("/metrics", headers={"Authorization": "Bearer "})
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_token_is_required(self):
+        with mock.patch.object(metrics, "METRICS_TOKEN", "scrape"):
+            for headers in ({}, {"Authorization": "Bearer guess"}):
+                self.assertEqual(self.client.get("/metrics", headers=headers).status_code, 401)
+
+            response = self.client.get("/metrics", headers={"Authorization": "Bearer scrape"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "text/plain")
+
+    def tearDown(self):
+        storage.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
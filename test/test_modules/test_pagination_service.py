@@ -0,0 +1,162 @@
+#!/usr/bin/python3
+"""
+Tests for the pagination of the list endpoints
+"""
+import unittest
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest import mock
+
+from flask_jwt_extended import create_access_token
+
+from models import (Attendance, Class, ClassCourseAssociation, Course, Parent, Staff, Student, User,
+                    storage)
+from models.engine.pagination import encode_cursor
+from modules.service.v1 import cache
+from modules.service.v1.app import create_app
+from modules.service.v1.microservices import class_service, course_service
+from modules.test_utils import create_staff_member
+
+# a cursor after every record
+PAST_THE_END = encode_cursor(SimpleNamespace(created_at=datetime(9999, 1, 1), id="~"))
+
+
+class TestPaginationErrors(unittest.TestCase):
+
+    def setUp(self):
+        self.backend, self.enabled = cache.backend, cache.enabled
+        cache.configure(cache.LRUBackend(), enable=False)
+        self.app = create_app()
+        with self.app.app_context():
+            token = create_access_token(identity="user-1")
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.client = self.app.test_client()
+
+    def test_failed_page_is_a_bad_request(self):
+        failures = ((class_service.class_management, "get_classes_paginated", "/services/v1/classes"),
+                    (course_service.course_management, "get_courses_paginated", "/services/v1/courses"))
+        for management, method, path in failures:
+            with mock.patch.object(management, method, return_value=(None, None, "Failed to retrieve")):
+                response = self.client.get(path, query_string={"limit": 2}, headers=self.headers)
+
+            self.assertEqual(response.status_code, 400, path)
+            self.assertEqual(response.get_json(), {"error": "Failed to retrieve"})
+
+    def test_invalid_cursor_is_a_bad_request(self):
+        response = self.client.get("/services/v1/users", query_string={"cursor": "not-a-cursor"},
+                                   headers=self.headers)
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_page_past_the_end_is_empty(self):
+        response = self.client.get("/services/v1/users", query_string={"cursor": PAST_THE_END},
+                                   headers=self.headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["users"], {})
+        self.assertIsNone(response.get_json()["next_cursor"])
+
+    def tearDown(self):
+        cache.configure(self.backend, enable=self.enabled)
+        storage.close()
+
+
+class TestListPagination(unittest.TestCase):
+
+    def setUp(self):
+        self.backend, self.enabled = cache.backend, cache.enabled
+        cache.configure(cache.LRUBackend(), enable=False)
+        self.app = create_app()
+        with self.app.app_context():
+            token = create_access_token(identity="user-1")
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.client = self.app.test_client()
+        self.staffs = [create_staff_member() for _ in range(2)]
+        teacher, parent = self.staffs[0]
+        self.class_ = Class(class_name="B7", head_class_teacher=teacher.id, academic_year="2023/24")
+        self.student = Student(first_name="Kofi", last_name="Mensah", gender="male", parent_id=parent.id,
+                               expected_graduation=date(2026, 7, 1), admission_date=date(2023, 9, 1))
+        self.courses = [Course(course_name=f"Course {i}", course_description="Paginated", teacher_id=teacher.id,
+                               department="Science") for i in range(2)]
+        self.records = [Attendance(class_id=self.class_.id, student_id=self.student.id, term="Term 1",
+                                   status=1, academic_year="2023/24") for _ in range(2)]
+        with storage.transaction():
+            for obj in [self.class_, self.student, *self.courses, *self.records]:
+                obj.save()
+            for course in self.courses:
+                storage.save(ClassCourseAssociation(class_id=self.class_.id, course_id=course.id))
+        # the teardown of every request closes the storage, and a closed
+        # file store is empty until it is reloaded
+        self.close = mock.patch.object(storage, "close")
+        self.close.start()
+
+    def pages(self, path, key, page_size=1):
+        """
+        Follow the next_cursor of an endpoint to its last page.
+
+        Returns:
+            list: The ids of every page.
+        """
+        pages, query = [], {"limit": page_size}
+        while True:
+            response = self.client.get(path, query_string=query, headers=self.headers)
+            self.assertEqual(response.status_code, 200, path)
+            body = response.get_json()
+            self.assertIn("next_cursor", body)
+            pages.append(list(body[key]))
+            if body["next_cursor"] is None:
+                return pages
+            query["cursor"] = body["next_cursor"]
+
+    def test_staff_and_parents(self):
+        staff_ids = [staff.id for staff, _ in self.staffs]
+        for path, key in (("/services/v1/users/staff", "staff"), ("/services/v1/users/parents/", "parents")):
+            pages = self.pages(path, key, page_size=1000)
+            self.assertEqual(len(pages), 1)
+            self.assertTrue(set(staff_ids) <= set(pages[0]), path)
+
+    def test_courses_by_teacher_and_class(self):
+        course_ids = sorted(course.id for course in self.courses)
+        for path in (f"/services/v1/courses/by_teacher/{self.staffs[0][0].id}",
+                     f"/services/v1/courses/by_class/{self.class_.id}"):
+            pages = self.pages(path, "courses")
+            self.assertEqual([len(page) for page in pages], [1, 1], path)
+            self.assertEqual(sorted(sum(pages, [])), course_ids, path)
+
+    def test_attendance_by_class_and_student(self):
+        record_ids = sorted(record.id for record in self.records)
+        for path, key in ((f"/services/v1/attendance/class/{self.class_.id}", "attendance"),
+                          (f"/services/v1/attendance/student/{self.student.id}", "result")):
+            pages = self.pages(path, key)
+            self.assertEqual(sorted(sum(pages, [])), record_ids, path)
+
+        response = self.client.get(f"/services/v1/attendance/student/{self.student.id}",
+                                   query_string={"cursor": PAST_THE_END}, headers=self.headers)
+        self.assertEqual(response.get_json()["student_name"], "Kofi Mensah")
+        self.assertEqual(response.get_json()["result"], {})
+
+    def test_unpaginated_response_has_no_cursor(self):
+        response = self.client.get(f"/services/v1/courses/by_teacher/{self.staffs[0][0].id}", headers=self.headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("next_cursor", response.get_json())
+        self.assertEqual(len(response.get_json()["courses"]), 2)
+
+    def tearDown(self):
+        self.close.stop()
+        cache.configure(self.backend, enable=self.enabled)
+        with storage.transaction():
+            storage.delete_by_filter(Attendance, Attendance.class_id == self.class_.id)
+            storage.delete_by_filter(ClassCourseAssociation, ClassCourseAssociation.class_id == self.class_.id)
+            storage.delete_by_filter(Course, Course.id.in_([course.id for course in self.courses]))
+            storage.delete_by_filter(Student, Student.id == self.student.id)
+            storage.delete_by_filter(Class, Class.id == self.class_.id)
+            for staff, parent in self.staffs:
+                storage.delete_by_filter(Parent, Parent.id == parent.id)
+                storage.delete_by_filter(Staff, Staff.id == staff.id)
+                storage.delete_by_filter(User, User.id == staff.id)
+        storage.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
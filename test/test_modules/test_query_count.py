@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+"""
+Tests for the number of queries of the list endpoints
+"""
+import unittest
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+import models
+from models import storage
+from modules.service.v1 import cache
+from modules.service.v1.app import create_app
+from modules.test_utils import create_class, create_course, create_staff_member, create_students
+
+# the validators of the conditional GET, then the listing and its eager loads
+QUERIES = {
+    "/services/v1/classes": 6 + 5,
+    "/services/v1/courses": 4 + 3,
+}
+
+
+@unittest.skipIf(models.STORAGE_ENGINE == "file", "the file storage sends no queries")
+class TestListQueryCount(unittest.TestCase):
+
+    def setUp(self):
+        self.backend, self.enabled = cache.backend, cache.enabled
+        cache.configure(cache.LRUBackend(), enable=False)
+        self.app = create_app()
+        with self.app.app_context():
+            token = create_access_token(identity="user-1")
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.client = self.app.test_client()
+        self.statements = []
+        event.listen(Engine, "before_cursor_execute", self.count)
+
+    def count(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def add_classes(self, count):
+        """
+        Add classes, with their students and a course each, taught by a new staff member.
+        """
+        staff, parent = create_staff_member()
+        students = create_students(parent.id, 3)
+        for i in range(count):
+            class_ = create_class(f"Basic {i}", staff.id, students, staff.id)
+            create_course(class_.id, staff.id, [class_])
+
+    def queries(self, path):
+        """
+        Count the queries of a request, after a first one loaded the keys and the revocations.
+        """
+        self.client.get(path, headers=self.headers)
+        self.statements.clear()
+        response = self.client.get(path, headers=self.headers)
+        self.assertEqual(response.status_code, 200, path)
+        return len(self.statements)
+
+    def test_query_count_does_not_grow_with_the_rows(self):
+        for count in (1, 4):
+            self.add_classes(count)
+            for path, queries in QUERIES.items():
+                with self.subTest(path=path, classes=count):
+                    self.assertEqual(self.queries(path), queries)
+
+    def tearDown(self):
+        event.remove(Engine, "before_cursor_execute", self.count)
+        cache.configure(self.backend, enable=self.enabled)
+        storage.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
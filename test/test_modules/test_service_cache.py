@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+import time
+import unittest
+from unittest import mock
+
+from flask import Flask, jsonify
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from models import Base, Course
+from modules.service.v1 import cache
+
+
+class TestLRUBackend(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        backend = cache.LRUBackend(max_entries=2)
+        backend.set("a", 1, 60)
+        backend.set("b", 2, 60)
+        backend.get("a")
+        backend.set("c", 3, 60)
+
+        self.assertEqual(backend.get("a"), 1)
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual(backend.get("c"), 3)
+
+    def test_expires_entries(self):
+        backend = cache.LRUBackend()
+        backend.set("a", 1, 0.01)
+        time.sleep(0.02)
+
+        self.assertIsNone(backend.get("a"))
+
+
+class TestCached(unittest.TestCase):
+    def setUp(self):
+        self.backend, self.enabled = cache.backend, cache.enabled
+        cache.configure(cache.LRUBackend())
+        self.calls = 0
+        self.app = Flask(__name__)
+
+        @self.app.route("/courses")
+        @cache.cached(Course)
+        def courses():
+            self.calls += 1
+            return jsonify({"calls": self.calls})
+
+        self.client = self.app.test_client()
+
+    def test_repeated_requests_are_hits(self):
+        self.client.get("/courses")
+        response = self.client.get("/courses")
+
+        self.assertEqual(response.get_json(), {"calls": 1})
+        self.assertEqual(self.calls, 1)
+
+        self.client.get("/courses?limit=2")
+        self.assertEqual(self.calls, 2)
+
+    def test_commit_invalidates(self):
+        self.client.get("/courses")
+
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.add(Course(course_name="Maths", course_description="Algebra", teacher_id="t1", department="Science"))
+            session.rollback()
+            self.assertEqual(self.client.get("/courses").get_json(), {"calls": 1})
+
+            session.add(Course(course_name="Maths", course_description="Algebra", teacher_id="t1", department="Science"))
+            session.commit()
+
+        self.assertEqual(self.client.get("/courses").get_json(), {"calls": 2})
+
+    def test_misses_read_from_the_primary(self):
+        with mock.patch.object(cache.storage, "use_primary") as use_primary:
+            self.client.get("/courses")
+            self.assertEqual(use_primary.call_count, 1)
+
+            self.client.get("/courses")
+            self.assertEqual(use_primary.call_count, 1)
+
+    def tearDown(self):
+        cache.configure(self.backend, enable=self.enabled)
+
+
+if __name__ == '__main__':
+    unittest.main()
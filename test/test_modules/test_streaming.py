@@ -0,0 +1,97 @@
+#!/usr/bin/python3
+import json
+import unittest
+from datetime import date
+
+from flask import Flask, jsonify, request
+
+from modules.service.v1.microservices.streaming import (NDJSON_MIMETYPE, stream_json, stream_ndjson,
+                                                        wants_ndjson)
+
+
+class TestStreaming(unittest.TestCase):
+    def setUp(self):
+        self.rows = []
+        self.app = Flask(__name__)
+
+        def serialize(row):
+            return {"id": row[0], "date": row[1]}
+
+        @self.app.route("/list")
+        def as_list():
+            return stream_json({"message": "ok"}, "rows", iter(self.rows), serialize)
+
+        @self.app.route("/keyed")
+        def keyed():
+            document = json.loads(request.args.get("document", "{}"))
+            return stream_json(document, "rows", iter(self.rows), serialize, keyed_by=lambda row: row[0])
+
+        @self.app.route("/rows")
+        def rows():
+            if wants_ndjson():
+                return stream_ndjson(iter(self.rows), serialize)
+            return jsonify([serialize(row) for row in self.rows])
+
+        self.client = self.app.test_client()
+
+    def expected(self, **document):
+        """
+        Get the document jsonify would have built for the rows.
+        """
+        with self.app.app_context():
+            return json.loads(self.app.json.dumps(document))
+
+    def test_empty(self):
+        response = self.client.get("/list")
+        self.assertEqual(response.mimetype, "application/json")
+        self.assertEqual(json.loads(response.data), {"message": "ok", "rows": []})
+
+        self.assertEqual(json.loads(self.client.get("/keyed").data), {"rows": {}})
+
+    def test_single_row(self):
+        self.rows = [("a", date(2024, 1, 8))]
+
+        self.assertEqual(json.loads(self.client.get("/list").data),
+                         self.expected(message="ok", rows=[{"id": "a", "date": date(2024, 1, 8)}]))
+
+    def test_many_rows(self):
+        self.rows = [(str(i), date(2024, 1, i + 1)) for i in range(3)]
+
+        self.assertEqual(json.loads(self.client.get("/list").data),
+                         self.expected(message="ok", rows=[{"id": row[0], "date": row[1]} for row in self.rows]))
+
+    def test_keyed_by(self):
+        self.rows = [("a", None), ("b", date(2024, 1, 8))]
+        document = {"message": "ok", "count": 2}
+
+        response = self.client.get("/keyed", query_string={"document": json.dumps(document)})
+
+        self.assertEqual(json.loads(response.data),
+                         self.expected(message="ok", count=2,
+                                       rows={row[0]: {"id": row[0], "date": row[1]} for row in self.rows}))
+
+        self.rows = self.rows[:1]
+        self.assertEqual(json.loads(self.client.get("/keyed").data), {"rows": {"a": {"id": "a", "date": None}}})
+
+    def test_ndjson(self):
+        self.rows = [("a", None), ("b", date(2024, 1, 8))]
+
+        for query, headers in (({"format": "ndjson"}, {}), ({}, {"Accept": NDJSON_MIMETYPE})):
+            response = self.client.get("/rows", query_string=query, headers=headers)
+            self.assertEqual(response.mimetype, NDJSON_MIMETYPE)
+            lines = response.data.decode().split("\n")
+            self.assertEqual(lines[-1], "")
+            self.assertEqual([json.loads(line) for line in lines[:-1]],
+                             self.expected(rows=[{"id": row[0], "date": row[1]} for row in self.rows])["rows"])
+
+        self.rows = []
+        self.assertEqual(self.client.get("/rows?format=ndjson").data, b"")
+
+    def test_json_by_default(self):
+        response = self.client.get("/rows", headers={"Accept": "application/json"})
+        self.assertEqual(response.mimetype, "application/json")
+        self.assertEqual(json.loads(response.data), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/python3
+import unittest
+
+import requests
+from flask import Flask
+from flask_jwt_extended import decode_token
+from requests.adapters import BaseAdapter
+
+from models import storage
+from modules.service.v1.microservices import authentication_service
+from modules.service.v1.token_issuer import (LocalTokenIssuer, RemoteTokenIssuer, TokenIssueError,
+                                             configure_jwt)
+
+
+class FlaskClientAdapter(BaseAdapter):
+    """
+    Sends the requests of a session to the test client of a Flask app.
+    """
+
+    def __init__(self, client):
+        super().__init__()
+        self.client = client
+
+    def send(self, request, **kwargs):
+        r = self.client.open(request.path_url, method=request.method,
+                             headers=dict(request.headers), data=request.body)
+        response = requests.Response()
+        response.status_code = r.status_code
+        response.headers.update(r.headers)
+        response._content = r.get_data()
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+class TestLocalTokenIssuer(unittest.TestCase):
+    def test_issue_signs_the_token(self):
+        app = Flask(__name__)
+        configure_jwt(app)
+
+        with app.app_context():
+            token = LocalTokenIssuer().issue("user-id", "user@example.com")
+            claims = decode_token(token)
+
+        self.assertEqual(claims["sub"], "user-id")
+        self.assertEqual(claims["email"], "user@example.com")
+        self.assertIn("client_id", claims)
+
+    def tearDown(self):
+        storage.close()
+
+
+class TestRemoteTokenIssuer(unittest.TestCase):
+    def setUp(self):
+        self.app = authentication_service.create_app({"CLIENT_ID": "sms", "CLIENT_SECRET": "secret"})
+        self.client = self.app.test_client()
+
+    def issuer(self, client_id, client_secret):
+        issuer = RemoteTokenIssuer("http://auth/auth", client_id, client_secret)
+        issuer.session.mount("http://", FlaskClientAdapter(self.client))
+        return issuer
+
+    def test_issue_with_the_client_secret(self):
+        token = self.issuer("sms", "secret").issue("user-id", "user@example.com")
+
+        with self.app.app_context():
+            claims = decode_token(token)
+        self.assertEqual(claims["sub"], "user-id")
+        self.assertEqual(claims["email"], "user@example.com")
+
+    def test_wrong_client_secret_is_refused(self):
+        with self.assertRaises(TokenIssueError) as context:
+            self.issuer("sms", "guess").issue("user-id", "user@example.com")
+        self.assertEqual(context.exception.status_code, 502)
+
+        with self.assertRaises(TokenIssueError):
+            self.issuer("other", "secret").issue("user-id", "user@example.com")
+
+    def test_auth_requires_client_authentication(self):
+        response = self.client.post("/auth", json={"id": "user-id", "email": "user@example.com"})
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json, {"message": "Client authentication required"})
+
+    def test_auth_refuses_everyone_without_a_client_secret(self):
+        client = authentication_service.create_app({"CLIENT_SECRET": None}).test_client()
+        response = client.post("/auth", json={"id": "user-id", "email": "user@example.com"},
+                               auth=("sms", ""))
+        self.assertEqual(response.status_code, 401)
+
+    def tearDown(self):
+        storage.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
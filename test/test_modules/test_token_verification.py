@@ -0,0 +1,80 @@
+#!/usr/bin/python3
+import time
+import unittest
+from unittest import mock
+
+from flask import Flask, jsonify
+from flask_jwt_extended import create_access_token, get_jwt
+
+from models import RevokedToken, storage
+from modules.service.v1 import token_verification
+from modules.service.v1.token_issuer import configure_jwt
+from modules.service.v1.token_verification import RevocationList, verify_request
+
+
+class TestRevocationList(unittest.TestCase):
+    def test_token_revoked_by_another_worker(self):
+        first, second = RevocationList(refresh=3600), RevocationList(refresh=3600)
+        second.refresh()
+        expires_at = int(time.time()) + 60
+
+        first.revoke("revoked-twice", expires_at)
+        self.assertFalse(second.is_revoked("revoked-twice"))
+        second.revoke("revoked-twice", expires_at)
+
+        self.assertTrue(second.is_revoked("revoked-twice"))
+
+    def test_refresh_reads_from_the_primary(self):
+        with mock.patch.object(storage, "use_primary") as use_primary:
+            RevocationList().refresh()
+
+        use_primary.assert_called_once_with()
+
+    def tearDown(self):
+        storage.delete_by_filter(RevokedToken, RevokedToken.jti == "revoked-twice")
+        storage.close()
+
+
+class TestVerifyRequest(unittest.TestCase):
+    def setUp(self):
+        token_verification.claims_cache.clear()
+        self.app = Flask(__name__)
+        token_verification.configure_revocation(configure_jwt(self.app))
+        self.app.before_request(verify_request)
+
+        @self.app.route("/me")
+        def me():
+            return jsonify({"id": get_jwt()["sub"]})
+
+        @self.app.route("/logout", methods=["POST"])
+        def logout():
+            token_verification.revoke_current_token()
+            return jsonify({}), 200
+
+        with self.app.app_context():
+            token = create_access_token(identity="user-1")
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.client = self.app.test_client()
+
+    def test_claims_are_cached(self):
+        with mock.patch.object(token_verification, "verify_jwt_in_request",
+                               wraps=token_verification.verify_jwt_in_request) as verify:
+            first = self.client.get("/me", headers=self.headers)
+            second = self.client.get("/me", headers=self.headers)
+
+        self.assertEqual(first.get_json(), {"id": "user-1"})
+        self.assertEqual(second.get_json(), {"id": "user-1"})
+        self.assertEqual(verify.call_count, 1)
+
+    def test_revoked_token_is_rejected(self):
+        self.assertEqual(self.client.get("/me", headers=self.headers).status_code, 200)
+        self.assertEqual(self.client.post("/logout", headers=self.headers).status_code, 200)
+
+        self.assertEqual(self.client.get("/me", headers=self.headers).status_code, 401)
+
+    def test_missing_token_is_rejected(self):
+        self.assertEqual(self.client.get("/me").status_code, 401)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -321,6 +321,13 @@ class TestUserManagement(unittest.TestCase):
             self.user_management.create_user(user_data)
         self.assertIn("Password does not meet complexity requirements.", str(e.exception))  # Verify error message
 
+    def test_get_users_paginated_invalid_cursor(self):
+        users, next_cursor, msg = self.user_management.get_users_paginated(cursor="not-a-cursor")
+
+        self.assertIsNone(users)
+        self.assertIsNone(next_cursor)
+        self.assertEqual(msg, "Unable to retrieve users: Invalid pagination cursor")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+"""
+Tests for the user service endpoints
+"""
+import threading
+import unittest
+from unittest import mock
+
+from flask_jwt_extended import create_access_token
+
+from models import User, passwords, storage
+from models.passwords import hash_password
+from modules.service.v1.app import create_app
+
+
+class TestPasswordPoolBusy(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app()
+        with self.app.app_context():
+            token = create_access_token(identity="user-1")
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.client = self.app.test_client()
+        self.user = User("Ama", "Mensah", "pool-busy@example.com", None, "female",
+                         password_hash=hash_password("Passw0rd!", rounds=4))
+        self.user.save()
+
+        # every slot of the password pool is taken and no request waits for one
+        full = threading.BoundedSemaphore(1)
+        full.acquire()
+        self.patches = [mock.patch.object(passwords, "_slots", full),
+                        mock.patch.object(passwords, "QUEUE_TIMEOUT", 0)]
+        for patch in self.patches:
+            patch.start()
+
+    def test_login_is_unavailable(self):
+        response = self.client.post("/services/v1/login",
+                                    json={"email": "pool-busy@example.com", "password": "Passw0rd!"})
+
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("Too many logins in progress", response.get_json()["error"])
+
+    def test_create_user_is_unavailable(self):
+        response = self.client.post("/services/v1/users", headers=self.headers,
+                                    json={"email": "pool-busy-new@example.com", "password": "Str0ng!Passw0rd",
+                                          "first_name": "Kofi", "last_name": "Mensah", "gender": "male"})
+
+        self.assertEqual(response.status_code, 503)
+        self.assertIsNone(User.get_by_email("pool-busy-new@example.com"))
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        storage.delete_by_filter(User, User.email == "pool-busy@example.com")
+        storage.close()
+
+
+if __name__ == '__main__':
+    unittest.main()